@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from gedcom_ages import set_reference_date
+from gedcom_parser import load_gedcom, read_gedcom
+from gedcom_symbols import shared_tables
+from run_checks import cap_entries, discover_checks, format_result, report_entry, run_check
+
+# Files waiting per worker before producers block; keeps a huge upload
+# directory from being queued all at once
+QUEUE_DEPTH = 4
+
+# Set in each worker process by init_batch_worker
+worker_checks = None
+
+def init_batch_worker():
+    """Worker initializer: imports every user story module once per worker instead of once per file."""
+    global worker_checks
+    worker_checks = discover_checks()
+
+def validate_file(filename, use_cache=False, max_errors=None):
+    """
+    Parses one GEDCOM file and runs the full suite on it in this process,
+    stopping each check after 'max_errors' results if given.
+    Returns a JSON-ready summary; a file that cannot be parsed gets a
+    'failure' instead of check results.
+    """
+    checks = worker_checks if worker_checks is not None else discover_checks()
+    # Each file is a run of its own; a long running worker must not keep an old day
+    set_reference_date()
+    summary = {"file": filename}
+    start = time.perf_counter()
+    try:
+        individuals, families = load_gedcom(filename) if use_cache else read_gedcom(filename)
+    except Exception as e:
+        summary["failure"] = f"{type(e).__name__}: {e}"
+        return summary
+    summary["parse_seconds"] = time.perf_counter() - start
+
+    # One result past the cap marks the checks that had more
+    limit = max_errors + 1 if max_errors is not None else None
+    # The tables are dropped with the file, so a long running worker does not keep the last model alive
+    with shared_tables(individuals, families):
+        entries = [
+            report_entry(story, path, func_name, *run_check(individuals, families, path, func_name, limit=limit))
+            for story, path, func_name in checks
+        ]
+    summary["checks"] = cap_entries(entries, max_errors)
+    for entry in summary["checks"]:
+        entry["results"] = [format_result(result) for result in entry["results"]]
+    summary["findings"] = sum(len(entry["results"]) for entry in summary["checks"])
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+def file_states(directory, pattern):
+    """The (size, mtime) of every matching file of a directory, by path."""
+    states = {}
+    for path in glob.glob(os.path.join(directory, pattern)):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Removed since it was listed
+            continue
+        states[path] = (stat.st_size, stat.st_mtime_ns)
+    return states
+
+async def scan_directory(directory, queue, poll_seconds=None, pattern="*.ged"):
+    """
+    Feeds the GEDCOM files of a directory into the queue, oldest first. With
+    'poll_seconds', keeps watching it for new files until cancelled; a file
+    is only fed in once its size and mtime stayed the same for a whole poll,
+    so uploads still being written are left alone, and again if it is later
+    replaced. Only files still in the directory are remembered.
+    """
+    queued = {}
+    previous = {}
+    while True:
+        states = file_states(directory, pattern)
+        ready = [path for path, state in states.items()
+                 if queued.get(path) != state and (poll_seconds is None or previous.get(path) == state)]
+        for path in sorted(ready, key=lambda path: states[path][1]):
+            queued[path] = states[path]
+            await queue.put(path)
+        if poll_seconds is None:
+            return
+        # Files moved out of a watched directory are forgotten, so a long watch does not grow without bound
+        queued = {path: state for path, state in queued.items() if path in states}
+        previous = states
+        await asyncio.sleep(poll_seconds)
+
+async def validate_queue(queue, on_result, workers=None, use_cache=False, max_errors=None):
+    """
+    Validates the files put on the queue across a pool of worker processes
+    until a None is taken off it. At most 'workers' files are in flight at a
+    time, so producers are held back by the queue once it is full.
+    'on_result' is called with each summary, in completion order.
+
+    A worker that dies (or any other failure to run a file in the pool) is
+    reported as that file's 'failure', and a broken pool is replaced so the
+    service keeps going. Every file in flight on a pool when it breaks is
+    reported failed, as the one that crashed it cannot be told apart.
+    """
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    pools = [ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker)]
+
+    async def consume():
+        while True:
+            filename = await queue.get()
+            try:
+                if filename is None:
+                    # Hand the stop marker on to the next consumer
+                    await queue.put(None)
+                    return
+                pool = pools[0]
+                try:
+                    summary = await loop.run_in_executor(pool, validate_file, filename, use_cache, max_errors)
+                except Exception as e:
+                    summary = {"file": filename, "failure": f"{type(e).__name__}: {e}"}
+                    # Only the first consumer to see a pool break replaces it
+                    if isinstance(e, BrokenProcessPool) and pools[0] is pool:
+                        pool.shutdown(wait=False)
+                        pools[0] = ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker)
+                on_result(summary)
+            finally:
+                queue.task_done()
+
+    try:
+        await asyncio.gather(*(consume() for _ in range(workers)))
+    finally:
+        pools[0].shutdown()
+
+async def validate_directory(directory, on_result, workers=None, poll_seconds=None, use_cache=False,
+                             max_errors=None):
+    """Validates every GEDCOM file in a directory (and, with 'poll_seconds', every new one)."""
+    workers = workers or os.cpu_count() or 1
+    queue = asyncio.Queue(maxsize=workers * QUEUE_DEPTH)
+
+    async def produce():
+        await scan_directory(directory, queue, poll_seconds)
+        await queue.put(None)
+
+    await asyncio.gather(produce(), validate_queue(queue, on_result, workers, use_cache, max_errors))
+
+def validate_files(filenames, workers=None, use_cache=False, max_errors=None):
+    """Validates the given files; returns their summaries in the order given."""
+    summaries = {}
+
+    async def run():
+        queue = asyncio.Queue(maxsize=(workers or os.cpu_count() or 1) * QUEUE_DEPTH)
+
+        async def produce():
+            for filename in filenames:
+                await queue.put(filename)
+            await queue.put(None)
+
+        def collect(summary):
+            summaries[summary["file"]] = summary
+
+        await asyncio.gather(produce(), validate_queue(queue, collect, workers, use_cache, max_errors))
+
+    asyncio.run(run())
+    return [summaries[filename] for filename in filenames]
+
+class ResultWriter:
+    """Appends each summary to a JSON Lines file as it arrives and keeps running totals."""
+
+    def __init__(self, output_path):
+        self.output = open(output_path, "a")
+        self.files = 0
+        self.failed = 0
+        self.findings = 0
+
+    def __call__(self, summary):
+        self.output.write(json.dumps(summary) + "\n")
+        self.output.flush()
+        self.files += 1
+        if "failure" in summary:
+            self.failed += 1
+            print(f"{summary['file']}: {summary['failure']}")
+        else:
+            self.findings += summary["findings"]
+            print(f"{summary['file']}: {summary['findings']} findings in {summary['seconds'] * 1000:.0f} ms")
+
+    def close(self):
+        self.output.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate a directory of GEDCOM uploads with a pool of workers.")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSON Lines file the summaries are appended to")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="keep watching the directory for new files, polling this often")
+    parser.add_argument("--cache", action="store_true", help="load and save parsed snapshots of each file")
+    parser.add_argument("--max-errors", type=int, metavar="N", help="stop each check after N results per file")
+    args = parser.parse_args()
+
+    writer = ResultWriter(args.output)
+    start = time.perf_counter()
+    try:
+        asyncio.run(validate_directory(args.directory, writer, args.workers, args.watch, args.cache,
+                                       args.max_errors))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+    print(f"\n{writer.files} files ({writer.failed} failed), {writer.findings} findings"
+          f" in {time.perf_counter() - start:.2f} s. Results appended to '{args.output}'.")
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then left out of the results
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+from gedcom_parser import read_gedcom
+from gedcom_symbols import shared_tables
+from run_checks import discover_checks, run_check
+from generate_gedcom import generate_gedcom, parse_errors, warn_shortfalls
+
+DEFAULT_SIZES = "1K,100K"
+SUFFIXES = {"K": 10 ** 3, "M": 10 ** 6}
+
+def parse_size(text):
+    """'100K' -> 100000, '10M' -> 10000000, '2500' -> 2500"""
+    text = text.strip().upper()
+    if text[-1:] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def synthetic_file(data_dir, individuals, generations, seed, errors):
+    """Generates the synthetic tree for one size once; the generator is deterministic, so it is reused."""
+    name = f"synthetic_{individuals}_g{generations}_s{seed}"
+    if errors:
+        name += "_" + "_".join(f"{rule}x{count}" for rule, count in sorted(errors.items()))
+    path = os.path.join(data_dir, name + ".ged")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as out:
+            injected = generate_gedcom(out, individuals, generations, errors=errors, seed=seed)
+        warn_shortfalls(errors, injected)
+        os.replace(tmp_path, path)
+    return path
+
+def measure(path):
+    """
+    Parses one GEDCOM file and runs every check on it, in this process.
+    Returns the timings, throughput and peak RSS as a dict.
+    """
+    start = time.perf_counter()
+    individuals, families = read_gedcom(path)
+    parse_seconds = time.perf_counter() - start
+    with open(path, "rb") as f:
+        lines = sum(1 for _ in f)
+
+    result = {
+        "file": path,
+        "individuals": len(individuals),
+        "families": len(families),
+        "lines": lines,
+        "parse": {
+            "seconds": parse_seconds,
+            "lines_per_second": lines / parse_seconds if parse_seconds else None,
+            "peak_rss_mb": peak_rss_mb()
+        },
+        "checks": []
+    }
+    with shared_tables(individuals, families):
+        for story, check_path, func_name in discover_checks():
+            if func_name is None:
+                result["checks"].append({"story": story, "check": None, "failure": "module failed to import"})
+                continue
+            results, seconds, failure = run_check(individuals, families, check_path, func_name)
+            result["checks"].append({
+                "story": story,
+                "check": func_name,
+                "seconds": seconds,
+                "individuals_per_second": len(individuals) / seconds if seconds else None,
+                "findings": len(results),
+                "failure": failure,
+                "peak_rss_mb": peak_rss_mb()
+            })
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+def measure_in_subprocess(path):
+    """Runs measure() in a fresh interpreter, so each size gets its own peak RSS."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure", path],
+        check=True, stdout=subprocess.PIPE, text=True
+    ).stdout
+    return json.loads(output)
+
+def format_rate(rate):
+    return f"{rate:,.0f}/s" if rate else "-"
+
+def format_mb(mb):
+    return f"{mb:,.0f} MB" if mb is not None else "-"
+
+def print_summary(run, baseline=None):
+    """One table per size: parse and every check, with the ratio to a baseline run if given."""
+    previous = {}
+    for size in (baseline or {}).get("sizes", []):
+        previous[size["individuals"]] = {entry["story"]: entry.get("seconds") for entry in size["checks"]}
+        previous[size["individuals"]]["parse"] = size["parse"]["seconds"]
+
+    for size in run["sizes"]:
+        before = previous.get(size["individuals"], {})
+        print(f"\n{size['individuals']:,} individuals, {size['families']:,} families, {size['lines']:,} lines"
+              f" - peak RSS {format_mb(size['peak_rss_mb'])}")
+        rows = [("parse", size["parse"]["seconds"], format_rate(size["parse"]["lines_per_second"]) + " lines", "")]
+        for entry in size["checks"]:
+            if entry.get("seconds") is None or entry.get("failure"):
+                rows.append((entry["story"], None, entry.get("failure") or "", ""))
+                continue
+            rows.append((entry["story"], entry["seconds"], format_rate(entry["individuals_per_second"]),
+                         f"{entry['findings']} findings"))
+
+        for name, seconds, rate, findings in rows:
+            line = f"  {name:<6}"
+            if seconds is None:
+                print(f"{line} {'failed':>12}  {rate}")
+                continue
+            line += f" {seconds * 1000:>10.1f} ms  {rate:>22}  {findings:<16}"
+            if before.get(name):
+                line += f" {seconds / before[name]:.2f}x baseline"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time parsing and every user story check on synthetic trees.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma separated individual counts, e.g. 1K,100K,1M,10M (default: {DEFAULT_SIZES})")
+    parser.add_argument("--generations", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--error", action="append", metavar="USNN[=COUNT]",
+                        help="inject errors into the synthetic trees (see generate_gedcom.py)")
+    parser.add_argument("--data-dir", default=os.path.join(BENCH_DIR, "data"),
+                        help="where generated trees are kept between runs")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results for regression tracking")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        json.dump(measure(args.measure), sys.stdout)
+        return
+
+    errors = parse_errors(args.error)
+    run = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "generations": args.generations,
+        "seed": args.seed,
+        "errors": errors,
+        "sizes": []
+    }
+    for individuals in map(parse_size, args.sizes.split(",")):
+        path = synthetic_file(args.data_dir, individuals, args.generations, args.seed, errors)
+        run["sizes"].append(measure_in_subprocess(path))
+
+    with open(args.output, "w") as f:
+        json.dump(run, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_summary(run, baseline)
+    print(f"\nResults saved to '{args.output}'.")
+
+if __name__ == "__main__":
+    main()
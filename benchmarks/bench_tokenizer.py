@@ -0,0 +1,55 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import source_chunks, tokenize_gedcom, tokenize_gedcom_bytes, tokenize_gedcom_chunks
+from generate_gedcom import generate_gedcom
+
+def synthetic_gedcom(line_count):
+    """A synthetic tree of about line_count lines (generated trees run about 11 lines per person)."""
+    out = io.StringIO()
+    generate_gedcom(out, individuals=line_count // 11, generations=8)
+    return out.getvalue().encode()
+
+def best_of(repeats, run):
+    """Best wall time of 'repeats' runs of run(), and its last result."""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tokenize_gedcom with tokenize_gedcom_bytes and tokenize_gedcom_chunks.")
+    parser.add_argument("gedcom_file", nargs="?", help="GEDCOM file to tokenize (default: synthetic input)")
+    parser.add_argument("--lines", type=int, default=1000000, help="size of the synthetic input")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.gedcom_file:
+        with open(args.gedcom_file, "rb") as f:
+            data = f.read()
+    else:
+        data = synthetic_gedcom(args.lines)
+
+    text = data.decode()
+    line_seconds, tokens = best_of(args.repeats, lambda: sum(1 for _ in tokenize_gedcom(io.StringIO(text))))
+    bytes_seconds, fast_tokens = best_of(args.repeats, lambda: sum(1 for _ in tokenize_gedcom_bytes(data)))
+    chunk_seconds, chunk_tokens = best_of(
+        args.repeats, lambda: sum(1 for _ in tokenize_gedcom_chunks(source_chunks(io.BytesIO(data)))))
+    assert tokens == fast_tokens == chunk_tokens
+
+    print(f"{tokens} tokens")
+    print(f"tokenize_gedcom        {line_seconds:.3f} s  {tokens / line_seconds:,.0f} lines/s")
+    print(f"tokenize_gedcom_bytes  {bytes_seconds:.3f} s  {tokens / bytes_seconds:,.0f} lines/s")
+    print(f"tokenize_gedcom_chunks {chunk_seconds:.3f} s  {tokens / chunk_seconds:,.0f} lines/s")
+    print(f"speedup                {line_seconds / bytes_seconds:.2f}x whole buffer, "
+          f"{line_seconds / chunk_seconds:.2f}x in chunks")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,676 @@
+import argparse
+import random
+import sys
+from datetime import date
+
+# Every generated date is on or before this, so only injected errors reach the future
+END = date(2020, 12, 31).toordinal()
+YEAR = 365
+
+MONTHS = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC')
+
+MALE_NAMES = (
+    'James', 'John', 'Robert', 'Michael', 'William', 'David', 'Richard', 'Joseph', 'Thomas', 'Charles',
+    'Daniel', 'Matthew', 'Anthony', 'Mark', 'Paul', 'Steven', 'Andrew', 'Kenneth', 'Joshua', 'Kevin',
+    'Brian', 'George', 'Edward', 'Ronald', 'Timothy', 'Jason', 'Jeffrey', 'Ryan', 'Jacob', 'Gary'
+)
+FEMALE_NAMES = (
+    'Mary', 'Patricia', 'Jennifer', 'Linda', 'Elizabeth', 'Barbara', 'Susan', 'Jessica', 'Sarah', 'Karen',
+    'Lisa', 'Nancy', 'Betty', 'Margaret', 'Sandra', 'Ashley', 'Kimberly', 'Emily', 'Donna', 'Michelle',
+    'Carol', 'Amanda', 'Dorothy', 'Melissa', 'Deborah', 'Stephanie', 'Rebecca', 'Sharon', 'Laura', 'Cynthia'
+)
+SURNAMES = (
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson',
+    'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores',
+    'Green', 'Adams', 'Nelson', 'Baker', 'Hall', 'Rivera', 'Campbell', 'Mitchell', 'Carter', 'Roberts'
+)
+
+# Couples have at most this many children, well under the US15 limit
+MAX_CHILDREN = 10
+
+# Rules generate_gedcom can inject errors for. US19 errors are cousin
+# marriages, made the same way as pedigree collapse.
+INJECTABLE_RULES = (
+    'US01', 'US02', 'US03', 'US04', 'US05', 'US06', 'US07', 'US08', 'US09', 'US10',
+    'US11', 'US12', 'US13', 'US14', 'US15', 'US16', 'US17', 'US18', 'US19', 'US20',
+    'US21', 'US22', 'US23', 'US24', 'US25', 'US26'
+)
+
+class Person:
+    __slots__ = ('id', 'given', 'middle', 'surname', 'sex', 'birth', 'death', 'famc', 'fams',
+                 'parents', 'grandparents')
+
+    def __init__(self, number, given, middle, surname, sex, birth, famc=None):
+        self.id = f"I{number}"
+        self.given = given
+        self.middle = middle
+        self.surname = surname
+        self.sex = sex
+        self.birth = birth
+        self.death = None
+        self.famc = famc
+        self.fams = []
+        # IDs of the parents and grandparents, to tell (half) siblings and cousins apart
+        self.parents = (famc.husb.id, famc.wife.id) if famc else ()
+        self.grandparents = tuple(p for parent in (famc.husb, famc.wife) for p in parent.parents) if famc else ()
+
+class Family:
+    __slots__ = ('id', 'husb', 'wife', 'children', 'married', 'divorced')
+
+    def __init__(self, number, husb, wife, married):
+        self.id = f"F{number}"
+        self.husb = husb
+        self.wife = wife
+        self.children = []
+        self.married = married
+        self.divorced = None
+        husb.fams.append(self)
+        wife.fams.append(self)
+
+def format_date(ordinal):
+    day = date.fromordinal(ordinal)
+    return f"{day.day} {MONTHS[day.month - 1]} {day.year}"
+
+def related(a, b):
+    """(Half) siblings or first cousins, the couples the generator never makes by chance."""
+    return bool(set(a.parents) & set(b.parents)) or bool(set(a.grandparents) & set(b.grandparents))
+
+def random_name(rng, sex, used=()):
+    """A (given, middle) name pair, the given name not one of 'used'."""
+    names = MALE_NAMES if sex == 'M' else FEMALE_NAMES
+    given = rng.choice([name for name in names if name not in used] or names)
+    return given, rng.choice(names)
+
+def parse_errors(specs):
+    """Parses ['US02=5', 'US13'] into {'US02': 5, 'US13': 1}."""
+    errors = {}
+    for spec in specs or ():
+        rule, _, count = spec.upper().partition('=')
+        if rule not in INJECTABLE_RULES:
+            raise ValueError(f"cannot inject errors for {rule}")
+        errors[rule] = errors.get(rule, 0) + (int(count) if count else 1)
+    return errors
+
+def shortfalls(errors, injected):
+    """The rules that got fewer errors than requested, as {rule: (injected, requested)}."""
+    return {
+        rule: (injected.get(rule, 0), count)
+        for rule, count in sorted((errors or {}).items())
+        if injected.get(rule, 0) < count
+    }
+
+def warn_shortfalls(errors, injected):
+    """Prints a warning for every rule short of its requested errors; returns whether any was."""
+    missing = shortfalls(errors, injected)
+    for rule, (done, count) in missing.items():
+        print(f"warning: {rule}: only {done} of {count} errors injected; "
+              "the tree has too few records to break it on", file=sys.stderr)
+    return bool(missing)
+
+class TreeGenerator:
+    """
+    Generates a family tree generation by generation and writes it as GEDCOM.
+    Only two generations are held in memory at a time: each one is written
+    once its marriages, children and deaths are settled.
+    """
+
+    def __init__(self, out, individuals, generations, remarriage_rate, collapse_rate, errors, seed):
+        self.out = out
+        self.rng = random.Random(seed)
+        self.generations = max(1, min(generations, individuals or 1))
+        self.sizes = [individuals // self.generations] * self.generations
+        self.sizes[0] += individuals - sum(self.sizes)
+        self.remarriage_rate = remarriage_rate
+        self.collapse_rate = collapse_rate
+        self.errors = dict(errors or {})
+        self.people = 0
+        self.families = 0
+        self.injected = {}
+        self.extra_people = []
+        self.cousin_couples = 0
+        # IDs used by error injectors, and (person, family) FAMS links left out
+        self.touched = set()
+        self.unlisted = set()
+        # About 27 years from one generation's births to the next's
+        self.start = END - 10 * YEAR - 27 * YEAR * self.generations
+
+    def new_person(self, given, middle, surname, sex, birth, famc=None):
+        self.people += 1
+        return Person(self.people, given, middle, surname, sex, birth, famc)
+
+    def new_family(self, husb, wife, married):
+        self.families += 1
+        return Family(self.families, husb, wife, married)
+
+    def founders(self, count):
+        rng = self.rng
+        people = []
+        for _ in range(count):
+            sex = rng.choice('MF')
+            birth = self.start + rng.randrange(20 * YEAR)
+            # Double-barrelled surnames keep spouse name pairs from repeating (US24)
+            surname = f"{rng.choice(SURNAMES)}-{rng.choice(SURNAMES)}"
+            people.append(self.new_person(*random_name(rng, sex), surname, sex, birth))
+        return people
+
+    def marriage_date(self, husb, wife):
+        return max(husb.birth, wife.birth) + 18 * YEAR + self.rng.randrange(12 * YEAR)
+
+    def pair(self, people, cousin_pairs):
+        """
+        Marries off about 90% of a generation. 'cousin_pairs' couples are first
+        cousins on purpose; every other couple is unrelated.
+        """
+        rng = self.rng
+        men = [p for p in people if p.sex == 'M' and not p.fams]
+        women = [p for p in people if p.sex == 'F' and not p.fams]
+        rng.shuffle(men)
+        rng.shuffle(women)
+        couples = []
+        cousins = 0
+        self.cousin_couples = 0
+
+        if cousin_pairs:
+            by_grandparents = {}
+            for woman in women:
+                for grandparent in woman.grandparents:
+                    by_grandparents.setdefault(grandparent, []).append(woman)
+            taken = set()
+            for man in men:
+                if len(couples) == cousin_pairs:
+                    break
+                for grandparent in man.grandparents:
+                    cousin = next((w for w in by_grandparents.get(grandparent, ())
+                                   if id(w) not in taken and not set(w.parents) & set(man.parents)), None)
+                    if cousin is not None:
+                        taken.add(id(cousin))
+                        couples.append((man, cousin))
+                        break
+            cousins = len(couples)
+            paired = {id(p) for couple in couples for p in couple}
+            men = [m for m in men if id(m) not in paired]
+            women = [w for w in women if id(w) not in paired]
+
+        wanted = int(min(len(men), len(women)) * 0.9)
+        for man in men[:wanted]:
+            # Look a few candidates ahead for someone unrelated
+            for attempt in range(min(5, len(women))):
+                if not related(man, women[attempt]):
+                    couples.append((man, women.pop(attempt)))
+                    break
+
+        families = []
+        for number, (husb, wife) in enumerate(couples):
+            married = self.marriage_date(husb, wife)
+            if married <= END:
+                families.append(self.new_family(husb, wife, married))
+                self.cousin_couples += number < cousins
+        return families
+
+    def remarry(self, people, families):
+        """Divorces a share of the couples; one former spouse marries again."""
+        rng = self.rng
+        singles = {'M': [], 'F': []}
+        for person in people:
+            if not person.fams:
+                singles[person.sex].append(person)
+
+        second = []
+        for family in families:
+            if rng.random() >= self.remarriage_rate:
+                continue
+            family.divorced = family.married + 3 * YEAR + rng.randrange(7 * YEAR)
+            if family.divorced > END:
+                family.divorced = None
+                continue
+            spouse = rng.choice((family.husb, family.wife))
+            candidates = singles['F' if spouse.sex == 'M' else 'M']
+            partner = next((p for p in candidates if not related(spouse, p)), None)
+            if partner is None:
+                continue
+            husb, wife = (spouse, partner) if spouse.sex == 'M' else (partner, spouse)
+            married = max(family.divorced + YEAR + rng.randrange(2 * YEAR), self.marriage_date(husb, wife))
+            if married > END:
+                continue
+            candidates.remove(partner)
+            second.append(self.new_family(husb, wife, married))
+        return families + second
+
+    def child_window(self, family):
+        """The days a child of this family can be born on without breaking any rule."""
+        first = family.married + 300
+        last = min(family.wife.birth + 45 * YEAR, family.husb.birth + 75 * YEAR, END)
+        if family.divorced:
+            last = min(last, family.divorced)
+        return first, last
+
+    def have_children(self, families, count):
+        """Spreads 'count' children over the families, spacing siblings 400 to 1100 days apart."""
+        rng = self.rng
+        open_families = list(families)
+        next_birth = {}
+        children = []
+        while len(children) < count and open_families:
+            slot = rng.randrange(len(open_families))
+            family = open_families[slot]
+            first, last = self.child_window(family)
+            birth = next_birth.get(family.id, first + rng.randrange(400))
+            if birth > last or len(family.children) >= MAX_CHILDREN:
+                open_families[slot] = open_families[-1]
+                open_families.pop()
+                continue
+            next_birth[family.id] = birth + 400 + rng.randrange(700)
+            children.append(self.add_child(family, birth))
+        return children
+
+    def add_child(self, family, birth):
+        """A new child of the family; siblings never share a given name (US25)."""
+        sex = self.rng.choice('MF')
+        given, middle = random_name(self.rng, sex, {child.given for child in family.children})
+        child = self.new_person(given, middle, family.husb.surname, sex, birth, family)
+        family.children.append(child)
+        return child
+
+    def settle_deaths(self, people):
+        """
+        Gives everyone born more than a century before END a death date, and
+        others one with some chance, always after their last family event.
+        People already given a death date keep it.
+        """
+        rng = self.rng
+        for person in people:
+            if person.death is not None:
+                continue
+            last = person.birth
+            for family in person.fams:
+                last = max(last, family.married, family.divorced or 0,
+                           max((child.birth for child in family.children), default=0))
+            death = max(person.birth + 50 * YEAR + rng.randrange(45 * YEAR), last + YEAR + rng.randrange(9 * YEAR))
+            if death <= END:
+                person.death = death
+            elif person.birth < END - 100 * YEAR:
+                person.death = max(last + 1, END - rng.randrange(YEAR))
+
+    def generate(self):
+        self.write_line("0 HEAD")
+        people = self.founders(self.sizes[0])
+        inject_at = self.generations // 2 if self.generations > 1 else 0
+        for generation in range(self.generations):
+            inject = generation == inject_at
+            collapse = int(len(people) * self.collapse_rate / 2)
+            cousins = collapse + (self.errors.get('US19', 0) if inject else 0)
+            families = self.remarry(people, self.pair(people, cousins))
+            following = self.sizes[generation + 1] if generation + 1 < self.generations else 0
+            children = self.have_children(families, following)
+            self.extra_people = []
+            if inject:
+                self.inject_errors(people, families, children)
+                if self.cousin_couples > collapse:
+                    self.injected['US19'] = min(self.cousin_couples - collapse, self.errors['US19'])
+            self.settle_deaths(people + self.extra_people)
+            self.write_generation(people, families, self.extra_people)
+            people = children
+        self.write_line("0 TRLR")
+
+    def inject_errors(self, people, families, children):
+        """
+        Applies each requested error once per count. Unlinked people some
+        injectors add are collected in extra_people, written with the generation.
+        """
+        for rule, count in sorted(self.errors.items()):
+            for _ in range(count):
+                if INJECTORS[rule](self, people, families, children):
+                    self.injected[rule] = self.injected.get(rule, 0) + 1
+
+    def write_line(self, line):
+        self.out.write(line + "\n")
+
+    def write_person(self, person):
+        lines = [f"0 {person.id} INDI", f"1 NAME {person.given} {person.middle} /{person.surname}/",
+                 f"1 SEX {person.sex}", "1 BIRT", f"2 DATE {format_date(person.birth)}"]
+        if person.death:
+            lines += ["1 DEAT", f"2 DATE {format_date(person.death)}"]
+        if person.famc is not None:
+            lines.append(f"1 FAMC {person.famc.id}")
+        lines += [f"1 FAMS {family.id}" for family in person.fams if (person.id, family.id) not in self.unlisted]
+        self.out.write("\n".join(lines) + "\n")
+
+    def write_family(self, family):
+        lines = [f"0 {family.id} FAM", f"1 HUSB {family.husb.id}", f"1 WIFE {family.wife.id}"]
+        lines += [f"1 CHIL {child.id}" for child in family.children]
+        lines += ["1 MARR", f"2 DATE {format_date(family.married)}"]
+        if family.divorced:
+            lines += ["1 DIV", f"2 DATE {format_date(family.divorced)}"]
+        self.out.write("\n".join(lines) + "\n")
+
+    def write_generation(self, people, families, extra_people):
+        for person in people + extra_people:
+            self.write_person(person)
+        for family in families:
+            self.write_family(family)
+        # Written people drop their links up the tree, so older generations can be freed
+        for person in people:
+            person.famc = None
+            person.fams = ()
+
+# Error injectors. Each breaks one rule on records of the generation being
+# written (and the children it just had) and returns something truthy, or
+# None if no suitable record was found. Records are picked at most once, so
+# injected errors do not pile up on each other. Some rules cannot be broken
+# alone: a marriage before a spouse's birth is also a marriage before 14, and
+# US23 and US25 both report siblings sharing a name and birth date.
+
+def touch(generator, record):
+    """Marks a person or family (with its members) as used by an injector."""
+    generator.touched.add(record.id)
+    if isinstance(record, Family):
+        generator.touched.update(member.id for member in (record.husb, record.wife, *record.children))
+
+def untouched(generator, record):
+    if isinstance(record, Family):
+        return not any(member.id in generator.touched
+                       for member in (record, record.husb, record.wife, *record.children))
+    return record.id not in generator.touched
+
+def pick(generator, candidates):
+    candidates = [c for c in candidates if untouched(generator, c)]
+    if not candidates:
+        return None
+    chosen = generator.rng.choice(candidates)
+    touch(generator, chosen)
+    return chosen
+
+def singles(people):
+    return [p for p in people if not p.fams]
+
+def simple_families(families):
+    """Childless, never divorced couples who married only once."""
+    return [f for f in families
+            if not f.children and not f.divorced and len(f.husb.fams) == 1 and len(f.wife.fams) == 1]
+
+def unlinked_person(generator, birth, death):
+    """A person outside every family, so breaking a rule about them breaks no other."""
+    rng = generator.rng
+    sex = rng.choice('MF')
+    person = generator.new_person(*random_name(rng, sex), rng.choice(SURNAMES), sex, birth)
+    person.death = death
+    generator.extra_people.append(person)
+    return person
+
+def inject_future_date(generator, people, families, children):
+    birth = END - 50 * YEAR + generator.rng.randrange(YEAR)
+    return unlinked_person(generator, birth, date(2100, 1, 1).toordinal() + generator.rng.randrange(YEAR))
+
+def inject_marriage_before_birth(generator, people, families, children):
+    family = pick(generator, simple_families(families))
+    if family:
+        family.married = family.husb.birth - YEAR
+    return family
+
+def inject_death_before_birth(generator, people, families, children):
+    birth = END - 50 * YEAR + generator.rng.randrange(YEAR)
+    return unlinked_person(generator, birth, birth - YEAR)
+
+def inject_divorce_before_marriage(generator, people, families, children):
+    family = pick(generator, simple_families(families))
+    if family:
+        family.divorced = family.married - YEAR
+    return family
+
+def inject_marriage_after_death(generator, people, families, children):
+    family = pick(generator, simple_families(families))
+    if family:
+        family.husb.death = family.married - YEAR
+    return family
+
+def inject_divorce_after_death(generator, people, families, children):
+    family = pick(generator, simple_families(families))
+    if family:
+        family.husb.death = family.married + YEAR
+        family.divorced = family.married + 2 * YEAR
+    return family
+
+def inject_too_old(generator, people, families, children):
+    birth = END - 200 * YEAR + generator.rng.randrange(YEAR)
+    return unlinked_person(generator, birth, birth + 155 * YEAR)
+
+def inject_birth_before_parents_marriage(generator, people, families, children):
+    family = pick(generator, [f for f in families if f.children])
+    if family:
+        family.children[0].birth = family.married - 100
+    return family
+
+def inject_birth_after_mother_death(generator, people, families, children):
+    family = pick(generator, [f for f in families if f.children and len(f.wife.fams) == 1])
+    if family:
+        family.wife.death = family.children[-1].birth - 30
+    return family
+
+def inject_married_before_14(generator, people, families, children):
+    family = pick(generator, [f for f in simple_families(families) if f.husb.birth + 5 * YEAR <= f.wife.birth])
+    if family:
+        family.married = family.wife.birth + 10 * YEAR
+    return family
+
+def inject_bigamy(generator, people, families, children):
+    family = pick(generator, simple_families(families))
+    partner = family and pick(generator, [p for p in singles(people)
+                                          if p.sex == 'F' and not related(family.husb, p)])
+    if partner:
+        married = max(family.married + YEAR, generator.marriage_date(family.husb, partner))
+        families.append(generator.new_family(family.husb, partner, married))
+    return partner
+
+def inject_old_parents(generator, people, families, children):
+    family = pick(generator, [f for f in families if f.children and not f.divorced
+                              and f.wife.birth + 61 * YEAR <= END])
+    if family:
+        family.children[-1].birth = family.wife.birth + 61 * YEAR
+    return family
+
+def inject_close_siblings(generator, people, families, children):
+    family = pick(generator, [f for f in families if len(f.children) >= 2])
+    if family:
+        family.children[1].birth = family.children[0].birth + 60
+    return family
+
+def inject_multiple_births(generator, people, families, children):
+    family = pick(generator, [f for f in families if f.children and len(f.children) <= 8])
+    if family:
+        # Six children born the same day, one over the limit
+        birth = family.children[-1].birth
+        for _ in range(5):
+            children.append(generator.add_child(family, birth))
+    return family
+
+def inject_too_many_siblings(generator, people, families, children):
+    family = pick(generator, [
+        f for f in families if f.children and not f.divorced
+        and f.children[-1].birth + 10 * YEAR <= min(END, f.husb.birth + 79 * YEAR, f.wife.birth + 59 * YEAR)
+    ])
+    if family:
+        birth = family.children[-1].birth
+        while len(family.children) < 15:
+            birth += 250
+            children.append(generator.add_child(family, birth))
+    return family
+
+def inject_wrong_last_name(generator, people, families, children):
+    son = pick(generator, [c for c in children if c.sex == 'M'])
+    if son:
+        son.surname = next(name for name in SURNAMES if name != son.surname)
+    return son
+
+def inject_marriage_to_descendant(generator, people, families, children):
+    # A divorced father who never remarried, so the marriage is not bigamous too
+    daughter = pick(generator, [c for c in children if c.sex == 'F' and not c.fams
+                                and c.famc.divorced and len(c.famc.husb.fams) == 1
+                                and c.birth + 20 * YEAR <= END])
+    if daughter:
+        touch(generator, daughter.famc)
+        families.append(generator.new_family(daughter.famc.husb, daughter, daughter.birth + 20 * YEAR))
+    return daughter
+
+def inject_sibling_marriage(generator, people, families, children):
+    for family in generator.rng.sample(families, len(families)):
+        sons = [c for c in family.children if c.sex == 'M' and not c.fams]
+        daughters = [c for c in family.children if c.sex == 'F' and not c.fams]
+        if sons and daughters and untouched(generator, family):
+            husb, wife = sons[0], daughters[0]
+            married = generator.marriage_date(husb, wife)
+            if married <= END:
+                touch(generator, family)
+                families.append(generator.new_family(husb, wife, married))
+                return family
+    return None
+
+def inject_cousin_marriage(generator, people, families, children):
+    # Cousin marriages are made while pairing a generation (see generate)
+    return None
+
+def inject_aunt_uncle_marriage(generator, people, families, children):
+    for family in generator.rng.sample(families, len(families)):
+        parent = family.husb
+        if parent.famc is None or not untouched(generator, family):
+            continue
+        uncles = [p for p in parent.famc.children if p is not parent and not p.fams and untouched(generator, p)]
+        for child in family.children:
+            partner = next((u for u in uncles if u.sex != child.sex), None)
+            if partner and not child.fams:
+                husb, wife = (partner, child) if partner.sex == 'M' else (child, partner)
+                married = generator.marriage_date(husb, wife)
+                if married <= END:
+                    touch(generator, family)
+                    touch(generator, partner)
+                    families.append(generator.new_family(husb, wife, married))
+                    return family
+    return None
+
+def inject_wrong_gender(generator, people, families, children):
+    family = pick(generator, simple_families(families))
+    if family:
+        family.husb.sex = 'F'
+    return family
+
+def inject_duplicate_id(generator, people, families, children):
+    original = pick(generator, singles(people))
+    if original:
+        # Written after the original, so the model keeps this copy in its place
+        duplicate = Person(0, original.given, original.middle, original.surname, original.sex,
+                           original.birth, original.famc)
+        duplicate.id = original.id
+        duplicate.death = original.death
+        generator.extra_people.append(duplicate)
+    return original
+
+def inject_duplicate_name_and_birth(generator, people, families, children):
+    family = pick(generator, [f for f in families if f.children and len(f.children) < MAX_CHILDREN])
+    if family:
+        first = family.children[0]
+        twin = generator.add_child(family, first.birth)
+        twin.given, twin.middle, twin.sex = first.given, first.middle, first.sex
+        children.append(twin)
+    return family
+
+def inject_duplicate_family(generator, people, families, children):
+    family = pick(generator, families)
+    if family:
+        # Unlinked namesakes of the couple, born a day later, marrying the same day
+        husb, wife = (generator.new_person(p.given, p.middle, p.surname, p.sex, p.birth + 1)
+                      for p in (family.husb, family.wife))
+        generator.extra_people += [husb, wife]
+        families.append(generator.new_family(husb, wife, family.married))
+    return family
+
+def inject_duplicate_first_name(generator, people, families, children):
+    family = pick(generator, [f for f in families if len(f.children) >= 2])
+    if family:
+        first, second = family.children[:2]
+        second.given, second.middle, second.sex, second.birth = first.given, first.middle, first.sex, first.birth
+    return family
+
+def inject_missing_back_link(generator, people, families, children):
+    family = pick(generator, simple_families(families))
+    if family:
+        generator.unlisted.add((family.wife.id, family.id))
+    return family
+
+INJECTORS = {
+    'US01': inject_future_date,
+    'US02': inject_marriage_before_birth,
+    'US03': inject_death_before_birth,
+    'US04': inject_divorce_before_marriage,
+    'US05': inject_marriage_after_death,
+    'US06': inject_divorce_after_death,
+    'US07': inject_too_old,
+    'US08': inject_birth_before_parents_marriage,
+    'US09': inject_birth_after_mother_death,
+    'US10': inject_married_before_14,
+    'US11': inject_bigamy,
+    'US12': inject_old_parents,
+    'US13': inject_close_siblings,
+    'US14': inject_multiple_births,
+    'US15': inject_too_many_siblings,
+    'US16': inject_wrong_last_name,
+    'US17': inject_marriage_to_descendant,
+    'US18': inject_sibling_marriage,
+    'US19': inject_cousin_marriage,
+    'US20': inject_aunt_uncle_marriage,
+    'US21': inject_wrong_gender,
+    'US22': inject_duplicate_id,
+    'US23': inject_duplicate_name_and_birth,
+    'US24': inject_duplicate_family,
+    'US25': inject_duplicate_first_name,
+    'US26': inject_missing_back_link,
+}
+
+def generate_gedcom(out, individuals=1000, generations=5, remarriage_rate=0.1, collapse_rate=0.01,
+                    errors=None, seed=0):
+    """
+    Writes a synthetic GEDCOM tree of about 'individuals' people over
+    'generations' generations to the text stream 'out'. The same arguments
+    always produce the same file.
+
+    remarriage_rate  share of couples that divorce, one of them remarrying
+    collapse_rate    share of each generation marrying a first cousin
+                     (pedigree collapse; each such couple is a US19 finding)
+    errors           {rule: count} of errors to inject, e.g. {'US02': 5}
+
+    Apart from collapse and the injected errors, the tree passes every rule.
+    Returns the number of errors injected per rule, which falls short of
+    'errors' when the tree has no records left to break a rule on (see
+    shortfalls).
+    """
+    generator = TreeGenerator(out, individuals, generations, remarriage_rate, collapse_rate, errors, seed)
+    generator.generate()
+    return generator.injected
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic GEDCOM family tree.")
+    parser.add_argument("output", nargs="?", help="GEDCOM file to write (default: stdout)")
+    parser.add_argument("--individuals", type=int, default=1000)
+    parser.add_argument("--generations", type=int, default=5)
+    parser.add_argument("--remarriage-rate", type=float, default=0.1)
+    parser.add_argument("--collapse-rate", type=float, default=0.01)
+    parser.add_argument("--error", action="append", metavar="USNN[=COUNT]",
+                        help="inject errors breaking a rule, e.g. --error US02=5 (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    errors = parse_errors(args.error)
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        injected = generate_gedcom(out, args.individuals, args.generations, args.remarriage_rate,
+                                   args.collapse_rate, errors, args.seed)
+    finally:
+        if args.output:
+            out.close()
+    for rule, count in sorted(injected.items()):
+        print(f"{rule}: {count} injected", file=sys.stderr)
+    if warn_shortfalls(errors, injected):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from array import array
+from datetime import date, datetime
+
+from gedcom_columns import NO_DATE, date_columns, np
+from gedcom_dates import parse_gedcom_date
+
+# Stored for a person whose birth date is missing or unparsable. Real ages go
+# negative when the other date is before the birth, so this is far below them.
+NO_AGE = -1 << 31
+
+# Day ordinal of 1970-01-01, where numpy's datetime64 counts from
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Ages of living people are counted to this day; fixed once per run by set_reference_date
+run_reference = None
+
+def set_reference_date(value=None):
+    """
+    Fixes the day ages are counted to for the rest of the run: the given date,
+    or today. Every check of a run then agrees on a person's age, even across
+    midnight.
+    """
+    global run_reference
+    value = value or date.today()
+    run_reference = value.date() if isinstance(value, datetime) else value
+    return run_reference
+
+def reference_date():
+    """The day ages are counted to, fixed on first use unless a run fixed it already."""
+    return run_reference or set_reference_date()
+
+def date_key(value):
+    """A date (or datetime) as the integer yyyymmdd."""
+    return value.year * 10000 + value.month * 100 + value.day
+
+def completed_years(birth, end=None):
+    """
+    Exact completed years from 'birth' to 'end' (default: the reference date).
+    Within a year yyyymmdd keys differ by less than 10000, so floor division
+    drops the year not yet completed; dates and datetimes can be mixed.
+    """
+    return (date_key(end or reference_date()) - date_key(birth)) // 10000
+
+def key_column(ordinals):
+    """yyyymmdd keys of a day ordinal column; NO_DATE rows stay NO_DATE."""
+    if np is not None:
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        days = (ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+        months = days.astype('datetime64[M]')
+        years = months.astype('datetime64[Y]')
+        keys = ((years.astype(np.int64) + 1970) * 10000
+                + (months - years.astype('datetime64[M]')).astype(np.int64) * 100 + 100
+                + (days - months.astype('datetime64[D]')).astype(np.int64) + 1)
+        return np.where(ordinals == NO_DATE, NO_DATE, keys)
+    return array('q', [date_key(date.fromordinal(d)) if d != NO_DATE else NO_DATE for d in ordinals])
+
+def years_between(start, end):
+    """Completed years from each 'start' day ordinal to the 'end' one on the same row; NO_AGE unless both are known."""
+    start_keys, end_keys = key_column(start), key_column(end)
+    if np is not None:
+        known = (start_keys != NO_DATE) & (end_keys != NO_DATE)
+        return np.where(known, (end_keys - start_keys) // 10000, NO_AGE)
+    return array('q', [
+        (b - a) // 10000 if a != NO_DATE and b != NO_DATE else NO_AGE
+        for a, b in zip(start_keys, end_keys)
+    ])
+
+def where_older(ages, years):
+    """Rows whose age is known and greater than 'years'."""
+    if np is not None:
+        return np.flatnonzero(np.asarray(ages) > years).tolist()
+    return [row for row, age in enumerate(ages) if age > years]
+
+def age_column(individuals, families, at_death=True):
+    """
+    Completed years of every person, aligned with the dense person numbering:
+    up to the death date of the dead when 'at_death', otherwise up to the
+    reference date for everyone. NO_AGE without a birth date. Cached on the
+    dense tables like the date columns, per reference date and mode.
+    Returns (dense model, ages).
+    """
+    dense, dates = date_columns(individuals, families, parse_gedcom_date)
+    today = reference_date()
+    cache = dense.setdefault("age_columns", {})
+    if (today, at_death) not in cache:
+        birth, death = dates["birth"], dates["death"]
+        if np is not None:
+            end = np.full(len(birth), today.toordinal(), dtype=np.int64)
+            if at_death:
+                end = np.where(death != NO_DATE, death, end)
+        else:
+            end = array('q', [
+                d if at_death and d != NO_DATE else today.toordinal() for d in death
+            ])
+        cache[(today, at_death)] = years_between(birth, end)
+    return dense, cache[(today, at_death)]
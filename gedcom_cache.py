@@ -0,0 +1,196 @@
+import hashlib
+import hmac
+import mmap
+import os
+import pickle
+import struct
+
+CACHE_MAGIC = b"GEDCACHE"
+CACHE_VERSION = 3
+CACHE_DIR_ENV = "GEDCOM_CACHE_DIR"
+SECRET_NAME = "secret"
+SECRET_SIZE = 32
+
+# magic, format version (bumped whenever the model records change shape),
+# hash of the source path, its mtime and size, hash of its bytes, keyed hash
+# and length of the pickled model that follows. Plain fields only, so every
+# check runs before anything is unpickled.
+HEADER = struct.Struct("<8sH16sqQ16s32sQ")
+
+# magic, format version, keyed hash and length of the pickle that follows;
+# for other signed files (see write_signed)
+SIGNED_HEADER = struct.Struct("<8sH32sQ")
+
+def default_cache_dir():
+    """The per-user cache directory, never the directory of the GEDCOM files themselves."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "gedcom")
+
+def file_digest(filename):
+    """Hashes the GEDCOM file's bytes through mmap instead of reading them into memory."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+    return digest.digest()
+
+def path_digest(path):
+    return hashlib.blake2b(path.encode(), digest_size=16).digest()
+
+def resolve_cache_dir(cache_dir=None):
+    return cache_dir or os.environ.get(CACHE_DIR_ENV) or default_cache_dir()
+
+def cache_path(filename, cache_dir=None, suffix=".pkl"):
+    """Where the snapshot of a GEDCOM file lives: one file per source path."""
+    path = os.path.abspath(filename)
+    return os.path.join(resolve_cache_dir(cache_dir), path_digest(path).hex() + suffix)
+
+def file_key(filename):
+    stat = os.stat(filename)
+    return (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+def cache_secret(cache_dir, create=False):
+    """
+    The key snapshots of 'cache_dir' are signed with, kept in the directory
+    readable by its owner only. Snapshots signed with another key, or planted
+    by anyone without it, fail the check and are never unpickled. Without
+    'create', returns None when there is no valid key yet.
+    """
+    path = os.path.join(cache_dir, SECRET_NAME)
+    try:
+        with open(path, "rb") as f:
+            secret = f.read()
+        if len(secret) == SECRET_SIZE:
+            return secret
+    except FileNotFoundError:
+        pass
+    if not create:
+        return None
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    secret = os.urandom(SECRET_SIZE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+        f.write(secret)
+    os.replace(tmp_path, path)
+    return secret
+
+def sign(secret, body):
+    return hashlib.blake2b(body, key=secret, digest_size=32).digest()
+
+def dump_signed(f, header_size, obj, secret):
+    """
+    Pickles 'obj' into 'f' after 'header_size' blank bytes for the caller to
+    fill in; returns the signature and length of the pickle.
+    """
+    f.write(bytes(header_size))
+    pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    f.flush()
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        with view[header_size:] as body:
+            return sign(secret, body), len(body)
+
+def load_signed(mm, header_size, signature, body_size, secret):
+    """Unpickles what follows the header of a mapped file, or None unless its length and signature match."""
+    if body_size != len(mm) - header_size:
+        return None
+    with memoryview(mm) as view:
+        with view[header_size:] as body:
+            if not hmac.compare_digest(signature, sign(secret, body)):
+                return None
+            return pickle.loads(body)
+
+def read_snapshot(snapshot, key, filename):
+    """
+    Maps the snapshot file and unpickles the model straight from the mapping.
+    Returns None unless the stored path, mtime, size and content hash all match
+    and the model carries this cache's signature; all of that is read from the
+    plain header and checked before the model is unpickled.
+    """
+    secret = cache_secret(os.path.dirname(snapshot))
+    if secret is None:
+        return None
+    path, mtime_ns, size = key
+    with open(snapshot, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < HEADER.size:
+            return None
+        (magic, version, stored_path, stored_mtime, stored_size,
+         stored_digest, signature, body_size) = HEADER.unpack_from(mm)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            return None
+        # Cheap checks first; only hash the GEDCOM file when they pass
+        if (stored_path, stored_mtime, stored_size) != (path_digest(path), mtime_ns, size):
+            return None
+        if body_size != len(mm) - HEADER.size or stored_digest != file_digest(filename):
+            return None
+        return load_signed(mm, HEADER.size, signature, body_size, secret)
+
+def write_snapshot(snapshot, key, filename, model):
+    path, mtime_ns, size = key
+    secret = cache_secret(os.path.dirname(snapshot), create=True)
+    tmp_path = f"{snapshot}.{os.getpid()}.tmp"
+    with open(tmp_path, "w+b") as f:
+        # The header is written last, once the pickled model can be signed
+        signature, body_size = dump_signed(f, HEADER.size, model, secret)
+        f.seek(0)
+        f.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, path_digest(path), mtime_ns, size,
+                            file_digest(filename), signature, body_size))
+    os.replace(tmp_path, snapshot)
+
+def write_signed(path, magic, version, obj, cache_dir=None):
+    """
+    Pickles 'obj' to 'path' signed with the key of the per-user cache
+    directory (or 'cache_dir'), wherever 'path' itself is.
+    """
+    secret = cache_secret(resolve_cache_dir(cache_dir), create=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w+b") as f:
+        signature, body_size = dump_signed(f, SIGNED_HEADER.size, obj, secret)
+        f.seek(0)
+        f.write(SIGNED_HEADER.pack(magic, version, signature, body_size))
+    os.replace(tmp_path, path)
+
+def read_signed(path, magic, version, cache_dir=None):
+    """
+    What write_signed stored at 'path', or None when the file is missing,
+    of another format or version, or not signed with this cache's key; the
+    pickle is only loaded once all of that was checked.
+    """
+    secret = cache_secret(resolve_cache_dir(cache_dir))
+    if secret is None:
+        return None
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < SIGNED_HEADER.size:
+                return None
+            stored_magic, stored_version, signature, body_size = SIGNED_HEADER.unpack_from(mm)
+            if (stored_magic, stored_version) != (magic, version):
+                return None
+            return load_signed(mm, SIGNED_HEADER.size, signature, body_size, secret)
+    except (OSError, ValueError, EOFError, struct.error, pickle.UnpicklingError):
+        return None
+
+def load_cached(filename, parse, cache_dir=None):
+    """
+    Returns parse(filename), reusing the binary snapshot stored by an earlier
+    call when the file is unchanged. A missing, stale or unreadable snapshot
+    just means parsing again; failing to write one is not an error either.
+    Snapshots go to the per-user cache directory unless 'cache_dir' or the
+    GEDCOM_CACHE_DIR environment variable says otherwise.
+    """
+    key = file_key(filename)
+    snapshot = cache_path(filename, cache_dir)
+
+    try:
+        model = read_snapshot(snapshot, key, filename)
+    except (OSError, ValueError, EOFError, struct.error, pickle.UnpicklingError):
+        model = None
+    if model is not None:
+        return model
+
+    model = parse(filename)
+    try:
+        write_snapshot(snapshot, key, filename, model)
+    except OSError:
+        pass
+    return model
@@ -0,0 +1,111 @@
+from array import array
+from datetime import date
+from itertools import chain, repeat
+
+try:
+    import numpy as np
+except ImportError:
+    # Without NumPy the same columns are plain int arrays and the masks are list comprehensions
+    np = None
+
+from gedcom_model import column
+from gedcom_symbols import NO_PERSON, dense_model
+
+# Day ordinals start at 1 (0001-01-01), so 0 marks a missing or unparsable date
+NO_DATE = 0
+
+DATE_FORMAT = '%d %b %Y'
+
+def to_ordinal(value):
+    return value.toordinal() if value else NO_DATE
+
+def from_ordinal(ordinal):
+    return date.fromordinal(int(ordinal))
+
+def format_ordinal(ordinal):
+    return from_ordinal(ordinal).strftime(DATE_FORMAT)
+
+def date_column(records, field, parse, size):
+    """int32 day ordinals of one date field, padded with NO_DATE up to 'size' rows."""
+    ordinals = [to_ordinal(parse(value)) for value in column(records, field)]
+    ordinals.extend(repeat(NO_DATE, size - len(ordinals)))
+    if np is not None:
+        return np.asarray(ordinals, dtype=np.int32)
+    return array('i', ordinals)
+
+def date_columns(individuals, families, parse):
+    """
+    Day ordinal columns aligned with the dense person/family numbering of
+    dense_model: 'birth' and 'death' per person (dangling person numbers read
+    NO_DATE), 'married' and 'divorced' per family. Columns are cached on the
+    dense tables, so while a run shares those (see share_tables) they are
+    built once per date parser for every check asking for them.
+    """
+    dense = dense_model(individuals, families)
+    cache = dense.setdefault("date_columns", {})
+    if parse not in cache:
+        person_rows, family_rows = len(dense["person_ids"]), dense["family_count"]
+        cache[parse] = {
+            "birth": date_column(individuals, "birth", parse, person_rows),
+            "death": date_column(individuals, "death", parse, person_rows),
+            "married": date_column(families, "married", parse, family_rows),
+            "divorced": date_column(families, "divorced", parse, family_rows)
+        }
+    return dense, cache[parse]
+
+def take(values, numbers):
+    """values[numbers] for a column and an array of row numbers."""
+    if np is not None:
+        return np.asarray(values)[np.asarray(numbers, dtype=np.int64)]
+    return array(values.typecode, [values[n] for n in numbers])
+
+def gather(dates, numbers):
+    """The dates of the given people, with NO_PERSON rows reading NO_DATE."""
+    if np is not None:
+        # NO_PERSON is -1, which indexes the NO_DATE appended at the end
+        return np.append(dates, NO_DATE)[np.asarray(numbers, dtype=np.int64)]
+    return array('i', [dates[n] if n != NO_PERSON else NO_DATE for n in numbers])
+
+def shifted_column(dates, shift):
+    """Applies 'shift' (a date -> date function) to every known date of a column."""
+    shifted = [shift(from_ordinal(d)).toordinal() if d != NO_DATE else NO_DATE for d in dates]
+    if np is not None:
+        return np.asarray(shifted, dtype=np.int32)
+    return array('i', shifted)
+
+def child_edges(dense):
+    """One (family number, child number) row per CHIL link, in family then child order."""
+    offsets, children = dense["children"]
+    counts = [offsets[n + 1] - offsets[n] for n in range(dense["family_count"])]
+    if np is not None:
+        return np.repeat(np.arange(len(counts)), counts), np.asarray(children, dtype=np.int64)
+    return array('q', chain.from_iterable(map(repeat, range(len(counts)), counts))), children
+
+def where_after(first, second, slack=0):
+    """Rows where both dates are known and 'first' is more than 'slack' days after 'second'."""
+    if np is not None:
+        first, second = np.asarray(first, dtype=np.int64), np.asarray(second, dtype=np.int64)
+        mask = (first != NO_DATE) & (second != NO_DATE) & (first - second > slack)
+        return np.flatnonzero(mask).tolist()
+    return [
+        row for row, (a, b) in enumerate(zip(first, second))
+        if a != NO_DATE and b != NO_DATE and a - b > slack
+    ]
+
+def where_within(first, second, days):
+    """Rows where both dates are known and 'first' falls less than 'days' after 'second'."""
+    if np is not None:
+        first, second = np.asarray(first, dtype=np.int64), np.asarray(second, dtype=np.int64)
+        mask = (first != NO_DATE) & (second != NO_DATE) & (first - second < days)
+        return np.flatnonzero(mask).tolist()
+    return [
+        row for row, (a, b) in enumerate(zip(first, second))
+        if a != NO_DATE and b != NO_DATE and a - b < days
+    ]
+
+def in_row_order(*rule_rows):
+    """
+    Merges the violating rows of several rules into (row, rule number) pairs
+    ordered as a per-row loop checking the rules in turn would report them.
+    """
+    return sorted((row, rule) for rule, rows in enumerate(rule_rows) for row in rows)
@@ -0,0 +1,84 @@
+import calendar
+from datetime import datetime
+from functools import lru_cache
+
+GEDCOM_DATE_FORMAT = "%d %b %Y"
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
+MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
+}
+
+# Distinct date strings in a tree are few compared to the number of lookups,
+# so the caches keep every parsed value keyed on the raw string.
+CACHE_SIZE = 1 << 16
+
+def is_number(text, max_digits):
+    return 0 < len(text) <= max_digits and text.isascii() and text.isdigit()
+
+def build_date(year, month, day):
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+def parse_with_format(date_str, fmt):
+    try:
+        return datetime.strptime(date_str, fmt)
+    except (ValueError, TypeError):
+        return None
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_gedcom_date(date_str):
+    """
+    Parses a GEDCOM 'DD MON YYYY' date (e.g. '15 MAY 1940') into a datetime.
+    Returns None if the string is not a valid date in that format.
+
+    The common shape is split by hand instead of going through strptime;
+    anything else falls back to strptime so the accepted inputs are the same.
+    """
+    if not isinstance(date_str, str):
+        return None
+
+    parts = date_str.split(' ')
+    if len(parts) == 3:
+        day, month, year = parts
+        month_number = MONTHS.get(month.upper())
+        if month_number and is_number(day, 2) and is_number(year, 4) and len(year) == 4:
+            return build_date(int(year), month_number, int(day))
+
+    return parse_with_format(date_str, GEDCOM_DATE_FORMAT)
+
+def format_gedcom_date(value):
+    """Writes a date back in GEDCOM 'DD MON YYYY' form (e.g. '15 MAY 1940'); None stays None."""
+    return value.strftime(GEDCOM_DATE_FORMAT).upper() if value else None
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_iso_date(date_str):
+    """
+    Parses a 'YYYY-MM-DD' date into a datetime.
+    Returns None if the string is not a valid date in that format.
+    """
+    if not isinstance(date_str, str):
+        return None
+
+    parts = date_str.split('-')
+    if len(parts) == 3:
+        year, month, day = parts
+        if len(year) == 4 and is_number(year, 4) and is_number(month, 2) and is_number(day, 2):
+            return build_date(int(year), int(month), int(day))
+
+    return parse_with_format(date_str, ISO_DATE_FORMAT)
+
+def parse_any_date(date_str):
+    """Parses a date written either as 'YYYY-MM-DD' or in GEDCOM 'DD MON YYYY' form."""
+    return parse_iso_date(date_str) or parse_gedcom_date(date_str)
+
+def add_months(value, months):
+    """Calendar month arithmetic: the same day 'months' later, clamped to the end of a shorter month."""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
@@ -0,0 +1,183 @@
+import csv
+import json
+
+from gedcom_columns import format_ordinal, from_ordinal
+
+# Columns of the CSV sink; ids and dates are space separated
+CSV_FIELDS = ("story", "check", "rule", "ids", "dates", "line", "message")
+
+def iso_ordinal(ordinal):
+    return from_ordinal(ordinal).isoformat()
+
+class FormattedDates:
+    """The day ordinals of an error, each formatted only when a template reads it."""
+    __slots__ = ('ordinals', 'format')
+
+    def __init__(self, ordinals, format):
+        self.ordinals = ordinals
+        self.format = format
+
+    def __getitem__(self, n):
+        return self.format(self.ordinals[n])
+
+class CheckError:
+    """
+    One violation found by a check, kept as the data it is about: the rule
+    (user story) code, the IDs of the records involved, the day ordinals of
+    the dates involved, any other values the message needs and the source
+    line it points at (the first record's event date or header line).
+
+    The message is rendered from 'template' only when the error is written
+    out, so checks producing many errors format no dates until they are
+    shown. Every error of a kind shares one template string. The template
+    reads {ids[n]}, {plain[n]} (the ID without its '@'), {dates[n]},
+    {iso[n]} (the date as YYYY-MM-DD) and {values[n]}.
+    """
+    __slots__ = ('rule', 'template', 'ids', 'dates', 'values', 'line')
+
+    def __init__(self, rule, template, ids=(), dates=(), values=(), line=None):
+        self.rule = rule
+        self.template = template
+        self.ids = ids
+        self.dates = dates
+        self.values = values
+        self.line = line
+
+    @property
+    def message(self):
+        return self.template.format(
+            ids=self.ids,
+            plain=[record_id.strip("@") for record_id in self.ids],
+            dates=FormattedDates(self.dates, format_ordinal),
+            iso=FormattedDates(self.dates, iso_ordinal),
+            values=self.values
+        )
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return f"CheckError({self.rule!r}, ids={self.ids!r}, dates={self.dates!r}, line={self.line!r})"
+
+    def key(self):
+        return (self.rule, self.template, self.ids, self.dates, self.values, self.line)
+
+    def __eq__(self, other):
+        if isinstance(other, CheckError):
+            return self.key() == other.key()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def moved(self, shift):
+        """The same error with its source line moved by 'shift' lines."""
+        line = self.line + shift if self.line is not None else None
+        return CheckError(self.rule, self.template, self.ids, self.dates, self.values, line)
+
+    def as_dict(self):
+        return {
+            "rule": self.rule,
+            "ids": list(self.ids),
+            "dates": [iso_ordinal(ordinal) for ordinal in self.dates],
+            "values": list(self.values),
+            "line": self.line,
+            "message": self.message
+        }
+
+def source_line(records, record_id, field=None):
+    """The line of a record's event date, or of its level 0 header without 'field'; None if unknown."""
+    record = records.get(record_id)
+    if record is None:
+        return None
+    if field is None:
+        lines = record.get("lines")
+        return lines[0] if lines else None
+    try:
+        # Model records keep the line of each event date in its own slot
+        return getattr(record, field + "_line")
+    except AttributeError:
+        return (record.get("date_lines") or {}).get(field)
+
+def format_result(result):
+    """The text of one check result: an error's message, or the fields of a listing row."""
+    if isinstance(result, tuple):
+        return ", ".join(str(value) for value in result)
+    return str(result)
+
+def messages(errors):
+    """Renders the results of a check as text, for the per-story output files."""
+    return [format_result(error) for error in errors]
+
+def error_row(story, check, result):
+    """
+    One flat dict for a result of a check. Results that are still plain text
+    (or listing rows) only carry their message.
+    """
+    if isinstance(result, CheckError):
+        row = result.as_dict()
+    else:
+        row = {"rule": story, "ids": [], "dates": [], "values": [], "line": None, "message": format_result(result)}
+    return {"story": story, "check": check, **row}
+
+def error_rows(entries):
+    """One flat dict per result of the report entries, in report order."""
+    for entry in entries:
+        for result in entry["results"]:
+            yield error_row(entry["story"], entry["check"], result)
+
+class JsonlSink:
+    """
+    Writes results as one JSON object per line while a run hands them over:
+    start() names the check the next results come from, add() writes one.
+    """
+
+    def __init__(self, output_path):
+        self.file = open(output_path, "w")
+        self.story = self.check = None
+
+    def start(self, story, check):
+        self.story, self.check = story, check
+
+    def add(self, result):
+        self.file.write(json.dumps(error_row(self.story, self.check, result)) + "\n")
+
+    def finish(self, count, seconds, failure, truncated=False):
+        pass
+
+    def close(self):
+        self.file.close()
+
+class CsvSink(JsonlSink):
+    """Writes results as CSV rows while a run hands them over (see JsonlSink)."""
+
+    def __init__(self, output_path):
+        self.file = open(output_path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        self.writer.writeheader()
+        self.story = self.check = None
+
+    def add(self, result):
+        row = error_row(self.story, self.check, result)
+        row["ids"] = " ".join(row["ids"])
+        row["dates"] = " ".join(row["dates"])
+        self.writer.writerow(row)
+
+def replay(entries, writer):
+    """Hands the results of finished report entries to a writer, then closes it."""
+    try:
+        for entry in entries:
+            writer.start(entry["story"], entry["check"])
+            for result in entry["results"]:
+                writer.add(result)
+            writer.finish(len(entry["results"]), entry["seconds"], entry["failure"], entry.get("truncated", False))
+    finally:
+        writer.close()
+
+def write_errors_jsonl(entries, output_path):
+    """Writes every result of a run as one JSON object per line."""
+    replay(entries, JsonlSink(output_path))
+
+def write_errors_csv(entries, output_path):
+    """Writes every result of a run as one CSV row."""
+    replay(entries, CsvSink(output_path))
@@ -0,0 +1,128 @@
+def children_by_person(individuals, families):
+    """Maps every individual in the shared model to the children of the families they are a spouse in."""
+    children = {indi_id: [] for indi_id in individuals}
+    for fam in families.values():
+        for parent in (fam.get("husb"), fam.get("wife")):
+            if parent in children:
+                children[parent].extend(fam.get("children", []))
+    return children
+
+def label_intervals(children, roots):
+    """
+    Walks the graph depth first (iteratively, so deep trees do not hit the
+    recursion limit) and numbers every person in post-order.
+    Returns (rank, tree_low, low): tree_low is the lowest rank inside the
+    person's spanning-tree subtree and low the lowest rank reachable at all.
+    """
+    rank, tree_low, low = {}, {}, {}
+    seen = set()
+    counter = 0
+
+    for root in roots:
+        if root in seen:
+            continue
+        seen.add(root)
+        # Everything finished while a person is on the stack is in their subtree
+        stack = [(root, iter(children.get(root, ())), counter)]
+        while stack:
+            person, pending, first = stack[-1]
+            for child in pending:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append((child, iter(children.get(child, ())), counter))
+                    break
+            else:
+                stack.pop()
+                person_low = first
+                for child in children.get(person, ()):
+                    if child in low:
+                        person_low = min(person_low, low[child])
+                rank[person] = counter
+                tree_low[person] = first
+                low[person] = person_low
+                counter += 1
+
+    return rank, tree_low, low
+
+def is_acyclic(children):
+    """Kahn's algorithm: True when nobody is (through the data) their own ancestor."""
+    indegree = {person: 0 for person in children}
+    for kids in children.values():
+        for child in kids:
+            indegree[child] = indegree.get(child, 0) + 1
+
+    queue = [person for person, degree in indegree.items() if degree == 0]
+    seen = 0
+    while queue:
+        person = queue.pop()
+        seen += 1
+        for child in children.get(person, ()):
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                queue.append(child)
+    return seen == len(indegree)
+
+def build_ancestry_index(children):
+    """
+    Builds a reachability index over a person -> children mapping so that
+    "is X a descendant of Y" does not need a fresh walk of the tree.
+
+    Every person gets a post-order rank plus two intervals: the exact range
+    of their spanning-tree subtree (a hit there is a guaranteed descendant)
+    and the range of everything reachable from them (a miss there is a
+    guaranteed non-descendant). Only the few queries in between, caused by
+    pedigree collapse, fall back to a walk pruned by the same intervals.
+    """
+    has_parent = {child for kids in children.values() for child in kids}
+    roots = [person for person in children if person not in has_parent]
+    # Anything left unvisited sits on a cycle; start from it too
+    roots += [person for person in children if person in has_parent]
+
+    rank, tree_low, low = label_intervals(children, roots)
+    return {
+        "children": children,
+        "rank": rank,
+        "tree_low": tree_low,
+        "low": low,
+        # The reachability interval is only a valid filter on a DAG
+        "acyclic": is_acyclic(children)
+    }
+
+def may_reach(index, ancestor, person):
+    if not index["acyclic"]:
+        return True
+    rank = index["rank"]
+    return index["low"][ancestor] <= index["low"][person] and rank[person] <= rank[ancestor]
+
+def is_ancestor(index, ancestor, person):
+    """True if 'person' is a strict descendant of 'ancestor' according to the index."""
+    rank = index["rank"]
+    if ancestor == person or ancestor not in rank or person not in rank:
+        return False
+
+    person_rank = rank[person]
+    if index["tree_low"][ancestor] <= person_rank < rank[ancestor]:
+        return True
+    if not may_reach(index, ancestor, person):
+        return False
+
+    children = index["children"]
+    visited = {ancestor}
+    stack = [ancestor]
+    while stack:
+        current = stack.pop()
+        for child in children.get(current, ()):
+            if child == person:
+                return True
+            if child not in visited and child in rank and may_reach(index, child, person):
+                visited.add(child)
+                stack.append(child)
+    return False
+
+def parent_families_by_child(families):
+    """Maps every child in the shared model to the ids of the families they were born into."""
+    parent_families = {}
+    for fam_id, fam in families.items():
+        for child in fam.get("children", []):
+            parent_families.setdefault(child, []).append(fam_id)
+    return parent_families
@@ -0,0 +1,137 @@
+import mmap
+import os
+import re
+from functools import lru_cache
+
+from gedcom_parser import build_model, count_lines, group_records, tokenize_gedcom_bytes
+
+# The records the model is built from; all others are skipped undecoded
+RECORD_TAGS = (b'INDI', b'FAM')
+
+# Adjacent kept records are decoded together, up to this many bytes at a time
+RUN_BYTES = 1 << 20
+
+# Whitespace str.strip removes around a line (every character str.isspace
+# accepts), besides the line breaks themselves
+LINE_SPACE = ('\t\x0b\x0c\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006'
+              '\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
+ASCII_SPACE = b'\t\x0b\x0c\x1c\x1d\x1e\x1f \r\n'
+
+# A line break as text mode reads it: '\r\n', a lone '\r' or '\n'
+LINE_BREAK = re.compile(rb'\r\n?|\n')
+
+@lru_cache(maxsize=None)
+def level_0_patterns(encoding='utf-8'):
+    """
+    Patterns matching the start of a line the parser reads as level 0: once
+    stripped, it is '0' or starts with '0 '. Returns the pattern for the line
+    alone, after a '\n' and after any line break; the '\n' one searches a file
+    without '\r' faster. A lookahead on the first byte lets the usual line
+    start fail at once.
+    """
+    encoded = set()
+    for char in LINE_SPACE:
+        try:
+            encoded.add(char.encode(encoding))
+        except UnicodeEncodeError:
+            continue
+    single = b''.join(re.escape(char) for char in sorted(encoded) if len(char) == 1)
+    wide = [re.escape(char) for char in sorted(encoded) if len(char) > 1]
+    space = b'(?:' + b'|'.join([b'[' + single + b']'] + wide) + b')*'
+    first = b'(?=[0' + single + b''.join(re.escape(char[:1]) for char in sorted(encoded) if len(char) > 1) + b'])'
+    line = first + space + rb'0(?: |' + space + rb'(?=[\r\n]|\Z))'
+    return re.compile(line), re.compile(rb'\n' + line), re.compile(rb'[\r\n]' + line)
+
+def record_spans(buffer, encoding='utf-8'):
+    """
+    (start, stop) byte offsets of every level 0 record of a GEDCOM buffer, in
+    file order, found by searching the raw bytes for the lines the parser
+    reads as level 0: any line break, then '0' after any leading whitespace.
+    """
+    line, after_newline, after_break = level_0_patterns(encoding)
+    broken_line = after_newline if buffer.find(b'\r') == -1 else after_break
+    starts = [0] if line.match(buffer) else []
+    starts.extend(match.start() + 1 for match in broken_line.finditer(buffer))
+    return list(zip(starts, starts[1:] + [len(buffer)]))
+
+def record_header(buffer, start, stop, encoding='utf-8'):
+    """
+    The split level 0 header line starting at 'start', read from the raw bytes
+    and stripped like the parser strips it. Only a header with non-ASCII bytes
+    is decoded to be stripped.
+    """
+    end = buffer.find(b'\n', start, stop)
+    end = stop if end == -1 else end
+    carriage_return = buffer.find(b'\r', start, end)
+    header = buffer[start:end if carriage_return == -1 else carriage_return]
+    if header.isascii():
+        header = header.strip(ASCII_SPACE)
+    else:
+        header = str(header, encoding, 'replace').strip().encode(encoding, 'replace')
+    return header.split(b' ', 2)
+
+def record_type(buffer, start, stop, encoding='utf-8'):
+    """The tag of the level 0 header starting at 'start', read from the raw bytes."""
+    header = record_header(buffer, start, stop, encoding)
+    return header[2] if len(header) == 3 else None
+
+def record_runs(buffer, spans, encoding='utf-8'):
+    """
+    Merges the spans of INDI and FAM records into runs of adjacent records,
+    each at most RUN_BYTES long unless a single record is longer.
+    """
+    runs = []
+    for start, stop in spans:
+        if record_type(buffer, start, stop, encoding) not in RECORD_TAGS:
+            continue
+        if runs and runs[-1][1] == start and stop - runs[-1][0] <= RUN_BYTES:
+            runs[-1][1] = stop
+        else:
+            runs.append([start, stop])
+    return runs
+
+def skipped_lines(buffer, start, stop):
+    """Line breaks between two offsets of a mapped buffer, counted in place without copying the bytes."""
+    return sum(1 for _ in LINE_BREAK.finditer(buffer, start, stop))
+
+def iter_mmap_tokens(buffer, spans, encoding='utf-8'):
+    """
+    Tokenizes the INDI and FAM records among 'spans', decoding each run of
+    adjacent records at once straight from a memoryview of 'buffer', so no
+    bytes are copied out of the map. Line numbers stay those of the whole file
+    by counting the line breaks of the bytes skipped over.
+    """
+    position, line_no = 0, 1
+    with memoryview(buffer) as view:
+        for start, stop in record_runs(buffer, spans, encoding):
+            if start != position:
+                line_no += skipped_lines(buffer, position, start)
+            with view[start:stop] as run:
+                text = str(run, encoding)
+            yield from tokenize_gedcom_bytes(text, encoding, line_no)
+            position, line_no = stop, line_no + count_lines(text)
+
+def iter_mmap_records(filename, spans=None, encoding='utf-8'):
+    """
+    Same records as iter_gedcom_records for the INDI and FAM records of a
+    GEDCOM file, read from a memory map of the file.
+
+    'spans' restricts the scan to some (start, stop) ranges of record_spans,
+    so a worker can map the file and parse its own share of the records.
+    """
+    with open(filename, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if spans is None:
+                spans = record_spans(buffer, encoding)
+            yield from group_records(iter_mmap_tokens(buffer, spans, encoding))
+
+def read_gedcom_mmap(filename, encoding='utf-8'):
+    """
+    Same model as read_gedcom, built from a memory map of the file. Record
+    boundaries and types are found on the raw bytes, and only the INDI and FAM
+    records the model is built from are ever decoded: headers, notes, sources
+    and any other records are skipped over.
+    """
+    return build_model(iter_mmap_records(filename, encoding=encoding))
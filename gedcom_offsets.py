@@ -0,0 +1,116 @@
+import json
+import mmap
+import os
+import struct
+
+from gedcom_cache import file_key
+from gedcom_mmap import RECORD_TAGS, record_header, record_spans
+from gedcom_parser import build_record, count_lines, tokenize_gedcom_bytes
+
+INDEX_MAGIC = b"GEDINDEX"
+INDEX_VERSION = 2
+INDEX_SUFFIX = ".idx"
+
+# magic, format version
+HEADER = struct.Struct("<8sH")
+
+def index_path(filename):
+    """The sidecar index of a GEDCOM file sits next to it: tree.ged -> tree.ged.idx"""
+    return filename + INDEX_SUFFIX
+
+def build_offset_index(filename, encoding='utf-8'):
+    """
+    Scans a GEDCOM file once and maps the xref of every INDI and FAM record to
+    (tag, byte offset, byte length, line number of its header). A repeated
+    xref maps to its last record, the one the model keeps.
+    """
+    index = {}
+    with open(filename, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return index
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            position, line_no = 0, 1
+            for start, stop in record_spans(buffer, encoding):
+                line_no += count_lines(buffer[position:start])
+                header = record_header(buffer, start, stop, encoding)
+                if len(header) == 3 and header[2] in RECORD_TAGS:
+                    xref = header[1].decode(encoding)
+                    index[xref] = (header[2].decode(encoding), start, stop - start, line_no)
+                position = start
+    return index
+
+def write_offset_index(filename, index, path=None):
+    """
+    Stores the index with the path, mtime and size of the file it was built
+    from. The sidecar sits next to the GEDCOM file, where others may write,
+    so it holds plain JSON and reading it never runs code.
+    """
+    path = path or index_path(filename)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION))
+        f.write(json.dumps({"key": file_key(filename), "index": index}).encode())
+    os.replace(tmp_path, path)
+
+def read_offset_index(filename, path=None):
+    """The stored index of 'filename', or None if it is missing or the file changed since."""
+    path = path or index_path(filename)
+    try:
+        with open(path, "rb") as f:
+            magic, version = HEADER.unpack(f.read(HEADER.size))
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                return None
+            stored = json.loads(f.read())
+        key, index = tuple(stored["key"]), stored["index"]
+        index = {xref: (tag, offset, length, line_no) for xref, (tag, offset, length, line_no) in index.items()}
+    except (OSError, ValueError, struct.error, TypeError, KeyError, AttributeError):
+        return None
+    return index if key == file_key(filename) else None
+
+def load_offset_index(filename, path=None):
+    """
+    Returns the offset index of a GEDCOM file, reading the sidecar when it is
+    up to date and otherwise scanning the file and rewriting it. Failing to
+    write the sidecar is not an error.
+    """
+    index = read_offset_index(filename, path)
+    if index is None:
+        index = build_offset_index(filename)
+        try:
+            write_offset_index(filename, index, path)
+        except OSError:
+            pass
+    return index
+
+def read_record_tokens(filename, entry, encoding='utf-8'):
+    """Seeks to one indexed record and tokenizes just its bytes."""
+    tag, offset, length, line_no = entry
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        data = f.read(length)
+    return list(tokenize_gedcom_bytes(data, encoding, line_no))
+
+def fetch_record(filename, xref, index=None):
+    """
+    The Individual or Family with the given xref, parsed from its bytes alone
+    instead of the whole file, or None if the file has no such record.
+
+    Only the record itself is read, so 'lines' holds its own header line even
+    when the xref is repeated elsewhere in the file.
+    """
+    index = index if index is not None else load_offset_index(filename)
+    entry = index.get(xref)
+    if entry is None:
+        return None
+    return build_record(read_record_tokens(filename, entry))
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 3:
+        print("Usage: python gedcom_offsets.py <filename> <xref> [<xref> ...]")
+        sys.exit(1)
+
+    index = load_offset_index(sys.argv[1])
+    for xref in sys.argv[2:]:
+        record = fetch_record(sys.argv[1], xref, index)
+        print(record if record is not None else f"{xref}: not found")
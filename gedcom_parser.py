@@ -1,4 +1,10 @@
-from datetime import datetime
+import os
+from itertools import chain, repeat
+from sys import intern
+
+from gedcom_dates import parse_any_date
+from gedcom_cache import load_cached
+from gedcom_model import Family, Individual
 
 def parse_gedcom_line(line):
     line = line.strip()
@@ -33,70 +39,293 @@ def is_valid_tag(level, tag):
 
     return tag in valid_tags.get(level, [])
 
-def process_gedcom_file(filename):
+def new_individual(indi_id):
+    return Individual(indi_id)
+
+def new_family(fam_id):
+    return Family(fam_id)
+
+# Level 1 event tags whose following DATE line belongs to the given record field
+INDI_DATE_TAGS = {'BIRT': 'birth', 'DEAT': 'death'}
+FAM_DATE_TAGS = {'MARR': 'married', 'DIV': 'divorced'}
+
+# Level 1 tags pointing at other records, by the record field listing them
+REFERENCE_FIELDS = {'FAMC': 'famc', 'FAMS': 'fams', 'CHIL': 'children'}
+
+def tokenize_gedcom(file):
+    """Yields (line_no, level, tag, arguments) for every non-blank line of an open GEDCOM file."""
+    for line_no, line in enumerate(file, 1):
+        parsed = parse_gedcom_line(line)
+        if parsed:
+            yield (line_no,) + parsed
+
+# Every tag the parser knows, so tokens share one string per tag name
+KNOWN_TAGS = {tag: tag for tag in (
+    'INDI', 'FAM', 'HEAD', 'TRLR', 'NOTE', 'NAME', 'SEX', 'BIRT', 'DEAT', 'FAMC',
+    'FAMS', 'MARR', 'HUSB', 'WIFE', 'CHIL', 'DIV', 'DATE'
+)}
+
+# Size of the pieces a GEDCOM source is read and tokenized in; bounds the
+# memory of a streamed parse whatever the size of the file
+CHUNK_SIZE = 1 << 16
+
+# Most bytes tokenize_gedcom_bytes decodes at once; a larger buffer is
+# decoded a block of whole lines at a time
+BLOCK_SIZE = 1 << 20
+
+def tokenize_gedcom_bytes(data, encoding='utf-8', first_line=1):
+    """
+    Same tokens as tokenize_gedcom, for GEDCOM data held in memory (bytes,
+    or an already decoded str): a run of complete lines, or a whole file.
+
+    Bytes are cut at line breaks into blocks of about BLOCK_SIZE and decoded
+    one block at a time, so a large buffer is never decoded (and split into
+    lines) as a whole. Every line is stripped and split by C-level map calls
+    instead of a parse_gedcom_line call per line. Tag names are interned
+    through KNOWN_TAGS. Line numbers count from 'first_line', for a buffer
+    holding part of a file.
+    """
+    if isinstance(data, str):
+        texts = (data,)
+    else:
+        texts = map(str, line_blocks(data, BLOCK_SIZE), repeat(encoding))
+    tags = KNOWN_TAGS
+
+    lines = chain.from_iterable(map(split_lines, texts))
+    rows = map(str.split, map(str.strip, lines), repeat(' '), repeat(2))
+    for line_no, tokens in enumerate(rows, first_line):
+        if len(tokens) == 3:
+            level, tag, arguments = tokens
+            if level == '0' and (arguments == 'INDI' or arguments == 'FAM'):
+                yield line_no, level, tags[arguments], tag
+            else:
+                yield line_no, level, tags.get(tag, tag), arguments
+        elif len(tokens) == 2:
+            yield line_no, tokens[0], tags.get(tokens[1], tokens[1]), ''
+        elif tokens[0]:
+            yield line_no, tokens[0], '', ''
+
+def line_blocks(data, size):
+    """
+    Cuts a bytes-like buffer (bytes, memoryview, mmap) into blocks of whole
+    lines, copying about 'size' bytes at a time. The line break ending a
+    block is left out; a line cut by a slice is carried over to the next one.
+    """
+    if len(data) <= size:
+        yield bytes(data)
+        return
+    rest = b''
+    for start in range(0, len(data), size):
+        piece = rest + bytes(data[start:start + size])
+        cut = piece.rfind(b'\n')
+        if cut >= 0:
+            # '\r\n' is a single line break, left out as a whole
+            yield piece[:cut - 1] if piece[cut - 1:cut] == b'\r' else piece[:cut]
+        rest = piece[cut + 1:]
+    if rest:
+        yield rest
+
+def split_lines(text):
+    """Lines of decoded GEDCOM text, with the same line breaks as a file opened in text mode."""
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text.split('\n')
+
+def count_lines(data):
+    """Line breaks in a run of GEDCOM data, counting '\r\n' and a lone '\r' once each like text mode does."""
+    lf, cr = ('\n', '\r') if isinstance(data, str) else (b'\n', b'\r')
+    return data.count(lf) + data.count(cr) - data.count(cr + lf)
+
+def tokenize_gedcom_chunks(chunks, encoding='utf-8'):
+    """
+    Same tokens as tokenize_gedcom, for GEDCOM data arriving in pieces of any
+    size (bytes or str). Each piece is cut after its last line break and the
+    complete lines are tokenized by tokenize_gedcom_bytes; the rest is carried
+    over to the next piece. Only one piece is held at a time.
+    """
+    line_no = 1
+    tail = None
+    for chunk in chunks:
+        data = tail + chunk if tail else chunk
+        lf, cr = ('\n', '\r') if isinstance(data, str) else (b'\n', b'\r')
+        # A trailing '\r' may be the first half of a '\r\n' in the next piece
+        end = len(data) - 1 if data.endswith(cr) else len(data)
+        cut = max(data.rfind(lf, 0, end), data.rfind(cr, 0, end)) + 1
+        if not cut:
+            tail = data
+            continue
+        lines, tail = data[:cut], data[cut:]
+        yield from tokenize_gedcom_bytes(lines, encoding, line_no)
+        line_no += count_lines(lines)
+    if tail:
+        yield from tokenize_gedcom_bytes(tail, encoding, line_no)
+
+def group_records(tokens):
+    """
+    Groups tokenized lines into level 0 records: lists of tokens, the level 0
+    header first. Lines appearing before the first level 0 header are skipped.
+    """
+    record = None
+    for token in tokens:
+        if token[1] == '0':
+            if record:
+                yield record
+            record = [token]
+        elif record is not None:
+            record.append(token)
+    if record:
+        yield record
+
+def is_model(source):
+    """True for an already parsed (individuals, families) pair."""
+    return isinstance(source, tuple) and len(source) == 2 and all(isinstance(part, dict) for part in source)
+
+def is_path(source):
+    """
+    True when a GEDCOM source names a file. A str holding a line break is
+    taken to be GEDCOM text instead, as no file name has one, and so is a
+    single line starting with a level number unless a file of that name
+    exists. Any other str is a path, so a missing file still fails to open.
+    """
+    if isinstance(source, str):
+        if '\n' in source or '\r' in source:
+            return False
+        return os.path.exists(source) or not source.lstrip()[:1].isdigit()
+    return isinstance(source, os.PathLike)
+
+def read_chunks(file, chunk_size):
+    """Reads an open file (in either mode) 'chunk_size' at a time until the end."""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def source_chunks(source, chunk_size=CHUNK_SIZE):
+    """
+    The GEDCOM data of a source, in pieces of 'chunk_size': a file path,
+    GEDCOM text (str), bytes, bytearray or memoryview, or a file-like object
+    opened in either mode. Files are read one piece at a time.
+    """
+    if is_path(source):
+        with open(source, 'rb') as file:
+            yield from read_chunks(file, chunk_size)
+    elif hasattr(source, 'read'):
+        yield from read_chunks(source, chunk_size)
+    elif isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    else:
+        data = memoryview(source)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size].tobytes()
+
+def iter_gedcom_records(source):
+    """
+    Streams a GEDCOM source (see source_chunks) one level 0 record at a time,
+    reading it in bounded pieces, so memory does not grow with the file.
+
+    Each record is yielded as a list of tokenized lines from
+    tokenize_gedcom_chunks, its level 0 header first. Lines appearing before
+    the first level 0 header are skipped.
+    """
+    return group_records(tokenize_gedcom_chunks(source_chunks(source)))
+
+def build_record(record):
+    """
+    Builds the model record (an Individual or Family) for an INDI or FAM
+    record yielded by iter_gedcom_records. Returns None for any other level 0
+    record. IDs, sexes and dates are interned, so every repeat of one of them
+    shares a single string.
+    """
+    line_no, level, tag, xref = record[0]
+    if tag == 'INDI':
+        current = new_individual(intern(xref))
+        date_tags = INDI_DATE_TAGS
+    elif tag == 'FAM':
+        current = new_family(intern(xref))
+        date_tags = FAM_DATE_TAGS
+    else:
+        return None
+    current.lines = (line_no,)
+    is_individual = date_tags is INDI_DATE_TAGS
+    references = {}
+    date_field = None
+
+    for line_no, level, tag, arguments in record[1:]:
+        if level == '1':
+            date_field = date_tags.get(tag)
+            if is_individual:
+                if tag == 'NAME':
+                    current.name = arguments
+                elif tag == 'SEX':
+                    current.sex = intern(arguments)
+                elif tag == 'FAMC' or tag == 'FAMS':
+                    references.setdefault(tag, []).append(intern(arguments))
+            elif tag == 'HUSB':
+                current.husb = intern(arguments)
+            elif tag == 'WIFE':
+                current.wife = intern(arguments)
+            elif tag == 'CHIL':
+                references.setdefault(tag, []).append(intern(arguments))
+        elif tag == 'DATE' and date_field:
+            # Assign the date to the event tag seen on the previous level 1 line
+            setattr(current, date_field, intern(arguments))
+            setattr(current, date_field + '_line', line_no)
+            date_field = None
+
+    for tag, ids in references.items():
+        setattr(current, REFERENCE_FIELDS[tag], tuple(ids))
+    return current
+
+def read_gedcom(source):
+    """
+    Reads a GEDCOM file once and builds the shared individuals/families model
+    consumed by every user story check. Besides a path, the source can be
+    anything source_chunks accepts, so uploads are checked without touching
+    the disk, or an already built (individuals, families) model, which is
+    returned as it is.
+
+    Dates are kept as the raw GEDCOM strings. Each record also remembers the
+    line numbers of its level 0 header ('lines', one entry per occurrence of
+    the ID) and of its event dates ('date_lines'). A repeated ID replaces the
+    earlier record but keeps its header lines so duplicates can be reported.
+    """
+    if is_model(source):
+        return source
+    return build_model(iter_gedcom_records(source))
+
+def build_model(records):
+    """Builds (individuals, families) from tokenized level 0 records, as read_gedcom does."""
     individuals = {}
     families = {}
-    current_indi = None
-    current_fam = None
-    # Flags to track whether the next DATE tag is a birth, death, or marriage date
-    expecting_birth = False
-    expecting_death = False
-    expecting_marriage = False
-
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if not line:
-                continue
 
-            parsed = parse_gedcom_line(line)
-            if not parsed:
-                continue
+    for record in records:
+        current = build_record(record)
+        if current is None:
+            continue
 
-            level, tag, arguments = parsed
+        table = individuals if record[0][2] == 'INDI' else families
+        previous = table.get(current.id)
+        if previous:
+            current.lines = previous.lines + current.lines
+        table[current.id] = current
 
-            # Store individual information
-            if level == '0' and tag == 'INDI':
-                current_indi = arguments
-                individuals[current_indi] = {'id': current_indi, 'name': None}
-            elif level == '1' and current_indi:
-                if tag == 'NAME':
-                    individuals[current_indi]['name'] = arguments
-                elif tag == 'BIRT':
-                    # Birth date will come next line (DATE)
-                    expecting_birth = True
-                elif tag == 'DEAT':
-                    # Death date will come next line (DATE)
-                    expecting_death = True
-
-            # Store family information
-            if level == '0' and tag == 'FAM':
-                current_fam = arguments
-                families[current_fam] = {'id': current_fam, 'husb': None, 'wife': None}
-            elif level == '1' and current_fam:
-                if tag == 'HUSB':
-                    families[current_fam]['husb'] = arguments
-                elif tag == 'WIFE':
-                    families[current_fam]['wife'] = arguments
-                elif tag == 'CHIL':
-                    # Add child to list of children in this family
-                    families[current_fam].setdefault('children', []).append(arguments)
-                elif tag == 'MARR':
-                    # Marriage date will come on next DATE line
-                    expecting_marriage = True
-
-            elif tag == 'DATE':
-                date_value = arguments
-                # Assign the date to the correct context based on previously seen tag
-                if expecting_birth and current_indi:
-                    individuals[current_indi]['birth'] = date_value
-                    expecting_birth = False
-                elif expecting_death and current_indi:
-                    individuals[current_indi]['death'] = date_value
-                    expecting_death = False
-                elif expecting_marriage and current_fam:
-                    families[current_fam]['married'] = date_value
-                    expecting_marriage = False
+    return individuals, families
+
+def load_gedcom(source, cache_dir=None, reader=read_gedcom):
+    """
+    Same model as read_gedcom, but an unchanged file is loaded from the binary
+    snapshot written the first time it was parsed instead of being parsed again.
+    Sources other than a path are never cached. 'reader' parses a path the
+    cache misses (gedcom_mmap.read_gedcom_mmap builds the same model).
+    """
+    if not is_path(source):
+        return read_gedcom(source)
+    return load_cached(source, reader, cache_dir)
+
+def process_gedcom_file(filename):
+    individuals, families = load_gedcom(filename)
 
     # Print individuals sorted by ID
     print("\nIndividuals:")
@@ -122,10 +351,10 @@ def process_gedcom_file(filename):
     return individuals, families
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
-    except (ValueError, TypeError):
+    """Parses a date string in YYYY-MM-DD or GEDCOM DD MON YYYY format to a datetime object."""
+    if not date_str:
         return None
+    return parse_any_date(date_str.strip())
 
 def us09_birth_before_death_of_parents(individuals, families):
     errors = []
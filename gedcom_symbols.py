@@ -0,0 +1,120 @@
+from array import array
+from contextlib import contextmanager
+from itertools import accumulate, chain
+
+from gedcom_model import column
+
+# Stored for a missing husband/wife
+NO_PERSON = -1
+
+def intern_id(index, ids, xref):
+    """Returns the dense number of 'xref', giving it the next free number if it is new."""
+    number = index.get(xref)
+    if number is None:
+        number = index[xref] = len(ids)
+        ids.append(xref)
+    return number
+
+def links_array(rows, index, ids):
+    """
+    Packs one list of references per row into two flat integer arrays:
+    the references of row n are values[offsets[n]:offsets[n + 1]].
+    """
+    rows = [row or () for row in rows]
+    offsets = array('q', [0])
+    offsets.extend(accumulate(map(len, rows)))
+    refs = list(chain.from_iterable(rows))
+
+    values = list(map(index.get, refs))
+    if None in values:
+        values = [intern_id(index, ids, xref) if number is None else number
+                  for xref, number in zip(refs, values)]
+    return offsets, array('q', values)
+
+def linked(links, number):
+    offsets, values = links
+    return values[offsets[number]:offsets[number + 1]]
+
+def build_dense_model(individuals, families):
+    """
+    Builds the symbol tables mapping every individual and family xref of the
+    model to a dense integer, in model order, and rewrites the cross-references
+    as integer arrays:
+
+      person_ids / family_ids      number -> xref
+      person_index / family_index  xref -> number
+      husb, wife                   spouse numbers per family (NO_PERSON if missing)
+      children                     children numbers per family
+      famc, fams                   family numbers per person
+
+    References to records that do not exist get numbers after the real ones,
+    so 'person_count' / 'family_count' tell the two apart; the per-person and
+    per-family arrays only have rows for the real records.
+    """
+    person_ids = list(individuals)
+    person_index = {xref: n for n, xref in enumerate(person_ids)}
+    family_ids = list(families)
+    family_index = {xref: n for n, xref in enumerate(family_ids)}
+    person_count, family_count = len(person_ids), len(family_ids)
+
+    husb = array('q')
+    wife = array('q')
+    for spouses, role in ((husb, "husb"), (wife, "wife")):
+        spouses.extend([
+            intern_id(person_index, person_ids, xref) if xref else NO_PERSON
+            for xref in column(families, role)
+        ])
+
+    children = links_array(column(families, "children"), person_index, person_ids)
+    famc = links_array(column(individuals, "famc"), family_index, family_ids)
+    fams = links_array(column(individuals, "fams"), family_index, family_ids)
+
+    return {
+        "person_ids": person_ids,
+        "person_index": person_index,
+        "person_count": person_count,
+        "family_ids": family_ids,
+        "family_index": family_index,
+        "family_count": family_count,
+        "husb": husb,
+        "wife": wife,
+        "children": children,
+        "famc": famc,
+        "fams": fams
+    }
+
+# [individuals, families, tables or None] of the model the current run checks; see share_tables
+run_tables = None
+
+def share_tables(individuals, families):
+    """
+    Makes every dense_model call for this model share one set of tables (and
+    the columns cached on them), built on first use. Runners call this for
+    the model they check; the model must not be edited while it is shared.
+    """
+    global run_tables
+    run_tables = [individuals, families, None]
+
+@contextmanager
+def shared_tables(individuals, families):
+    """share_tables for the duration of a block; the tables are dropped when it ends."""
+    global run_tables
+    previous = run_tables
+    share_tables(individuals, families)
+    try:
+        yield
+    finally:
+        run_tables = previous
+
+def dense_model(individuals, families):
+    """
+    Same as build_dense_model, but while a runner shares the tables of this
+    model (share_tables), every check handed it gets the same tables instead
+    of rebuilding them. Any other model gets freshly built tables, so edits
+    made to a model between calls are always seen.
+    """
+    if run_tables is not None and run_tables[0] is individuals and run_tables[1] is families:
+        if run_tables[2] is None:
+            run_tables[2] = build_dense_model(individuals, families)
+        return run_tables[2]
+    return build_dense_model(individuals, families)
@@ -0,0 +1,226 @@
+import hashlib
+import os
+import re
+import time
+
+from gedcom_ages import set_reference_date
+from gedcom_cache import cache_path, read_signed, write_signed
+from gedcom_errors import CheckError, source_line
+from run_checks import discover_checks, load_model, report_entry, run_model_checks
+
+STATE_MAGIC = b"GEDSTATE"
+STATE_VERSION = 3
+STATE_SUFFIX = ".state"
+
+# Checks whose results for one record can depend on records more than one
+# family away (ancestry, kinship), on the whole file (uniqueness) or on line
+# numbers that shift when anything above them is edited. They always re-run
+# on the full model; every other check only re-runs around the edit.
+GLOBAL_CHECKS = {"US01", "US17", "US18", "US19", "US20", "US22", "US23", "US24", "US25", "US26"}
+
+# Positions in the file are not part of a record's content
+POSITION_FIELDS = ("lines", "date_lines")
+
+ID_TOKEN = re.compile(r"[\w-]+")
+
+def record_digest(record):
+    """Hashes the content of one INDI/FAM record of the shared model."""
+    content = sorted((key, value) for key, value in record.items() if key not in POSITION_FIELDS)
+    return hashlib.blake2b(repr(content).encode(), digest_size=16).digest()
+
+def model_digests(individuals, families):
+    digests = {}
+    for records in (individuals, families):
+        for record_id, record in records.items():
+            digests[record_id] = record_digest(record)
+    return digests
+
+def changed_records(old_digests, new_digests):
+    """IDs of the level 0 records added, removed or edited between two runs."""
+    changed = set(old_digests.keys() ^ new_digests.keys())
+    changed.update(
+        record_id for record_id, digest in new_digests.items()
+        if record_id in old_digests and old_digests[record_id] != digest
+    )
+    return changed
+
+def family_ring(record_ids, individuals, families):
+    """
+    Adds the families of the given records and every member of those families.
+    A family belongs to a record whether the record points at it (FAMC, FAMS)
+    or it points at the record (HUSB, WIFE, CHIL); files do not always link
+    both ways.
+    """
+    record_ids = set(record_ids)
+    fam_ids = set()
+    for record_id in record_ids:
+        if record_id in families:
+            fam_ids.add(record_id)
+        indi = individuals.get(record_id)
+        if indi:
+            fam_ids.update(indi.get("famc", []))
+            fam_ids.update(indi.get("fams", []))
+    for fam_id, fam in families.items():
+        if (fam.get("husb") in record_ids or fam.get("wife") in record_ids
+                or not record_ids.isdisjoint(fam.get("children", []))):
+            fam_ids.add(fam_id)
+
+    ring = record_ids | fam_ids
+    for fam_id in fam_ids:
+        fam = families.get(fam_id)
+        if fam:
+            ring.update(member for member in (fam.get("husb"), fam.get("wife")) if member)
+            ring.update(fam.get("children", []))
+    return ring
+
+def affected_records(changed, old_model, new_model):
+    """
+    Records whose local check results can change: the edited records plus
+    their families and relatives, as linked in either the old or new file.
+    """
+    affected = set(changed)
+    for individuals, families in (old_model, new_model):
+        affected |= family_ring(changed, individuals, families)
+    return affected
+
+def submodel(individuals, families, record_ids):
+    """The part of the model around the given records that local checks need to see."""
+    context = family_ring(record_ids, individuals, families)
+    return (
+        {indi_id: indi for indi_id, indi in individuals.items() if indi_id in context},
+        {fam_id: fam for fam_id, fam in families.items() if fam_id in context}
+    )
+
+def mentioned_ids(result, known_ids):
+    """The record IDs a check result refers to, with or without the surrounding '@'."""
+    if isinstance(result, CheckError):
+        return frozenset(record_id.strip("@") for record_id in result.ids) & known_ids
+    values = result if isinstance(result, tuple) else (result,)
+    tokens = set()
+    for value in values:
+        tokens.update(ID_TOKEN.findall(str(value)))
+    return frozenset(tokens & known_ids)
+
+def relocated(result, old_model, new_model):
+    """
+    A kept error whose source line moved with its record when lines above it
+    were edited. The line belongs to the error's first record, which is
+    unchanged, so it moved as far as that record's header.
+    """
+    if not isinstance(result, CheckError) or result.line is None:
+        return result
+    record_id = result.ids[0]
+    old_line, new_line = [
+        source_line(individuals, record_id) or source_line(families, record_id)
+        for individuals, families in (old_model, new_model)
+    ]
+    if old_line is None or new_line is None:
+        return result
+    return result.moved(new_line - old_line)
+
+def plain_ids(*digest_maps):
+    ids = set()
+    for digests in digest_maps:
+        ids.update(record_id.strip("@") for record_id in digests)
+    return ids
+
+def check_fingerprint(path):
+    """Cached results are only reused while the check's source file is unchanged."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def default_state_path(filename):
+    """The state of a GEDCOM file's runs, kept in the per-user cache directory next to its snapshot."""
+    return cache_path(filename, suffix=STATE_SUFFIX)
+
+def load_state(state_path):
+    """The previous run's state, unless it is missing or not signed by this user's cache (see read_signed)."""
+    state = read_signed(state_path, STATE_MAGIC, STATE_VERSION)
+    return state if isinstance(state, dict) else None
+
+def save_state(state_path, model, digests, checks, outcomes, reference=None):
+    known_ids = plain_ids(digests)
+    results = {}
+    for (story, path, func_name), (check_results, seconds, failure) in zip(checks, outcomes):
+        results[story] = {
+            "fingerprint": check_fingerprint(path),
+            "failure": failure,
+            "results": [(result, mentioned_ids(result, known_ids)) for result in check_results]
+        }
+
+    state = {"model": model, "digests": digests, "results": results, "reference": reference}
+    write_signed(state_path, STATE_MAGIC, STATE_VERSION, state)
+
+def can_reuse(story, path, previous):
+    """A local check's previous results are reusable if they ran cleanly and every result names a record."""
+    return (
+        previous is not None
+        and story not in GLOBAL_CHECKS
+        and previous["failure"] is None
+        and previous["fingerprint"] == check_fingerprint(path)
+        and all(ids for _, ids in previous["results"])
+    )
+
+def run_incremental(filename, state_path=None, workers=1, checks=None, use_cache=True,
+                    reference=None, use_mmap=False):
+    """
+    Validates a GEDCOM file reusing the model and results persisted by the
+    previous run. Records are diffed at level 0 granularity; local checks
+    re-run only on the edited records and their relatives and are merged
+    with the previous results for everything else, after which they list
+    the results of the re-checked records. Ages are counted to 'reference'
+    (default: today); when that day differs from the previous run's, no
+    result is reused, since ages and age-based checks may have changed.
+    Returns (report entries, parse seconds, affected record IDs), the last
+    being None when everything had to be checked from scratch. The state
+    is kept at 'state_path' (default: see default_state_path).
+    """
+    checks = checks if checks is not None else discover_checks()
+    state_path = state_path or default_state_path(filename)
+    reference = set_reference_date(reference)
+
+    start = time.perf_counter()
+    individuals, families = load_model(filename, use_cache, use_mmap)
+    parse_seconds = time.perf_counter() - start
+
+    digests = model_digests(individuals, families)
+    state = load_state(state_path)
+    if state and state["reference"] != reference:
+        state = None
+    previous = state["results"] if state else {}
+
+    reusable = [check for check in checks if can_reuse(check[0], check[1], previous.get(check[0]))]
+    full = [check for check in checks if check not in reusable]
+    affected = None
+
+    outcomes = {}
+    if reusable:
+        changed = changed_records(state["digests"], digests)
+        affected = affected_records(changed, state["model"], (individuals, families))
+        known_ids = plain_ids(state["digests"], digests)
+        affected_plain = {record_id.strip("@") for record_id in affected}
+
+        local_model = submodel(individuals, families, affected)
+        for check, (results, seconds, failure) in zip(reusable, run_model_checks(*local_model, reusable, workers)):
+            new_results = [(result, mentioned_ids(result, known_ids)) for result in results]
+            if failure or not all(ids for _, ids in new_results):
+                # Cannot tell which records these belong to; check everything instead
+                full.append(check)
+                continue
+            kept = [
+                relocated(result, state["model"], (individuals, families))
+                for result, ids in previous[check[0]]["results"] if not ids & affected_plain
+            ]
+            fresh = [result for result, ids in new_results if ids & affected_plain]
+            outcomes[check] = (kept + fresh, seconds, None)
+
+    for check, outcome in zip(full, run_model_checks(individuals, families, full, workers)):
+        outcomes[check] = outcome
+
+    ordered = [outcomes[check] for check in checks]
+    save_state(state_path, (individuals, families), digests, checks, ordered, reference)
+    entries = [report_entry(*check, *outcome) for check, outcome in zip(checks, ordered)]
+    return entries, parse_seconds, affected
@@ -0,0 +1,119 @@
+import functools
+import json
+import time
+import tracemalloc
+
+class CountingRecords(dict):
+    """
+    A model dict (individuals or families) that counts the records handed out:
+    one per get or [] lookup, and every record for each pass over keys,
+    values or items. Membership tests are not counted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.visits = 0
+
+    def __getitem__(self, key):
+        self.visits += 1
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.visits += 1
+        return super().get(key, default)
+
+    def __iter__(self):
+        self.visits += len(self)
+        return super().__iter__()
+
+    def keys(self):
+        self.visits += len(self)
+        return super().keys()
+
+    def values(self):
+        self.visits += len(self)
+        return super().values()
+
+    def items(self):
+        self.visits += len(self)
+        return super().items()
+
+def counting_model(individuals, families):
+    """
+    Copies of the model that count record visits. The same pair should be
+    handed to every check of a run, so tables cached per model are still shared.
+    """
+    return CountingRecords(individuals), CountingRecords(families)
+
+def instrument(check, report, name=None):
+    """
+    Wraps a check function so that every call appends to 'report' a dict with
+    its wall time, CPU time, peak memory allocated while it ran (tracemalloc)
+    and the number of model records it visited (None unless it was handed
+    CountingRecords). Results are materialized inside the measurement, so
+    lazily produced results are measured too. Tracing allocations slows
+    Python code down, so the times are only comparable with each other.
+    """
+    name = name or check.__name__
+
+    @functools.wraps(check)
+    def wrapper(*args, **kwargs):
+        counted = [arg for arg in args if isinstance(arg, CountingRecords)]
+        for records in counted:
+            records.visits = 0
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            result = check(*args, **kwargs)
+            if result is not None and not isinstance(result, (list, tuple, dict, str)):
+                result = list(result)
+            return result
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            if started_tracing:
+                tracemalloc.stop()
+            report.append({
+                "check": name,
+                "wall_seconds": wall,
+                "cpu_seconds": cpu,
+                "peak_alloc_bytes": max(peak, 0),
+                "records_visited": sum(records.visits for records in counted) if counted else None
+            })
+    return wrapper
+
+def format_stats_table(entries):
+    """
+    A summary table of the report entries that carry 'stats', slowest first,
+    so the check to blame for a long run is on top.
+    """
+    rows = [entry for entry in entries if entry.get("stats")]
+    rows.sort(key=lambda entry: entry["stats"]["wall_seconds"], reverse=True)
+
+    lines = [f"{'story':<6} {'check':<40} {'wall ms':>10} {'cpu ms':>10} {'peak KB':>10} {'visited':>10}"]
+    for entry in rows:
+        stats = entry["stats"]
+        visited = stats["records_visited"]
+        lines.append(
+            f"{entry['story']:<6} {entry['check']:<40} {stats['wall_seconds'] * 1000:>10.2f}"
+            f" {stats['cpu_seconds'] * 1000:>10.2f} {stats['peak_alloc_bytes'] / 1024:>10.1f}"
+            f" {visited if visited is not None else '-':>10}"
+        )
+    return "\n".join(lines)
+
+def write_stats_json(entries, parse_seconds, gedcom_file, output_path):
+    """Writes the measurements of a run as JSON: one object per check, in run order."""
+    checks = [{
+        "story": entry["story"],
+        "check": entry["check"],
+        "results": len(entry["results"]),
+        "failure": entry["failure"],
+        **(entry.get("stats") or {})
+    } for entry in entries]
+    with open(output_path, "w") as f:
+        json.dump({"gedcom_file": gedcom_file, "parse_seconds": parse_seconds, "checks": checks}, f, indent=2)
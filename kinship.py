@@ -0,0 +1,90 @@
+from gedcom_index import parent_families_by_child
+
+# Consanguinity of a couple, as generations from each spouse up to their
+# lowest common ancestor (the spouse listed first is the husband)
+SIBLINGS = (1, 1)
+FIRST_COUSINS = (2, 2)
+SECOND_COUSINS = (3, 3)
+UNCLE_OR_AUNT = (1, 2)
+NEPHEW_OR_NIECE = (2, 1)
+
+# Deep enough for every relationship above without walking whole pedigrees
+MAX_DEPTH = 3
+
+def build_kinship_index(families):
+    """
+    Maps every child in the shared model to their parents, across all the
+    families they were born into. A missing husband or wife is replaced by a
+    placeholder for that family, so children of one family always share it.
+    """
+    parents = {}
+    for child, fam_ids in parent_families_by_child(families).items():
+        child_parents = parents[child] = set()
+        for fam_id in fam_ids:
+            fam = families[fam_id]
+            for role in ("husb", "wife"):
+                child_parents.add(fam.get(role) or (fam_id, role))
+    return parents
+
+def ancestor_depths(parents, person, max_depth=MAX_DEPTH):
+    """Breadth first walk up the tree: ancestor -> fewest generations above 'person' (itself at 0)."""
+    depths = {person: 0}
+    level = [person]
+    for depth in range(1, max_depth + 1):
+        next_level = []
+        for current in level:
+            for parent in parents.get(current, ()):
+                if parent not in depths:
+                    depths[parent] = depth
+                    next_level.append(parent)
+        if not next_level:
+            break
+        level = next_level
+    return depths
+
+def lowest_common_ancestors(parents, first, second, max_depth=MAX_DEPTH):
+    """
+    Returns {ancestor: (generations from first, generations from second)} for
+    the common ancestors of the pair that are not an ancestor of another one.
+    """
+    first_depths = ancestor_depths(parents, first, max_depth)
+    second_depths = ancestor_depths(parents, second, max_depth)
+    common = first_depths.keys() & second_depths.keys()
+
+    # Ancestors of the common ancestors are common too; only the lowest count
+    higher = set()
+    for ancestor in common:
+        higher.update(parents.get(ancestor, ()))
+
+    return {
+        ancestor: (first_depths[ancestor], second_depths[ancestor])
+        for ancestor in common - higher
+    }
+
+def kinship_degrees(parents, first, second, max_depth=MAX_DEPTH):
+    """The set of (generations, generations) degrees relating the pair through their lowest common ancestors."""
+    return set(lowest_common_ancestors(parents, first, second, max_depth).values())
+
+def couple_kinships(families, parents=None, max_depth=MAX_DEPTH):
+    """
+    Evaluates every married couple once against a shared parent index.
+    Yields (family id, husband, wife, degrees) for couples who are related.
+    """
+    if parents is None:
+        parents = build_kinship_index(families)
+
+    for fam_id, fam in families.items():
+        husb = fam.get("husb")
+        wife = fam.get("wife")
+        if not husb or not wife:
+            continue
+
+        degrees = kinship_degrees(parents, husb, wife, max_depth)
+        if degrees:
+            yield fam_id, husb, wife, degrees
+
+def couples_related_as(families, degree, parents=None):
+    """Yields (family id, husband, wife) for every couple related by exactly 'degree'."""
+    for fam_id, husb, wife, degrees in couple_kinships(families, parents, max(degree)):
+        if degree in degrees:
+            yield fam_id, husb, wife
@@ -0,0 +1,429 @@
+import argparse
+import glob
+import importlib.util
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from gedcom_ages import reference_date, set_reference_date
+from gedcom_errors import CsvSink, JsonlSink, format_result, replay, write_errors_csv, write_errors_jsonl
+from gedcom_mmap import read_gedcom_mmap
+from gedcom_parser import load_gedcom, read_gedcom
+from gedcom_symbols import share_tables, shared_tables
+from instrumentation import counting_model, format_stats_table, instrument, write_stats_json
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Every user story module exposes one usNN_* function taking the shared model
+CHECK_NAME = re.compile(r"^(us\d\d)_\w+$")
+
+loaded_modules = {}
+worker_model = None
+
+def load_module(path):
+    """Imports a user story module from its file path, once per process."""
+    if path not in loaded_modules:
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        loaded_modules[path] = module
+    return loaded_modules[path]
+
+def discover_checks(base_dir=BASE_DIR):
+    """
+    Finds the model-level check of every user story module in sprint_1..sprint_N.
+    Returns a list of (story, path, function name) sorted by story number; the
+    function name is None when the module cannot be imported.
+    """
+    checks = []
+    for path in sorted(glob.glob(os.path.join(base_dir, "sprint_*", "us*.py"))):
+        try:
+            module = load_module(path)
+        except ImportError:
+            # Reported as a failed check when run instead of aborting the whole run
+            story = os.path.splitext(os.path.basename(path))[0].upper()
+            checks.append((story, path, None))
+            continue
+        for name, obj in vars(module).items():
+            match = CHECK_NAME.match(name)
+            if match and callable(obj) and obj.__module__ == module.__name__:
+                checks.append((match.group(1).upper(), path, name))
+    checks.sort()
+    return checks
+
+def first_results(check, limit, individuals, families):
+    """The first 'limit' results of a check; a check yielding its results lazily stops there."""
+    return list(islice(check(individuals, families), limit))
+
+def run_check(individuals, families, path, func_name, report=None, limit=None):
+    """
+    Runs one check against the model, returning (results, seconds, failure).
+    Given a 'report' list, the check runs instrumented and its measurements
+    are appended to it. Given a 'limit', at most that many results are taken.
+    """
+    start = time.perf_counter()
+    try:
+        check = getattr(load_module(path), func_name)
+        if limit is not None:
+            check = partial(first_results, check, limit)
+        if report is not None:
+            check = instrument(check, report, func_name)
+        results = list(check(individuals, families))
+        failure = None
+    except Exception as e:
+        results = []
+        failure = f"{type(e).__name__}: {e}"
+    return results, time.perf_counter() - start, failure
+
+def stream_check(individuals, families, path, func_name, on_result, limit=None):
+    """
+    Runs one check against the model, handing each result to 'on_result' as
+    the check yields it instead of collecting them. Given a 'limit', at most
+    that many results are handed on; one more is drawn to tell whether the
+    check was cut short. Returns (results handed on, seconds, failure,
+    truncated); the seconds leave out the time spent in 'on_result'.
+    """
+    start = time.perf_counter()
+    handing = 0.0
+    count, failure, truncated = 0, None, False
+    try:
+        for result in getattr(load_module(path), func_name)(individuals, families):
+            if limit is not None and count >= limit:
+                truncated = True
+                break
+            handed = time.perf_counter()
+            on_result(result)
+            handing += time.perf_counter() - handed
+            count += 1
+    except Exception as e:
+        failure = f"{type(e).__name__}: {e}"
+    return count, time.perf_counter() - start - handing, failure, truncated
+
+def init_worker(individuals, families, reference=None):
+    """Worker initializer: keeps the model, shares its tables and ages people to the same day as the parent."""
+    global worker_model
+    worker_model = (individuals, families)
+    share_tables(individuals, families)
+    set_reference_date(reference)
+
+def run_check_in_worker(path, func_name, instrumented=False, limit=None):
+    """Runs one check in a pool worker; returns its outcome and its measurements, if instrumented."""
+    report = [] if instrumented else None
+    return run_check(*worker_model, path, func_name, report, limit), report
+
+def min_limit(*limits):
+    limits = [limit for limit in limits if limit is not None]
+    return min(limits) if limits else None
+
+def run_model_checks(individuals, families, checks, workers=1, report=None, limit=None, total=None):
+    """
+    Runs the given checks against one model, returning (results, seconds, failure)
+    per check. Given a 'report' list, every check runs instrumented and its
+    measurements are appended to it.
+
+    'limit' caps the results taken from each check and 'total' the results of
+    all of them. Run serially, checks stop being run once 'total' results were
+    collected, so fewer outcomes than checks may come back; pool workers only
+    apply both caps to each check.
+    """
+    if workers > 1 and len(checks) > 1:
+        limit = min_limit(limit, total)
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(individuals, families, reference_date())) as pool:
+            futures = [pool.submit(run_check_in_worker, path, func_name, report is not None, limit)
+                       for _, path, func_name in checks]
+            outcomes = []
+            for future in futures:
+                outcome, check_report = future.result()
+                outcomes.append(outcome)
+                if report is not None:
+                    report.extend(check_report)
+            return outcomes
+    outcomes = []
+    collected = 0
+    with shared_tables(individuals, families):
+        for _, path, func_name in checks:
+            if total is not None and collected >= total:
+                break
+            remaining = total - collected if total is not None else None
+            outcomes.append(run_check(individuals, families, path, func_name, report, min_limit(limit, remaining)))
+            collected += len(outcomes[-1][0])
+    return outcomes
+
+def cap_entries(entries, max_errors=None, max_total=None):
+    """
+    Trims report entries to at most 'max_errors' results each and 'max_total'
+    in all, in check order, dropping the entries left without any budget.
+    A trimmed entry is marked 'truncated'.
+    """
+    capped = []
+    remaining = max_total
+    for entry in entries:
+        if remaining is not None and remaining <= 0:
+            break
+        keep = min_limit(max_errors, remaining)
+        if keep is not None and len(entry["results"]) > keep:
+            entry["results"] = entry["results"][:keep]
+            entry["truncated"] = True
+        if remaining is not None:
+            remaining -= len(entry["results"])
+        capped.append(entry)
+    return capped
+
+def report_entry(story, path, func_name, results, seconds, failure):
+    return {
+        "story": story,
+        "check": func_name or os.path.basename(path),
+        "results": results,
+        "seconds": seconds,
+        "failure": failure
+    }
+
+def load_model(filename, use_cache=True, use_mmap=False):
+    """
+    The model of a GEDCOM file: its cached snapshot unless 'use_cache' is
+    false, else parsed by read_gedcom, or by read_gedcom_mmap with 'use_mmap'.
+    """
+    reader = read_gedcom_mmap if use_mmap else read_gedcom
+    return load_gedcom(filename, reader=reader) if use_cache else reader(filename)
+
+def run_checks(filename, workers=1, checks=None, use_cache=True, instrumented=False,
+               max_errors=None, max_total=None, use_mmap=False):
+    """
+    Parses the GEDCOM file once (or loads its cached snapshot) and runs every
+    discovered check against it, optionally fanned out across a pool of
+    worker processes. With 'instrumented', every check is measured and its
+    report entry gets a 'stats' dict (see instrumentation.instrument).
+    Ages are counted to the day the run starts.
+
+    'max_errors' stops each check after that many results and 'max_total'
+    stops the run after that many results overall (1 fails fast); checks
+    yield their results lazily, so a broken file costs no more than the caps.
+    Capped entries are marked 'truncated', and checks the run stopped before
+    have no entry. With 'use_mmap' the file is parsed from a memory map (see
+    load_model).
+    Returns (report entries, parse seconds).
+    """
+    checks = checks if checks is not None else discover_checks()
+    set_reference_date()
+
+    start = time.perf_counter()
+    individuals, families = load_model(filename, use_cache, use_mmap)
+    parse_seconds = time.perf_counter() - start
+
+    report = None
+    if instrumented:
+        individuals, families = counting_model(individuals, families)
+        report = []
+    # One result past each cap tells a capped check from one with exactly that many
+    outcomes = run_model_checks(individuals, families, checks, workers, report,
+                                max_errors + 1 if max_errors is not None else None,
+                                max_total + 1 if max_total is not None else None)
+    entries = [report_entry(*check, *outcome) for check, outcome in zip(checks, outcomes)]
+    entries = cap_entries(entries, max_errors, max_total)
+    if instrumented:
+        stats = {check_stats["check"]: check_stats for check_stats in report}
+        for entry in entries:
+            entry["stats"] = stats.get(entry["check"])
+    return entries, parse_seconds
+
+class ReportWriter:
+    """
+    Writes the text report of a run as its results arrive: start() opens the
+    section of a check, add() writes one result and finish() closes the
+    section with its outcome and time. Only the totals are kept.
+    """
+
+    def __init__(self, output_path, gedcom_file, parse_seconds):
+        self.file = open(output_path, "w")
+        self.file.write(f"Validation report for {gedcom_file}\n")
+        self.file.write(f"Parsed in {parse_seconds * 1000:.2f} ms\n")
+        self.checks = 0
+        self.seconds = parse_seconds
+
+    def start(self, story, check):
+        self.file.write(f"\n{story} ({check})\n")
+
+    def add(self, result):
+        self.file.write(f"  {format_result(result)}\n")
+
+    def finish(self, count, seconds, failure, truncated=False):
+        if failure:
+            outcome = f"CHECK FAILED: {failure}"
+        elif truncated:
+            outcome = f"... stopped after {count} results"
+        elif count:
+            outcome = f"{count} results"
+        else:
+            outcome = "PASSED"
+        self.file.write(f"  {outcome} - {seconds * 1000:.2f} ms\n")
+        self.checks += 1
+        self.seconds += seconds
+
+    def close(self):
+        self.file.write(f"\n{self.checks} checks, total {self.seconds * 1000:.2f} ms\n")
+        self.file.close()
+
+def pooled_outcomes(individuals, families, checks, workers, limit=None):
+    """
+    Runs the checks across a pool of worker processes, yielding the outcome of
+    each in check order as soon as it is done. Closing the generator early
+    cancels the checks not started yet.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                               initargs=(individuals, families, reference_date()))
+    try:
+        futures = [pool.submit(run_check_in_worker, path, func_name, False, limit) for _, path, func_name in checks]
+        for future in futures:
+            yield future.result()[0]
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def stream_model_checks(individuals, families, checks, writers, workers=1, max_errors=None, max_total=None):
+    """
+    Runs the given checks against one model and hands every result to the
+    writers (ReportWriter, gedcom_errors.JsonlSink and CsvSink) as it is
+    produced, keeping only counters, so a file with millions of errors is
+    written out without holding them. Each check is announced with start(),
+    its results go through add() and its counters through finish().
+
+    The caps work as in run_checks. Pool workers send each check's results
+    back together, so with 'workers' one check's results at a time are held.
+    Returns (results written, whether a cap cut a check short).
+    """
+    outcomes = None
+    if workers > 1 and len(checks) > 1:
+        limit = min_limit(max_errors, max_total)
+        outcomes = pooled_outcomes(individuals, families, checks, workers, limit + 1 if limit is not None else None)
+
+    def add(result):
+        for writer in writers:
+            writer.add(result)
+
+    written, cut_short = 0, False
+    try:
+        with shared_tables(individuals, families):
+            for story, path, func_name in checks:
+                remaining = max_total - written if max_total is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+                limit = min_limit(max_errors, remaining)
+                for writer in writers:
+                    writer.start(story, func_name or os.path.basename(path))
+                if outcomes is None:
+                    count, seconds, failure, truncated = stream_check(individuals, families, path, func_name,
+                                                                      add, limit)
+                else:
+                    results, seconds, failure = next(outcomes)
+                    truncated = limit is not None and len(results) > limit
+                    results = results[:limit] if truncated else results
+                    for result in results:
+                        add(result)
+                    count = len(results)
+                    del results
+                for writer in writers:
+                    writer.finish(count, seconds, failure, truncated)
+                written += count
+                cut_short = cut_short or truncated
+    finally:
+        if outcomes is not None:
+            outcomes.close()
+    return written, cut_short
+
+def stream_run(filename, output_path, workers=1, checks=None, use_cache=True, max_errors=None, max_total=None,
+               errors_jsonl=None, errors_csv=None, use_mmap=False):
+    """
+    The run of run_checks followed by write_report, with every result written
+    to the report (and to the JSON Lines and CSV files, if given) as soon as
+    its check yields it; see stream_model_checks.
+    Returns (results written, whether a cap cut a check short).
+    """
+    checks = checks if checks is not None else discover_checks()
+    set_reference_date()
+
+    start = time.perf_counter()
+    individuals, families = load_model(filename, use_cache, use_mmap)
+    parse_seconds = time.perf_counter() - start
+
+    writers = [ReportWriter(output_path, filename, parse_seconds)]
+    if errors_jsonl:
+        writers.append(JsonlSink(errors_jsonl))
+    if errors_csv:
+        writers.append(CsvSink(errors_csv))
+    try:
+        return stream_model_checks(individuals, families, checks, writers, workers, max_errors, max_total)
+    finally:
+        for writer in writers:
+            writer.close()
+
+def write_report(entries, parse_seconds, gedcom_file, output_path="validation_output.txt"):
+    replay(entries, ReportWriter(output_path, gedcom_file, parse_seconds))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every user story check against one GEDCOM file.")
+    parser.add_argument("gedcom_file", nargs="?", default=os.path.join(BASE_DIR, "M1B6.ged"))
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--output", default="validation_output.txt")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-check records changed since the previous incremental run")
+    parser.add_argument("--state",
+                        help="where the incremental run keeps the previous model and results "
+                             "(default: a file per GEDCOM file in the per-user cache directory)")
+    parser.add_argument("--no-cache", action="store_true", help="always parse instead of loading the cached snapshot")
+    parser.add_argument("--mmap", action="store_true",
+                        help="parse from a memory map of the file, decoding only its INDI and FAM records")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="split per-family checks into this many chunks of families across the workers")
+    parser.add_argument("--instrument", nargs="?", const="check_stats.json", metavar="JSON",
+                        help="measure every check and save the measurements as JSON (default: check_stats.json)")
+    parser.add_argument("--max-errors", type=int, metavar="N", help="stop each check after N results")
+    parser.add_argument("--max-total-errors", type=int, metavar="N",
+                        help="stop the whole run after N results (1 fails on the first error)")
+    parser.add_argument("--errors-jsonl", metavar="PATH", help="also write every result as one JSON object per line")
+    parser.add_argument("--errors-csv", metavar="PATH", help="also write every result as one CSV row")
+    args = parser.parse_args()
+    capped = args.max_errors is not None or args.max_total_errors is not None
+    if (args.instrument or capped) and (args.incremental or args.shards):
+        parser.error("--instrument, --max-errors and --max-total-errors cannot be combined with --incremental or --shards")
+
+    print(f"Running all checks against {args.gedcom_file}...")
+    if args.incremental or (args.shards and args.workers > 1) or args.instrument:
+        if args.incremental:
+            from incremental import run_incremental
+            entries, parse_seconds, affected = run_incremental(args.gedcom_file, args.state, workers=args.workers,
+                                                               use_cache=not args.no_cache, use_mmap=args.mmap)
+            if affected is not None:
+                print(f"Re-checked {len(affected)} records affected by changes since the last run.")
+        elif args.instrument:
+            entries, parse_seconds = run_checks(args.gedcom_file, workers=args.workers, use_cache=not args.no_cache,
+                                                instrumented=True, max_errors=args.max_errors,
+                                                max_total=args.max_total_errors, use_mmap=args.mmap)
+        else:
+            from sharded import run_sharded
+            entries, parse_seconds = run_sharded(args.gedcom_file, args.workers, args.shards,
+                                                 use_cache=not args.no_cache, use_mmap=args.mmap)
+        write_report(entries, parse_seconds, args.gedcom_file, args.output)
+        if args.errors_jsonl:
+            write_errors_jsonl(entries, args.errors_jsonl)
+        if args.errors_csv:
+            write_errors_csv(entries, args.errors_csv)
+        cut_short = any(entry.get("truncated") for entry in entries)
+    else:
+        # Results go straight to the report and sinks as the checks yield them
+        _, cut_short = stream_run(args.gedcom_file, args.output, workers=args.workers, use_cache=not args.no_cache,
+                                  max_errors=args.max_errors, max_total=args.max_total_errors,
+                                  errors_jsonl=args.errors_jsonl, errors_csv=args.errors_csv, use_mmap=args.mmap)
+    print(f"Validation complete. Results saved to '{args.output}'.")
+    if args.errors_jsonl:
+        print(f"Results saved as JSON Lines to '{args.errors_jsonl}'.")
+    if args.errors_csv:
+        print(f"Results saved as CSV to '{args.errors_csv}'.")
+    if capped and cut_short:
+        print("Some checks were stopped early by the error caps.")
+    if args.instrument:
+        write_stats_json(entries, parse_seconds, args.gedcom_file, args.instrument)
+        print(f"\n{format_stats_table(entries)}\n\nCheck measurements saved to '{args.instrument}'.")
@@ -0,0 +1,145 @@
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from gedcom_ages import age_column, set_reference_date
+from gedcom_columns import date_columns
+from gedcom_dates import parse_gedcom_date
+from gedcom_symbols import share_tables, shared_tables
+from run_checks import discover_checks, load_model, report_entry, run_check
+
+# Checks whose results for a family only depend on that family and the people
+# it lists (spouses and children), reported family by family in model order.
+# Any other check runs once on the whole model.
+SHARDED_CHECKS = {"US12", "US13", "US14", "US15", "US16", "US21", "US23", "US25"}
+
+# Set in each worker process by attach_model, or in the parent before forking
+# the workers so they inherit it
+worker_model = None
+worker_family_ids = None
+
+def family_chunks(family_count, shard_count):
+    """Splits family positions 0..family_count into up to shard_count contiguous (start, stop) ranges."""
+    shard_count = max(1, min(shard_count, family_count))
+    size, extra = divmod(family_count, shard_count)
+    chunks = []
+    start = 0
+    for shard in range(shard_count):
+        stop = start + size + (1 if shard < extra else 0)
+        chunks.append((start, stop))
+        start = stop
+    return chunks
+
+def shard_model(individuals, families, family_ids):
+    """The given families, in order, with every individual they reference."""
+    shard_families = {fam_id: families[fam_id] for fam_id in family_ids}
+    shard_individuals = {}
+    for fam in shard_families.values():
+        for indi_id in (fam.get("husb"), fam.get("wife"), *(fam.get("children") or ())):
+            if indi_id in individuals:
+                shard_individuals[indi_id] = individuals[indi_id]
+    return shard_individuals, shard_families
+
+def keep_model(individuals, families):
+    """
+    Makes 'individuals, families' the model of this process and builds the
+    date and age columns most checks read on its shared tables (the caller
+    shares them, see share_tables), so workers forked afterwards inherit all
+    of it. The columns are flat arrays nothing writes to, so their pages stay
+    shared with the parent instead of being copied into every worker.
+    """
+    global worker_model, worker_family_ids
+    worker_model = (individuals, families)
+    worker_family_ids = list(families)
+    date_columns(individuals, families, parse_gedcom_date)
+    for at_death in (True, False):
+        age_column(individuals, families, at_death)
+
+def attach_model(name, reference=None):
+    """
+    Worker initializer: ages people to the same day as the parent and, unless
+    the model was inherited when the worker was forked (name is None),
+    unpickles it straight from the shared memory block the parent wrote it
+    to, once per worker instead of once per task.
+    """
+    global worker_model, worker_family_ids
+    set_reference_date(reference)
+    if name is None:
+        return
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        worker_model = pickle.loads(block.buf)
+    finally:
+        block.close()
+    worker_family_ids = list(worker_model[1])
+    share_tables(*worker_model)
+
+def run_whole(path, func_name):
+    return 0, run_check(*worker_model, path, func_name)
+
+def run_shard(path, func_name, start, stop):
+    """Runs a check on the families at positions start..stop; returns 'start' with its outcome."""
+    individuals, families = worker_model
+    return start, run_check(*shard_model(individuals, families, worker_family_ids[start:stop]), path, func_name)
+
+def merge_shards(outcomes):
+    """
+    Concatenates the results of (first family position, outcome) pairs in
+    family order, whatever order the shards finished in, so they read like
+    the serial run's; seconds add up across shards.
+    """
+    results, seconds, failure = [], 0.0, None
+    for _, (shard_results, shard_seconds, shard_failure) in sorted(outcomes, key=lambda outcome: outcome[0]):
+        results.extend(shard_results)
+        seconds += shard_seconds
+        failure = failure or shard_failure
+    return results, seconds, failure
+
+def run_sharded(filename, workers, shards=None, checks=None, use_cache=True, use_mmap=False):
+    """
+    Runs every check across a pool of worker processes, splitting the
+    per-family checks in SHARDED_CHECKS into contiguous chunks of families.
+    Forked workers inherit the model and its prebuilt columns (see
+    keep_model); otherwise the model is placed in shared memory once for all
+    workers to unpickle. Shard results are merged in family order, so the
+    report matches a serial run. Returns (report entries, parse seconds).
+    """
+    global worker_model, worker_family_ids
+    checks = checks if checks is not None else discover_checks()
+    shards = shards or workers * 4
+    reference = set_reference_date()
+
+    start = time.perf_counter()
+    model = load_model(filename, use_cache, use_mmap)
+    parse_seconds = time.perf_counter() - start
+
+    block = None
+    with shared_tables(*model):
+        if multiprocessing.get_start_method() == "fork":
+            keep_model(*model)
+        else:
+            payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+            block = shared_memory.SharedMemory(create=True, size=max(1, len(payload)))
+            block.buf[:len(payload)] = payload
+        try:
+            chunks = family_chunks(len(model[1]), shards)
+            name = block.name if block is not None else None
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=attach_model, initargs=(name, reference)) as pool:
+                futures = []
+                for story, path, func_name in checks:
+                    if story in SHARDED_CHECKS and func_name:
+                        futures.append([pool.submit(run_shard, path, func_name, *chunk) for chunk in chunks])
+                    else:
+                        futures.append([pool.submit(run_whole, path, func_name)])
+                outcomes = [merge_shards(future.result() for future in check_futures) for check_futures in futures]
+        finally:
+            worker_model = worker_family_ids = None
+            if block is not None:
+                block.close()
+                block.unlink()
+
+    entries = [report_entry(*check, *outcome) for check, outcome in zip(checks, outcomes)]
+    return entries, parse_seconds
@@ -0,0 +1,31 @@
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import gedcom_ages
+import gedcom_columns
+from gedcom_errors import messages
+from us07 import us07_less_than_150_years_old
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Runs a test with NumPy columns (skipped when NumPy is missing) and with the plain array fallback."""
+    np = pytest.importorskip("numpy") if request.param == "numpy" else None
+    monkeypatch.setattr(gedcom_columns, "np", np)
+    monkeypatch.setattr(gedcom_ages, "np", np)
+    return request.param
+
+def test_lifespans_over_150_years(backend):
+    individuals = {
+        "@I1@": {"birth": "1 JAN 1700", "death": "1 JAN 1900"},
+        "@I2@": {"birth": "1 JAN 1800"},
+        "@I3@": {"birth": "1 JAN 1950", "death": "1 JAN 2000"},
+        "@I4@": {"death": "1 JAN 1900"}
+    }
+    errors = messages(us07_less_than_150_years_old(individuals, {}))
+    assert errors[0] == "ERROR US07: INDIVIDUAL I1 lived more than 150 years: 200"
+    assert errors[1].startswith("ERROR US07: INDIVIDUAL I2 is alive and older than 150 years: ")
+    assert len(errors) == 2
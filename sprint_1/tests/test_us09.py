@@ -5,6 +5,7 @@ import unittest
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from us09 import us09_birth_before_death_of_parents
+from gedcom_errors import messages
 
 class TestUS09(unittest.TestCase):
     def test_child_after_mother_death(self):
@@ -16,7 +17,7 @@ class TestUS09(unittest.TestCase):
         families = {
             'F1': {'husb': 'F1', 'wife': 'M1', 'children': ['I1']}
         }
-        errors = us09_birth_before_death_of_parents(individuals, families)
+        errors = messages(us09_birth_before_death_of_parents(individuals, families))
         self.assertTrue(any("mother's death" in e for e in errors))
 
     def test_child_too_late_after_father_death(self):
@@ -28,7 +29,7 @@ class TestUS09(unittest.TestCase):
         families = {
             'F2': {'husb': 'F2', 'wife': 'M2', 'children': ['I2']}
         }
-        errors = us09_birth_before_death_of_parents(individuals, families)
+        errors = messages(us09_birth_before_death_of_parents(individuals, families))
         self.assertTrue(any("father's death" in e for e in errors))
 
     def test_child_valid_birth(self):
@@ -40,7 +41,7 @@ class TestUS09(unittest.TestCase):
         families = {
             'F3': {'husb': 'F3', 'wife': 'M3', 'children': ['I3']}
         }
-        errors = us09_birth_before_death_of_parents(individuals, families)
+        errors = messages(us09_birth_before_death_of_parents(individuals, families))
         self.assertEqual(errors, [])
 
     def test_no_death_dates(self):
@@ -52,7 +53,7 @@ class TestUS09(unittest.TestCase):
         families = {
             'F4': {'husb': 'F4', 'wife': 'M4', 'children': ['I4']}
         }
-        errors = us09_birth_before_death_of_parents(individuals, families)
+        errors = messages(us09_birth_before_death_of_parents(individuals, families))
         self.assertEqual(errors, [])
 
     def test_missing_birth_date(self):
@@ -64,7 +65,7 @@ class TestUS09(unittest.TestCase):
         families = {
             'F5': {'husb': 'F5', 'wife': 'M5', 'children': ['I5']}
         }
-        errors = us09_birth_before_death_of_parents(individuals, families)
+        errors = messages(us09_birth_before_death_of_parents(individuals, families))
         self.assertEqual(errors, [])
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@ import unittest
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from us10 import us10_marriage_after_14
+from gedcom_errors import messages
 
 class TestUS10(unittest.TestCase):
 
@@ -16,7 +17,7 @@ class TestUS10(unittest.TestCase):
         families = {
             'F01': {'husb': 'I01', 'wife': 'I02', 'married': '2000-01-01'}
         }
-        errors = us10_marriage_after_14(individuals, families)
+        errors = messages(us10_marriage_after_14(individuals, families))
         self.assertEqual(errors, [])
 
     def test_husband_under_14(self):
@@ -27,7 +28,7 @@ class TestUS10(unittest.TestCase):
         families = {
             'F01': {'husb': 'I01', 'wife': 'I02', 'married': '2002-01-01'}
         }
-        errors = us10_marriage_after_14(individuals, families)
+        errors = messages(us10_marriage_after_14(individuals, families))
         self.assertTrue(any('I01' in e for e in errors))
 
     def test_wife_under_14(self):
@@ -38,7 +39,7 @@ class TestUS10(unittest.TestCase):
         families = {
             'F01': {'husb': 'I01', 'wife': 'I02', 'married': '2002-01-01'}
         }
-        errors = us10_marriage_after_14(individuals, families)
+        errors = messages(us10_marriage_after_14(individuals, families))
         self.assertTrue(any('I02' in e for e in errors))
 
     def test_both_under_14(self):
@@ -49,7 +50,7 @@ class TestUS10(unittest.TestCase):
         families = {
             'F01': {'husb': 'I01', 'wife': 'I02', 'married': '2007-01-01'}
         }
-        errors = us10_marriage_after_14(individuals, families)
+        errors = messages(us10_marriage_after_14(individuals, families))
         self.assertEqual(len(errors), 2)
 
     def test_missing_birth_or_marriage(self):
@@ -60,7 +61,7 @@ class TestUS10(unittest.TestCase):
         families = {
             'F01': {'husb': 'I01', 'wife': 'I02', 'married': None}
         }
-        errors = us10_marriage_after_14(individuals, families)
+        errors = messages(us10_marriage_after_14(individuals, families))
         self.assertEqual(errors, [])
 
 if __name__ == '__main__':
@@ -1,15 +1,47 @@
+import sys
+import os
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_errors import CheckError, messages
+
 def is_date_before_today(date_str):
     """
     Checks if the given GEDCOM date string is before today's date.
     GEDCOM format is expected to be 'DD MON YYYY', e.g., '15 MAY 1940'.
     """
-    try:
-        date = datetime.strptime(date_str, "%d %b %Y").date()
-        return date < datetime.today().date()
-    except ValueError:
+    date = parse_gedcom_date(date_str)
+    if date is None:
         return False
+    return date.date() < datetime.today().date()
+
+# GEDCOM event tag reported for each dated field of the shared model
+DATE_FIELD_TAGS = (("birth", "BIRT"), ("death", "DEAT"), ("married", "MARR"), ("divorced", "DIV"))
+
+US01_ERROR = "ERROR: US01: {values[0]} date '{values[1]}' for {ids[0]} is not before today's date (line {values[2]})"
+
+def us01_dates_before_today(individuals, families):
+    """
+    Checks all BIRT, DEAT, MARR, and DIV dates of the parsed model to ensure
+    they are before the current date, reported in file order.
+    Yields the errors one at a time.
+    """
+    dated = []
+    for records in (individuals, families):
+        for entity_id, record in records.items():
+            date_lines = record.get("date_lines", {})
+            for field, date_tag in DATE_FIELD_TAGS:
+                date_str = record.get(field)
+                if date_str is not None:
+                    dated.append((date_lines.get(field, 0), date_tag, entity_id, date_str))
+    dated.sort()
+
+    for line_no, date_tag, entity_id, date_str in dated:
+        if not is_date_before_today(date_str):
+            yield CheckError("US01", US01_ERROR, (entity_id,), values=(date_tag, date_str, line_no),
+                             line=line_no or None)
 
 def check_dates_before_today(file_path):
     """
@@ -17,37 +49,8 @@ def check_dates_before_today(file_path):
     to ensure they are before the current date.
     Returns a list of error strings.
     """
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    errors = []
-    current_entity = ""
-    date_tag = None
-
-    for i, line in enumerate(lines):
-        parts = line.strip().split(' ', 2)
-        if len(parts) < 2:
-            continue
-
-        level, tag = parts[0], parts[1]
-
-        # Track current individual/family ID
-        if tag == "INDI" or tag == "FAM":
-            current_entity = parts[2] if len(parts) > 2 else ""
-
-        if tag in {"BIRT", "DEAT", "MARR", "DIV"}:
-            date_tag = tag
-
-        elif tag == "DATE" and date_tag:
-            date_str = parts[2] if len(parts) > 2 else ""
-            if not is_date_before_today(date_str):
-                errors.append(
-                    f"ERROR: US01: {date_tag} date '{date_str}' for {current_entity} "
-                    f"is not before today's date (line {i+1})"
-                )
-            date_tag = None
-
-    return errors
+    individuals, families = read_gedcom(file_path)
+    return messages(us01_dates_before_today(individuals, families))
 
 def write_output(errors, output_path="us01_output.txt"):
     with open(output_path, "w") as f:
@@ -1,78 +1,38 @@
-from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_columns import date_columns, gather, in_row_order, where_after
+from gedcom_errors import CheckError, messages, source_line
+
+# One message template per spouse role
+US02_ERRORS = {
+    role: f"ERROR: US02: {role} {{ids[0]}} birth date {{dates[0]}} "
+          "is after marriage date {dates[1]} in family {ids[1]}"
+    for role in ("HUSB", "WIFE")
+}
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%d %b %Y")
-    except ValueError:
-        return None
+    return parse_gedcom_date(date_str)
 
-def check_birth_before_marriage(file_path):
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    individuals = {}
-    families = {}
-    errors = []
-
-    current_id = None
-    indi_section = False
-    fam_section = False
-    date_context = None
-
-    for i, line in enumerate(lines):
-        parts = line.strip().split(' ', 2)
-        if len(parts) < 2:
-            continue
-
-        level, tag = parts[0], parts[1]
-        argument = parts[2] if len(parts) > 2 else ""
-
-        if len(parts) == 3 and parts[2] == "INDI":
-            current_id = parts[1]
-            individuals[current_id] = {"BIRT": None, "FAMS": []}
-            indi_section, fam_section = True, False
+def us02_birth_before_marriage(individuals, families):
+    dense, dates = date_columns(individuals, families, parse_gedcom_date)
+    married = dates["married"]
+    spouses = [("HUSB", dense["husb"]), ("WIFE", dense["wife"])]
+    births = [gather(dates["birth"], numbers) for role, numbers in spouses]
 
-        elif len(parts) == 3 and parts[2] == "FAM":
-            current_id = parts[1]
-            families[current_id] = {"HUSB": None, "WIFE": None, "MARR": None}
-            fam_section, indi_section = True, False
+    # Compare birth dates to marriage dates for all families at once, then record the violations
+    for fam, rule in in_row_order(*(where_after(birth, married) for birth in births)):
+        role, numbers = spouses[rule]
+        indi_id = dense['person_ids'][numbers[fam]]
+        yield CheckError("US02", US02_ERRORS[role], (indi_id, dense['family_ids'][fam]),
+                         (births[rule][fam], married[fam]), line=source_line(individuals, indi_id, "birth"))
 
-        elif indi_section:
-            if tag == "BIRT":
-                date_context = "BIRT"
-            elif tag == "FAMS":
-                individuals[current_id]["FAMS"].append(argument)
-            elif tag == "DATE" and date_context == "BIRT":
-                individuals[current_id]["BIRT"] = parse_date(argument)
-                date_context = None
-
-        elif fam_section:
-            if tag == "HUSB" or tag == "WIFE":
-                families[current_id][tag] = argument
-            elif tag == "MARR":
-                date_context = "MARR"
-            elif tag == "DATE" and date_context == "MARR":
-                families[current_id]["MARR"] = parse_date(argument)
-                date_context = None
-
-    # Compare birth dates to marriage dates
-    for fam_id, fam_data in families.items():
-        marr_date = fam_data["MARR"]
-        if not marr_date:
-            continue
-
-        for role in ["HUSB", "WIFE"]:
-            indi_id = fam_data[role]
-            if not indi_id or indi_id not in individuals:
-                continue
-            birth_date = individuals[indi_id]["BIRT"]
-            if birth_date and birth_date > marr_date:
-                errors.append(
-                    f"ERROR: US02: {role} {indi_id} birth date {birth_date.strftime('%d %b %Y')} "
-                    f"is after marriage date {marr_date.strftime('%d %b %Y')} in family {fam_id}"
-                )
-
-    return errors
+def check_birth_before_marriage(file_path):
+    individuals, families = read_gedcom(file_path)
+    return messages(us02_birth_before_marriage(individuals, families))
 
 def write_output(errors, output_path="us02_output.txt"):
     with open(output_path, "w") as f:
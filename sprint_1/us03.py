@@ -1,85 +1,35 @@
 import sys
-from datetime import datetime
+import os
 
-def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, '%d %b %Y')
-    except ValueError:
-        return None
-
-def process_gedcom(filename):
-    individuals = {}
-    current_indi = None
-    birth_date = None
-    death_date = None
-    birth_flag = False
-    death_flag = False
-    error_found = False
-
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if not line:
-                continue
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_columns import date_columns, where_after
+from gedcom_errors import CheckError, source_line
 
-            parts = line.split(' ', 2)
-            level = parts[0]
-            tag = parts[1] if len(parts) > 1 else ''
-            args = parts[2] if len(parts) > 2 else ''
+US03_ERROR = "Error: {ids[0]} {values[0]} - Born: {dates[0]}, Died: {dates[1]}"
 
-            if level == '0' and args == 'INDI':
-                # Check previous individual for birth > death
-                if current_indi and birth_date and death_date and birth_date > death_date:
-                    name = individuals[current_indi]['name']
-                    print(f"Error: {current_indi} {name} - "
-                          f"Born: {birth_date.strftime('%d %b %Y')}, "
-                          f"Died: {death_date.strftime('%d %b %Y')}")
-                    error_found = True
-
-                current_indi = tag
-                birth_date = None
-                death_date = None
-                birth_flag = False
-                death_flag = False
-                individuals[current_indi] = {'name': 'Unknown'}
+def parse_date(date_str):
+    return parse_gedcom_date(date_str)
 
-            elif level == '1' and current_indi:
-                if tag == 'NAME':
-                    individuals[current_indi]['name'] = args
-                elif tag == 'BIRT':
-                    birth_flag = True
-                    death_flag = False
-                elif tag == 'DEAT':
-                    death_flag = True
-                    birth_flag = False
+def us03_birth_before_death(individuals, families):
+    dense, dates = date_columns(individuals, families, parse_gedcom_date)
+    birth, death = dates["birth"], dates["death"]
 
-            elif level == '2' and tag == 'DATE' and current_indi:
-                date = parse_date(args)
-                if date:
-                    if birth_flag:
-                        birth_date = date
-                        individuals[current_indi]['birth'] = date
-                        birth_flag = False
-                    elif death_flag:
-                        death_date = date
-                        individuals[current_indi]['death'] = date
-                        death_flag = False
+    for row in where_after(birth, death):
+        indi_id = dense["person_ids"][row]
+        name = individuals[indi_id].get('name') or 'Unknown'
+        yield CheckError("US03", US03_ERROR, (indi_id,), (birth[row], death[row]), (name,),
+                         source_line(individuals, indi_id, "death"))
 
-                        if birth_date and birth_date > death_date:
-                            name = individuals[current_indi]['name']
-                            print(f"Error: {current_indi} {name} - "
-                                  f"Born: {birth_date.strftime('%d %b %Y')}, "
-                                  f"Died: {death_date.strftime('%d %b %Y')}")
-                            error_found = True
+def process_gedcom(filename):
+    individuals, families = read_gedcom(filename)
+    errors = list(us03_birth_before_death(individuals, families))
 
-    if current_indi and birth_date and death_date and birth_date > death_date:
-        name = individuals[current_indi]['name']
-        print(f"Error: {current_indi} {name} - "
-              f"Born: {birth_date.strftime('%d %b %Y')}, "
-              f"Died: {death_date.strftime('%d %b %Y')}")
-        error_found = True
+    for error in errors:
+        print(error)
 
-    if not error_found:
+    if not errors:
         with open("us03_output.txt", "w") as out_file:
             out_file.write("PASSED: US03: All Births before Death.\n")
 
@@ -1,79 +1,36 @@
 import sys
-from datetime import datetime
+import os
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_errors import CheckError, source_line
 
-def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, '%d %b %Y')
-    except ValueError:
-        return None
-
-
-def process_gedcom(filename):
-    current_fam = None
-    marr_date = None
-    div_date = None
-    fams = {}
-    error_found = False  # Track if any errors are found
+US04_ERROR = "Error: {ids[0]} - Divorce on {dates[0]} before marriage on {dates[1]}"
 
-    marr_flag = False
-    div_flag = False
 
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = line.split(' ', 2)
-            level = parts[0]
-            tag = parts[1] if len(parts) > 1 else ''
-            args = parts[2] if len(parts) > 2 else ''
+def parse_date(date_str):
+    return parse_gedcom_date(date_str)
 
-            if level == '0' and args == 'FAM':
-                # Check previous family for divorce before marriage
-                if current_fam and marr_date and div_date and marr_date > div_date:
-                    print(f"Error: {current_fam} - Divorce on {div_date.strftime('%d %b %Y')} "
-                          f"before marriage on {marr_date.strftime('%d %b %Y')}")
-                    error_found = True
 
-                current_fam = tag
-                marr_date = None
-                div_date = None
-                fams[current_fam] = {}
-                marr_flag = False
-                div_flag = False
+def us04_marriage_before_divorce(individuals, families):
+    for fam_id, fam in families.items():
+        marr_date = parse_date(fam.get('married') or '')
+        div_date = parse_date(fam.get('divorced') or '')
+        if marr_date and div_date and marr_date > div_date:
+            yield CheckError("US04", US04_ERROR, (fam_id,), (div_date.toordinal(), marr_date.toordinal()),
+                             line=source_line(families, fam_id, "divorced"))
 
-            elif level == '1' and current_fam:
-                if tag == 'MARR':
-                    marr_flag = True
-                elif tag == 'DIV':
-                    div_flag = True
 
-            elif level == '2' and current_fam and tag == 'DATE':
-                date = parse_date(args)
-                if date:
-                    if marr_flag:
-                        marr_date = date
-                        fams[current_fam]['married'] = date
-                        marr_flag = False
-                    elif div_flag:
-                        div_date = date
-                        fams[current_fam]['divorced'] = date
-                        div_flag = False
-                        if marr_date and div_date and marr_date > div_date:
-                            print(f"Error: {current_fam} - Divorce on {div_date.strftime('%d %b %Y')} "
-                                  f"before marriage on {marr_date.strftime('%d %b %Y')}")
-                            error_found = True
+def process_gedcom(filename):
+    individuals, families = read_gedcom(filename)
+    errors = list(us04_marriage_before_divorce(individuals, families))
 
-        # Final check for last family
-        if current_fam and marr_date and div_date and marr_date > div_date:
-            print(f"Error: {current_fam} - Divorce on {div_date.strftime('%d %b %Y')} "
-                  f"before marriage on {marr_date.strftime('%d %b %Y')}")
-            error_found = True
+    for error in errors:
+        print(error)
 
     # Write pass message if no errors found
-    if not error_found:
+    if not errors:
         with open("us04_output.txt", "w") as out_file:
             out_file.write("PASSED: US04: All Marriages before Divorce.\n")
 
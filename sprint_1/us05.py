@@ -1,99 +1,69 @@
-from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import format_gedcom_date, parse_gedcom_date
+from gedcom_columns import date_columns, gather, in_row_order, where_after
+from gedcom_errors import CheckError, messages, source_line
+
+# One message template per spouse role
+US05_ERRORS = {
+    role: f"ERROR: US05: Marriage date {{dates[0]}} is after {role}'s ({{ids[1]}}) "
+          "death on {dates[1]} in family {ids[0]}"
+    for role in ("husband", "wife")
+}
+
+def parse_date(date_str):
+    return parse_gedcom_date(date_str)
+
+def from_model(individuals, families):
+    """Converts the shared parsed model into the records used by this check."""
+    records = {}
+    for indi_id, indi in individuals.items():
+        records[indi_id] = {
+            "id": indi_id,
+            "name": indi.get("name") or "",
+            "death": parse_date(indi.get("death"))
+        }
+
+    fams = {}
+    for fam_id, fam in families.items():
+        fams[fam_id] = {
+            "id": fam_id,
+            "husband": fam.get("husb"),
+            "wife": fam.get("wife"),
+            "married": parse_date(fam.get("married"))
+        }
+
+    return records, fams
+
+def to_model(individuals, families):
+    """Converts records shaped like from_model's back into the shared model layout."""
+    records = {indi_id: {"death": format_gedcom_date(indi.get("death"))} for indi_id, indi in individuals.items()}
+    fams = {
+        fam_id: {"husb": fam.get("husband"), "wife": fam.get("wife"), "married": format_gedcom_date(fam.get("married"))}
+        for fam_id, fam in families.items()
+    }
+    return records, fams
 
 def parse_gedcom(file_path):
-    individuals = {}
-    families = {}
-    current_individual = None
-    current_family = None
-    date_context = None
-
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    for i, line in enumerate(lines):
-        parts = line.strip().split(" ", 2)
-        if len(parts) < 2:
-            continue
-
-        level = parts[0]
-        tag = parts[1]
-        argument = parts[2] if len(parts) == 3 else ""
-
-        if level == "0":
-            date_context = None
-            if "INDI" in argument:
-                current_individual = tag
-                individuals[current_individual] = {
-                    "id": current_individual,
-                    "name": "",
-                    "death": None
-                }
-                current_family = None
-            elif "FAM" in argument:
-                current_family = tag
-                families[current_family] = {
-                    "id": current_family,
-                    "husband": None,
-                    "wife": None,
-                    "married": None
-                }
-                current_individual = None
-
-        elif level == "1":
-            if tag == "NAME" and current_individual:
-                individuals[current_individual]["name"] = argument
-            elif tag == "DEAT" and current_individual:
-                date_context = "DEAT"
-            elif tag == "HUSB" and current_family:
-                families[current_family]["husband"] = argument
-            elif tag == "WIFE" and current_family:
-                families[current_family]["wife"] = argument
-            elif tag == "MARR" and current_family:
-                date_context = "MARR"
-            else:
-                date_context = None
-
-        elif level == "2" and tag == "DATE":
-            try:
-                date_obj = datetime.strptime(argument, "%d %b %Y")
-                if date_context == "DEAT" and current_individual:
-                    individuals[current_individual]["death"] = date_obj
-                elif date_context == "MARR" and current_family:
-                    families[current_family]["married"] = date_obj
-                date_context = None
-            except ValueError:
-                continue
-
-    return individuals, families
+    return from_model(*read_gedcom(file_path))
 
 def check_marriage_before_death(individuals, families):
-    errors = []
-
-    for fam_id, family in families.items():
-        marriage_date = family.get("married")
-        husband_id = family.get("husband")
-        wife_id = family.get("wife")
-
-        if not marriage_date:
-            continue
-
-        if husband_id and husband_id in individuals:
-            husband_death = individuals[husband_id].get("death")
-            if husband_death and marriage_date > husband_death:
-                errors.append(
-                    f"ERROR: US05: Marriage date {marriage_date.strftime('%d %b %Y')} "
-                    f"is after husband's ({husband_id}) death on {husband_death.strftime('%d %b %Y')} in family {fam_id}"
-                )
+    return messages(us05_marriage_before_death(*to_model(individuals, families)))
 
-        if wife_id and wife_id in individuals:
-            wife_death = individuals[wife_id].get("death")
-            if wife_death and marriage_date > wife_death:
-                errors.append(
-                    f"ERROR: US05: Marriage date {marriage_date.strftime('%d %b %Y')} "
-                    f"is after wife's ({wife_id}) death on {wife_death.strftime('%d %b %Y')} in family {fam_id}"
-                )
+def us05_marriage_before_death(individuals, families):
+    dense, dates = date_columns(individuals, families, parse_gedcom_date)
+    event = dates["married"]
+    spouses = [("husband", dense["husb"]), ("wife", dense["wife"])]
+    deaths = [gather(dates["death"], numbers) for role, numbers in spouses]
 
-    return errors
+    for fam, rule in in_row_order(*(where_after(event, death) for death in deaths)):
+        role, numbers = spouses[rule]
+        fam_id = dense['family_ids'][fam]
+        yield CheckError("US05", US05_ERRORS[role], (fam_id, dense['person_ids'][numbers[fam]]),
+                         (event[fam], deaths[rule][fam]), line=source_line(families, fam_id, "married"))
 
 def write_output(errors, output_path="us05_output.txt"):
     with open(output_path, "w") as f:
@@ -107,8 +77,7 @@ if __name__ == "__main__":
     gedcom_file = "../M1B6.ged"
     print(f"Checking marriage before death in {gedcom_file}...\n")
 
-    individuals, families = parse_gedcom(gedcom_file)
-    errors = check_marriage_before_death(individuals, families)
+    errors = messages(us05_marriage_before_death(*read_gedcom(gedcom_file)))
     write_output(errors)
 
     print("Validation complete. Results saved to 'us05_output.txt'.")
@@ -1,97 +1,70 @@
-from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import format_gedcom_date, parse_gedcom_date
+from gedcom_columns import date_columns, gather, in_row_order, where_after
+from gedcom_errors import CheckError, messages, source_line
+
+# One message template per spouse role
+US06_ERRORS = {
+    role: f"ERROR: US06: Divorce date {{dates[0]}} is after {role}'s ({{ids[1]}}) "
+          "death on {dates[1]} in family {ids[0]}"
+    for role in ("husband", "wife")
+}
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%d %b %Y")
-    except ValueError:
-        return None
+    return parse_gedcom_date(date_str)
+
+def from_model(individuals, families):
+    """Converts the shared parsed model into the records used by this check."""
+    records = {}
+    for indi_id, indi in individuals.items():
+        records[indi_id] = {
+            "name": indi.get("name"),
+            "sex": indi.get("sex"),
+            "birth": parse_date(indi.get("birth")),
+            "death": parse_date(indi.get("death"))
+        }
+
+    fams = {}
+    for fam_id, fam in families.items():
+        fams[fam_id] = {
+            "husband": fam.get("husb"),
+            "wife": fam.get("wife"),
+            "married": parse_date(fam.get("married")),
+            "divorced": parse_date(fam.get("divorced"))
+        }
+
+    return records, fams
+
+def to_model(individuals, families):
+    """Converts records shaped like from_model's back into the shared model layout."""
+    records = {indi_id: {"death": format_gedcom_date(indi.get("death"))} for indi_id, indi in individuals.items()}
+    fams = {
+        fam_id: {"husb": fam.get("husband"), "wife": fam.get("wife"), "divorced": format_gedcom_date(fam.get("divorced"))}
+        for fam_id, fam in families.items()
+    }
+    return records, fams
 
 def parse_gedcom_file(file_path):
-    individuals = {}
-    families = {}
-    current_indi = None
-    current_fam = None
-
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-
-    for i in range(len(lines)):
-        parts = lines[i].strip().split(" ", 2)
-        level = parts[0]
-
-        if level == "0":
-            if len(parts) == 3 and parts[2] == "INDI":
-                current_indi = parts[1].strip()
-                individuals[current_indi] = {}
-                current_fam = None
-            elif len(parts) == 3 and parts[2] == "FAM":
-                current_fam = parts[1].strip()
-                families[current_fam] = {}
-                current_indi = None
-            else:
-                current_indi = None
-                current_fam = None
-        elif level == "1":
-            tag = parts[1]
-            argument = parts[2] if len(parts) > 2 else ""
-
-            if current_indi:
-                if tag == "NAME":
-                    individuals[current_indi]["name"] = argument
-                elif tag == "SEX":
-                    individuals[current_indi]["sex"] = argument
-                elif tag == "BIRT":
-                    if i + 1 < len(lines) and lines[i+1].strip().startswith("2 DATE"):
-                        birth_date = lines[i+1].strip().split("DATE")[1].strip()
-                        individuals[current_indi]["birth"] = parse_date(birth_date)
-                elif tag == "DEAT":
-                    if i + 1 < len(lines) and lines[i+1].strip().startswith("2 DATE"):
-                        death_date = lines[i+1].strip().split("DATE")[1].strip()
-                        individuals[current_indi]["death"] = parse_date(death_date)
-            elif current_fam:
-                if tag == "HUSB":
-                    families[current_fam]["husband"] = argument
-                elif tag == "WIFE":
-                    families[current_fam]["wife"] = argument
-                elif tag == "MARR":
-                    if i + 1 < len(lines) and lines[i+1].strip().startswith("2 DATE"):
-                        marriage_date = lines[i+1].strip().split("DATE")[1].strip()
-                        families[current_fam]["married"] = parse_date(marriage_date)
-                elif tag == "DIV":
-                    if i + 1 < len(lines) and lines[i+1].strip().startswith("2 DATE"):
-                        divorce_date = lines[i+1].strip().split("DATE")[1].strip()
-                        families[current_fam]["divorced"] = parse_date(divorce_date)
-
-    return individuals, families
+    return from_model(*read_gedcom(file_path))
 
 def check_divorce_before_death(individuals, families):
-    errors = []
-
-    for fam_id, family in families.items():
-        divorce_date = family.get("divorced")
-        husband_id = family.get("husband")
-        wife_id = family.get("wife")
-
-        if not divorce_date:
-            continue  # No divorce to check
-
-        if husband_id and husband_id in individuals:
-            husband_death = individuals[husband_id].get("death")
-            if husband_death and divorce_date > husband_death:
-                errors.append(
-                    f"ERROR: US06: Divorce date {divorce_date.strftime('%d %b %Y')} "
-                    f"is after husband's ({husband_id}) death on {husband_death.strftime('%d %b %Y')} in family {fam_id}"
-                )
+    return messages(us06_divorce_before_death(*to_model(individuals, families)))
 
-        if wife_id and wife_id in individuals:
-            wife_death = individuals[wife_id].get("death")
-            if wife_death and divorce_date > wife_death:
-                errors.append(
-                    f"ERROR: US06: Divorce date {divorce_date.strftime('%d %b %Y')} "
-                    f"is after wife's ({wife_id}) death on {wife_death.strftime('%d %b %Y')} in family {fam_id}"
-                )
+def us06_divorce_before_death(individuals, families):
+    dense, dates = date_columns(individuals, families, parse_gedcom_date)
+    event = dates["divorced"]
+    spouses = [("husband", dense["husb"]), ("wife", dense["wife"])]
+    deaths = [gather(dates["death"], numbers) for role, numbers in spouses]
 
-    return errors
+    for fam, rule in in_row_order(*(where_after(event, death) for death in deaths)):
+        role, numbers = spouses[rule]
+        fam_id = dense['family_ids'][fam]
+        yield CheckError("US06", US06_ERRORS[role], (fam_id, dense['person_ids'][numbers[fam]]),
+                         (event[fam], deaths[rule][fam]), line=source_line(families, fam_id, "divorced"))
 
 def write_output(errors, output_path="us06_output.txt"):
     with open(output_path, "w") as f:
@@ -105,8 +78,7 @@ if __name__ == "__main__":
     gedcom_path = "../M1B6.ged"  # Adjust path if needed
     print(f"All marriages occur before death")
 
-    individuals, families = parse_gedcom_file(gedcom_path)
-    errors = check_divorce_before_death(individuals, families)
+    errors = messages(us06_divorce_before_death(*read_gedcom(gedcom_path)))
     write_output(errors)
 
     print("Validation complete. Results saved to 'us06_output.txt'.")
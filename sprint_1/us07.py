@@ -1,57 +1,53 @@
 #lifespan validation
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import format_gedcom_date, parse_gedcom_date
+from gedcom_ages import age_column, where_older
+from gedcom_columns import NO_DATE, date_columns
+from gedcom_errors import CheckError, messages, source_line
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str.strip(), "%d %b %Y")
-    except:
-        return None
+    return parse_gedcom_date(date_str.strip()) if date_str else None
 
-def parse_individuals(filename):
-    individuals = {}
-    current_id = None
-    current_tag = None
+# Indexed by whether the individual has died
+US07_ERRORS = [
+    "ERROR US07: INDIVIDUAL {plain[0]} is alive and older than 150 years: {values[0]}",
+    "ERROR US07: INDIVIDUAL {plain[0]} lived more than 150 years: {values[0]}"
+]
 
-    with open(filename, "r") as file:
-        for line in file:
-            parts = line.strip().split(" ", 2)
-            if not parts:
-                continue
-            level = parts[0]
-            if level == "0" and len(parts) == 3 and parts[2] == "INDI":
-                current_id = parts[1].strip("@")
-                individuals[current_id] = {"birth": None, "death": None}
-            elif level == "1":
-                tag = parts[1]
-                if tag in ["BIRT", "DEAT"]:
-                    current_tag = tag
-                else:
-                    current_tag = None
-            elif level == "2" and parts[1] == "DATE" and current_tag:
-                date = parse_date(parts[2])
-                if date:
-                    individuals[current_id][current_tag.lower()] = date
-    return individuals
+def from_model(individuals):
+    """Converts the shared parsed model into the records used by this check."""
+    records = {}
+    for indi_id, indi in individuals.items():
+        records[indi_id.strip("@")] = {
+            "birth": parse_date(indi.get("birth") or ""),
+            "death": parse_date(indi.get("death") or "")
+        }
+    return records
+
+def parse_individuals(filename):
+    individuals, families = read_gedcom(filename)
+    return from_model(individuals)
 
 def check_lifespan(individuals):
-    today = datetime.today()
-    errors = []
+    records = {
+        indi_id: {"birth": format_gedcom_date(data["birth"]), "death": format_gedcom_date(data["death"])}
+        for indi_id, data in individuals.items()
+    }
+    return messages(us07_less_than_150_years_old(records, {}))
 
-    for indi_id, data in individuals.items():
-        birth = data["birth"]
-        death = data["death"]
-        if not birth:
-            continue
-        if death:
-            age = relativedelta(death, birth).years
-            if age > 150:
-                errors.append(f"ERROR US07: INDIVIDUAL {indi_id} lived more than 150 years: {age}")
-        else:
-            age = relativedelta(today, birth).years
-            if age > 150:
-                errors.append(f"ERROR US07: INDIVIDUAL {indi_id} is alive and older than 150 years: {age}")
-    return errors
+def us07_less_than_150_years_old(individuals, families):
+    # Ages of everyone at death or on the reference date, computed in one pass over the date columns
+    dense, ages = age_column(individuals, families)
+    death = date_columns(individuals, families, parse_gedcom_date)[1]["death"]
+    for n in where_older(ages, 150):
+        indi_id = dense["person_ids"][n]
+        dead = bool(death[n] != NO_DATE)
+        yield CheckError("US07", US07_ERRORS[dead], (indi_id,), values=(int(ages[n]),),
+                         line=source_line(individuals, indi_id, "death" if dead else "birth"))
 
 def write_output(errors, output_file):
     with open(output_file, "w") as f:
@@ -65,8 +61,7 @@ if __name__ == "__main__":
     output_file = "us07_output.txt"
     print(f"Checking lifespan rules in {gedcom_file}...\n")
 
-    individuals = parse_individuals(gedcom_file)
-    errors = check_lifespan(individuals)
+    errors = messages(us07_less_than_150_years_old(*read_gedcom(gedcom_file)))
     write_output(errors, output_file)
 
     print("Validation complete. Results saved to 'us07_output.txt'.")
@@ -1,82 +1,76 @@
 #birth before marriage
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import add_months, format_gedcom_date, parse_gedcom_date
+from gedcom_columns import (child_edges, date_columns, gather, in_row_order, shifted_column, take,
+                            where_after)
+from gedcom_errors import CheckError, messages, source_line
+
+# Indexed by the rule that matched: born before the marriage, or too long after the divorce
+US08_ERRORS = [
+    "ERROR US08: FAMILY {plain[1]} - Child {plain[0]} born before marriage date {dates[0]}",
+    "ERROR US08: FAMILY {plain[1]} - Child {plain[0]} born more than 9 months after divorce on {dates[0]}"
+]
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str.strip(), "%d %b %Y")
-    except:
-        return None
+    return parse_gedcom_date(date_str.strip()) if date_str else None
 
-def parse_gedcom(gedcom_file):
-    individuals = {}
-    families = {}
-    current_id = None
-    in_individual = False
-    in_family = False
-    current_tag = None
+def from_model(individuals, families):
+    """Converts the shared parsed model into the records used by this check."""
+    records = {}
+    for indi_id, indi in individuals.items():
+        famc = indi.get("famc") or []
+        records[indi_id.strip("@")] = {
+            "birth": parse_date(indi.get("birth") or ""),
+            "famc": famc[-1].strip("@") if famc else None
+        }
 
-    with open(gedcom_file, "r") as file:
-        for line in file:
-            parts = line.strip().split(" ", 2)
-            if not parts:
-                continue
-            level = parts[0]
+    fams = {}
+    for fam_id, fam in families.items():
+        fams[fam_id.strip("@")] = {
+            "marriage": parse_date(fam.get("married") or ""),
+            "divorce": parse_date(fam.get("divorced") or ""),
+            "children": [child.strip("@") for child in fam.get("children", [])]
+        }
 
-            if level == "0":
-                current_tag = None
-                if len(parts) == 3:
-                    if parts[2] == "INDI":
-                        current_id = parts[1].strip("@")
-                        individuals[current_id] = {"birth": None, "famc": None}
-                        in_individual = True
-                        in_family = False
-                    elif parts[2] == "FAM":
-                        current_id = parts[1].strip("@")
-                        families[current_id] = {"marriage": None, "divorce": None, "children": []}
-                        in_family = True
-                        in_individual = False
-            elif level == "1":
-                tag = parts[1]
-                current_tag = tag
-                if in_individual:
-                    if tag == "BIRT":
-                        current_tag = "BIRT"
-                    elif tag == "FAMC":
-                        individuals[current_id]["famc"] = parts[2].strip("@")
-                        current_tag = None
-                elif in_family:
-                    if tag in ["MARR", "DIV"]:
-                        current_tag = tag
-                    elif tag == "CHIL":
-                        families[current_id]["children"].append(parts[2].strip("@"))
-                        current_tag = None
-            elif level == "2" and parts[1] == "DATE":
-                date = parse_date(parts[2])
-                if in_individual and current_tag == "BIRT":
-                    individuals[current_id]["birth"] = date
-                elif in_family:
-                    if current_tag == "MARR":
-                        families[current_id]["marriage"] = date
-                    elif current_tag == "DIV":
-                        families[current_id]["divorce"] = date
+    return records, fams
 
-    return individuals, families
+def parse_gedcom(gedcom_file):
+    return from_model(*read_gedcom(gedcom_file))
 
 def check_birth_before_marriage(individuals, families):
-    errors = []
-    for fam_id, fam in families.items():
-        marriage = fam["marriage"]
-        divorce = fam["divorce"]
-        for child_id in fam["children"]:
-            birth = individuals.get(child_id, {}).get("birth")
-            if not birth:
-                continue
-            if marriage and birth < marriage:
-                errors.append(f"ERROR US08: FAMILY {fam_id} - Child {child_id} born before marriage date {marriage.strftime('%d %b %Y')}")
-            if divorce and birth > divorce + relativedelta(months=+9):
-                errors.append(f"ERROR US08: FAMILY {fam_id} - Child {child_id} born more than 9 months after divorce on {divorce.strftime('%d %b %Y')}")
-    return errors
+    records = {indi_id: {"birth": format_gedcom_date(indi.get("birth"))} for indi_id, indi in individuals.items()}
+    fams = {
+        fam_id: {
+            "married": format_gedcom_date(fam.get("marriage")),
+            "divorced": format_gedcom_date(fam.get("divorce")),
+            "children": fam.get("children", [])
+        }
+        for fam_id, fam in families.items()
+    }
+    return messages(us08_birth_before_marriage_of_parents(records, fams))
+
+def us08_birth_before_marriage_of_parents(individuals, families):
+    dense, dates = date_columns(individuals, families, parse_date)
+    # Nine calendar months after each divorce, computed once per family
+    divorce = dates["divorced"]
+    divorce_limit = shifted_column(divorce, lambda divorced: add_months(divorced, 9))
+
+    # One row per child of every family
+    edge_families, edge_children = child_edges(dense)
+    birth = gather(dates["birth"], edge_children)
+    marriage = take(dates["married"], edge_families)
+    limit = take(divorce_limit, edge_families)
+
+    for edge, rule in in_row_order(where_after(marriage, birth), where_after(birth, limit)):
+        fam = edge_families[edge]
+        child_id = dense["person_ids"][edge_children[edge]]
+        event = marriage[edge] if rule == 0 else divorce[fam]
+        yield CheckError("US08", US08_ERRORS[rule], (child_id, dense["family_ids"][fam]), (event,),
+                         line=source_line(individuals, child_id, "birth"))
 
 def write_output(errors, output_file):
     with open(output_file, "w") as f:
@@ -90,8 +84,7 @@ if __name__ == "__main__":
     output_file = "us08_output.txt"
     print(f"Checking parental marriage constraints in {gedcom_file}...\n")
 
-    individuals, families = parse_gedcom(gedcom_file)
-    errors = check_birth_before_marriage(individuals, families)
+    errors = messages(us08_birth_before_marriage_of_parents(*read_gedcom(gedcom_file)))
     write_output(errors, output_file)
 
     print("Validation complete. Results saved to 'us08_output.txt'.")
@@ -1,21 +1,26 @@
 
 import sys
 import os
-from datetime import datetime
 
 # Dynamically add parent folder to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from gedcom_parser import process_gedcom_file
+from gedcom_dates import parse_any_date
+from gedcom_columns import child_edges, date_columns, gather, in_row_order, take, where_after
+from gedcom_errors import CheckError, messages, source_line
+
+# Indexed by the rule that matched: born after the mother's death, or too long after the father's
+US09_ERRORS = [
+    "ERROR US09: Child {ids[0]} born after mother's death in family {ids[1]}.",
+    "ERROR US09: Child {ids[0]} born more than 9 months after father's death in family {ids[1]}."
+]
 
 def parse_date(date_str):
-    """Parses a date string in YYYY-MM-DD format to a datetime object."""
+    """Parses a date string in YYYY-MM-DD or GEDCOM DD MON YYYY format to a datetime object."""
     if not date_str:
         return None
-    try:
-        return datetime.strptime(date_str.strip(), "%Y-%m-%d")
-    except (ValueError, TypeError):
-        return None
+    return parse_any_date(date_str.strip())
 
 def us09_birth_before_death_of_parents(individuals, families):
     """
@@ -26,26 +31,25 @@ def us09_birth_before_death_of_parents(individuals, families):
         individuals (dict): A dictionary of individuals.
         families (dict): A dictionary of families.
 
-    Returns:
-        list: List of error messages if validation fails.
+    Yields:
+        CheckError: every violation, as it is found.
     """
-    errors = []
-    for fam_id, family in families.items():
-        children = family.get("children", [])
-        father_id = family.get("husb")
-        mother_id = family.get("wife")
-        father_death = parse_date(individuals.get(father_id, {}).get("death"))
-        mother_death = parse_date(individuals.get(mother_id, {}).get("death"))
-
-        for child_id in children:
-            child_birth = parse_date(individuals.get(child_id, {}).get("birth"))
-            if not child_birth:
-                continue
-            if mother_death and child_birth > mother_death:
-                errors.append(f"ERROR US09: Child {child_id} born after mother's death in family {fam_id}.")
-            if father_death and (child_birth - father_death).days > 273:
-                errors.append(f"ERROR US09: Child {child_id} born more than 9 months after father's death in family {fam_id}.")
-    return errors
+    dense, dates = date_columns(individuals, families, parse_date)
+
+    # One row per child of every family, with the parents' deaths alongside
+    edge_families, edge_children = child_edges(dense)
+    child_birth = gather(dates["birth"], edge_children)
+    mother_death = gather(dates["death"], take(dense["wife"], edge_families))
+    father_death = gather(dates["death"], take(dense["husb"], edge_families))
+
+    born_after_mother = where_after(child_birth, mother_death)
+    born_after_father = where_after(child_birth, father_death, 273)
+
+    for edge, rule in in_row_order(born_after_mother, born_after_father):
+        child_id = dense["person_ids"][edge_children[edge]]
+        parent_death = mother_death[edge] if rule == 0 else father_death[edge]
+        yield CheckError("US09", US09_ERRORS[rule], (child_id, dense["family_ids"][edge_families[edge]]),
+                         (child_birth[edge], parent_death), line=source_line(individuals, child_id, "birth"))
 
 def write_output(errors, output_file):
     """Writes validation results to a text file."""
@@ -63,7 +67,7 @@ if __name__ == "__main__":
     print(f"Checking parent-death rules in {gedcom_file}...")
 
     individuals, families = process_gedcom_file(gedcom_file)
-    errors = us09_birth_before_death_of_parents(individuals, families)
+    errors = messages(us09_birth_before_death_of_parents(individuals, families))
     write_output(errors, output_file)
 
     print("Validation complete. Results saved to 'us09_output.txt'.")
@@ -1,22 +1,23 @@
 
 import sys
 import os
-from datetime import datetime
 
 # Dynamically add parent folder to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from gedcom_parser import process_gedcom_file
+from gedcom_dates import parse_any_date
+from gedcom_columns import date_columns, gather, in_row_order, where_within
+from gedcom_errors import CheckError, messages, source_line
+
+US10_ERROR = "ERROR US10: {values[0]} {ids[0]} was married at {values[1]:.1f} years in family {ids[1]}."
 
 
 def parse_date(date_str):
-    """Parses a date string in YYYY-MM-DD format to a datetime object."""
+    """Parses a date string in YYYY-MM-DD or GEDCOM DD MON YYYY format to a datetime object."""
     if not date_str:
         return None
-    try:
-        return datetime.strptime(date_str.strip(), "%Y-%m-%d")
-    except (ValueError, TypeError):
-        return None
+    return parse_any_date(date_str.strip())
 
 def us10_marriage_after_14(individuals, families):
     """
@@ -26,23 +27,24 @@ def us10_marriage_after_14(individuals, families):
         individuals (dict): A dictionary of individuals.
         families (dict): A dictionary of families.
 
-    Returns:
-        list: List of error messages if validation fails.
+    Yields:
+        CheckError: every violation, as it is found.
     """
-    errors = []
-    for fam_id, family in families.items():
-        marriage_date = parse_date(family.get("married"))
-        if not marriage_date:
-            continue
+    dense, dates = date_columns(individuals, families, parse_date)
+    married = dates["married"]
+    spouses = [("husb", dense["husb"]), ("wife", dense["wife"])]
+    births = [gather(dates["birth"], numbers) for role, numbers in spouses]
+
+    # Married less than 14 years (of 365.25 days) after being born
+    too_young = [where_within(married, birth, 14 * 365.25) for birth in births]
 
-        for role in ['husb', 'wife']:
-            person_id = family.get(role)
-            birth_date = parse_date(individuals.get(person_id, {}).get("birth"))
-            if birth_date:
-                age_at_marriage = (marriage_date - birth_date).days / 365.25
-                if age_at_marriage < 14:
-                    errors.append(f"ERROR US10: {role.title()} {person_id} was married at {age_at_marriage:.1f} years in family {fam_id}.")
-    return errors
+    for fam, rule in in_row_order(*too_young):
+        role, numbers = spouses[rule]
+        person_id = dense["person_ids"][numbers[fam]]
+        age_at_marriage = (married[fam] - births[rule][fam]) / 365.25
+        yield CheckError("US10", US10_ERROR, (person_id, dense["family_ids"][fam]),
+                         (births[rule][fam], married[fam]), (role.title(), float(age_at_marriage)),
+                         source_line(individuals, person_id, "birth"))
 
 def write_output(errors, output_file):
     """Writes validation results to a text file."""
@@ -59,7 +61,7 @@ if __name__ == "__main__":
     print(f"Checking marriage-age rules in {gedcom_file}...")
 
     individuals, families = process_gedcom_file(gedcom_file)
-    errors = us10_marriage_after_14(individuals, families)
+    errors = messages(us10_marriage_after_14(individuals, families))
     write_output(errors, output_file)
 
     print("Validation complete. Results saved to 'us10_output.txt'.")
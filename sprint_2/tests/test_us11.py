@@ -4,7 +4,7 @@ import os
 import sys
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from us11 import check_no_bigamy
+from us11 import check_no_bigamy, overlapping_marriages
 
 class TestUS11NoBigamy(unittest.TestCase):
 
@@ -175,5 +175,9 @@ class TestUS11NoBigamy(unittest.TestCase):
         os.unlink(path)
         self.assertEqual(result, [])
 
+    def test_overlapping_marriages_reports_every_pair(self):
+        marriages = [(1970, 2000, "@F1@"), (1975, 1980, "@F2@"), (1979, 1985, "@F3@"), (1990, 1995, "@F4@")]
+        self.assertEqual(overlapping_marriages(marriages), [(0, 1), (0, 2), (0, 3), (1, 2)])
+
 if __name__ == '__main__':
     unittest.main()
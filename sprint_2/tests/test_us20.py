@@ -1,3 +1,11 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import us20
+from gedcom_errors import messages
+
 def us20_no_aunt_uncle_marriages(individuals, families):
     errors = []
 
@@ -39,3 +47,36 @@ def us20_no_aunt_uncle_marriages(individuals, families):
             errors.append(f"ERROR US20: Aunt {wife} married nephew {husb} in family {fam_id}.")
 
     return errors
+
+
+def family(husb, wife, children=()):
+    return {"husb": husb, "wife": wife, "children": list(children)}
+
+
+def test_uncle_marrying_niece():
+    families = {
+        "@F1@": family("@I1@", "@I2@", ["@I3@", "@I4@"]),
+        "@F2@": family("@I5@", "@I4@", ["@I6@"]),
+        "@F3@": family("@I3@", "@I6@")
+    }
+    errors = messages(us20.us20_no_aunt_uncle_marriages({}, families))
+    assert errors == ["ERROR US20: Uncle @I3@ married niece @I6@ in family @F3@."]
+
+
+def test_aunt_marrying_nephew():
+    families = {
+        "@F1@": family("@I1@", "@I2@", ["@I3@", "@I4@"]),
+        "@F2@": family("@I3@", "@I5@", ["@I6@"]),
+        "@F3@": family("@I6@", "@I4@")
+    }
+    errors = messages(us20.us20_no_aunt_uncle_marriages({}, families))
+    assert errors == ["ERROR US20: Aunt @I4@ married nephew @I6@ in family @F3@."]
+
+
+def test_sibling_of_spouse_is_not_aunt_or_uncle():
+    # Marrying a sibling is US18's concern, not an aunt/uncle marriage
+    families = {
+        "@F1@": family("@I1@", "@I2@", ["@I3@", "@I4@"]),
+        "@F2@": family("@I3@", "@I5@")
+    }
+    assert list(us20.us20_no_aunt_uncle_marriages({}, families)) == []
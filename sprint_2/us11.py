@@ -1,88 +1,66 @@
+import sys
+import os
+import heapq
 from datetime import datetime
 
-def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%d %b %Y").date()
-    except ValueError:
-        return None
-
-def check_no_bigamy(file_path):
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    individuals = {}  # {ID: {"FAMS": []}}
-    families = {}     # {ID: {"HUSB": None, "WIFE": None, "MARR": date, "DIV": date}}
-    errors = []
-
-    current_id = None
-    indi_section = False
-    fam_section = False
-    date_context = None
-
-    for i, line in enumerate(lines):
-        parts = line.strip().split(" ", 2)
-        if len(parts) < 2:
-            continue
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_errors import CheckError, messages, source_line
 
-        level = parts[0]
+US11_ERROR = ("ERROR: US11: Individual {ids[0]} has overlapping marriages "
+              "in families {ids[1]} and {ids[2]} ({iso[0]}–{iso[1]} overlaps with {iso[2]}–{iso[3]})")
 
-        if level == "0" and len(parts) == 3:
-            pointer, tag = parts[1], parts[2]
-            if tag == "INDI":
-                current_id = pointer
-                individuals[current_id] = {"FAMS": []}
-                indi_section, fam_section = True, False
-            elif tag == "FAM":
-                current_id = pointer
-                families[current_id] = {"HUSB": None, "WIFE": None, "MARR": None, "DIV": None}
-                fam_section, indi_section = True, False
-            continue
-
-        tag = parts[1]
-        argument = parts[2] if len(parts) > 2 else ""
-
-        if indi_section:
-            if tag == "FAMS":
-                individuals[current_id]["FAMS"].append(argument)
-
-        elif fam_section:
-            if tag in {"HUSB", "WIFE"}:
-                families[current_id][tag] = argument
-            elif tag == "MARR":
-                date_context = "MARR"
-            elif tag == "DIV":
-                date_context = "DIV"
-            elif tag == "DATE" and date_context:
-                families[current_id][date_context] = parse_date(argument)
-                date_context = None
+def parse_date(date_str):
+    date = parse_gedcom_date(date_str)
+    return date.date() if date else None
+
+def overlapping_marriages(marriages):
+    """
+    Sweeps marriages sorted by start date, keeping a heap of the ones still
+    ongoing, and returns every overlapping (earlier, later) index pair in
+    O(k log k + overlaps) instead of comparing all pairs.
+    """
+    overlaps = []
+    ongoing = []
+    for j, (start, end, fam_id) in enumerate(marriages):
+        # Marriages ending on or before this start cannot overlap it or any later one
+        while ongoing and ongoing[0][0] <= start:
+            heapq.heappop(ongoing)
+        overlaps.extend((i, j) for _, i in ongoing)
+        heapq.heappush(ongoing, (end, j))
+    overlaps.sort()
+    return overlaps
+
+def us11_no_bigamy(individuals, families):
+    today = datetime.today().date()
 
     # Bigamy check
     for indi_id, data in individuals.items():
-        fams = data["FAMS"]
+        fams = data.get("fams", [])
         marriages = []
 
         for fam_id in fams:
             fam = families.get(fam_id)
             if not fam:
                 continue
-            start = fam.get("MARR")
-            end = fam.get("DIV") or datetime.today().date()
+            start = parse_date(fam.get("married"))
+            end = parse_date(fam.get("divorced")) or today
             if start:
                 marriages.append((start, end, fam_id))
 
         marriages.sort()  # Sort by start date
 
-        for i in range(len(marriages)):
-            for j in range(i + 1, len(marriages)):
-                start1, end1, fam1 = marriages[i]
-                start2, end2, fam2 = marriages[j]
-                if start2 < end1:
-                    errors.append(
-                        f"ERROR: US11: Individual {indi_id} has overlapping marriages "
-                        f"in families {fam1} and {fam2} ({start1}–{end1} overlaps with {start2}–{end2})"
-                    )
+        for i, j in overlapping_marriages(marriages):
+            start1, end1, fam1 = marriages[i]
+            start2, end2, fam2 = marriages[j]
+            spans = (start1, end1, start2, end2)
+            yield CheckError("US11", US11_ERROR, (indi_id, fam1, fam2), tuple(day.toordinal() for day in spans),
+                             line=source_line(individuals, indi_id))
 
-    return errors
+def check_no_bigamy(file_path):
+    individuals, families = read_gedcom(file_path)
+    return messages(us11_no_bigamy(individuals, families))
 
 def write_output(errors, output_path="us11_output.txt"):
     with open(output_path, "w") as f:
@@ -0,0 +1,66 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import add_months, parse_gedcom_date
+from gedcom_columns import child_edges, date_columns, gather, in_row_order, shifted_column, take, where_after
+from gedcom_errors import CheckError, messages, source_line
+
+# A mother must be less than 60 years older than her children, a father less than 80
+PARENT_LIMITS = [("Father", "husb", 80), ("Mother", "wife", 60)]
+
+# One message template per limit, indexed like PARENT_LIMITS
+US12_ERRORS = [
+    f"ERROR: US12: {role} {{ids[1]}} born {{dates[0]}} is {years} or more years older "
+    "than child {ids[0]} born {dates[1]} in family {ids[2]}"
+    for role, field, years in PARENT_LIMITS
+]
+
+def parse_date(date_str):
+    return parse_gedcom_date(date_str)
+
+def us12_parents_not_too_old(individuals, families):
+    dense, dates = date_columns(individuals, families, parse_gedcom_date)
+
+    # One row per child of every family
+    edge_families, edge_children = child_edges(dense)
+    child_birth = gather(dates["birth"], edge_children)
+
+    parent_births, limits = [], []
+    for role, field, years in PARENT_LIMITS:
+        # The date each parent reaches the limit, computed once per family rather than per child
+        birth = gather(dates["birth"], dense[field])
+        parent_births.append(birth)
+        limits.append(take(shifted_column(birth, lambda born: add_months(born, 12 * years)), edge_families))
+
+    # Children born on or after the day a parent reached the limit
+    for edge, rule in in_row_order(*(where_after(child_birth, limit, -1) for limit in limits)):
+        fam = edge_families[edge]
+        field = PARENT_LIMITS[rule][1]
+        child_id = dense['person_ids'][edge_children[edge]]
+        parent_id = dense['person_ids'][dense[field][fam]]
+        yield CheckError("US12", US12_ERRORS[rule], (child_id, parent_id, dense['family_ids'][fam]),
+                         (parent_births[rule][fam], child_birth[edge]),
+                         line=source_line(individuals, child_id, "birth"))
+
+def check_parents_not_too_old(file_path):
+    individuals, families = read_gedcom(file_path)
+    return messages(us12_parents_not_too_old(individuals, families))
+
+def write_output(errors, output_path="us12_output.txt"):
+    with open(output_path, "w") as f:
+        if errors:
+            for err in errors:
+                f.write(err + "\n")
+        else:
+            f.write("PASSED: US12: All parents are within allowed age difference from children.\n")
+
+if __name__ == "__main__":
+    gedcom_file = "../M1B6.ged"
+    print(f"Checking parents not too old in {gedcom_file}...\n")
+
+    errors = check_parents_not_too_old(gedcom_file)
+    write_output(errors)
+
+    print("Validation complete. Results saved to 'us12_output.txt'.")
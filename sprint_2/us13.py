@@ -1,68 +1,20 @@
 import sys
-from datetime import datetime
-from collections import defaultdict
+import os
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_errors import CheckError, source_line
 
-def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, '%d %b %Y')
-    except ValueError:
-        return None
+US13_ERROR = ("Error: US13: Siblings {ids[0]} {values[0]} and {ids[1]} {values[1]} "
+              "have invalid spacing: {values[2]} days apart ({dates[0]} and {dates[1]})")
 
 
-def process_gedcom(filename):
-    individuals = {}
-    families = defaultdict(dict)
-    current_indi = None
-    current_fam = None
-    birth_date = None
-    birth_flag = False
-    error_found = False
-
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = line.split(' ', 2)
-            level = parts[0]
-            tag = parts[1] if len(parts) > 1 else ''
-            args = parts[2] if len(parts) > 2 else ''
-
-            if level == '0' and args == 'INDI':
-                current_indi = tag
-                individuals[current_indi] = {'name': 'Unknown'}
-                birth_flag = False
-
-            elif level == '0' and args.startswith('FAM'):
-                current_fam = tag
-                families[current_fam] = {'children': []}
-
-            elif level == '1' and current_indi:
-                if tag == 'NAME':
-                    individuals[current_indi]['name'] = args
-                elif tag == 'BIRT':
-                    birth_flag = True
-                elif tag == 'FAMC':
-                    if 'famc' not in individuals[current_indi]:
-                        individuals[current_indi]['famc'] = []
-                    individuals[current_indi]['famc'].append(args)
-
-            elif level == '1' and current_fam:
-                if tag == 'HUSB':
-                    families[current_fam]['husband'] = args
-                elif tag == 'WIFE':
-                    families[current_fam]['wife'] = args
-                elif tag == 'CHIL':
-                    families[current_fam]['children'].append(args)
-
-            elif level == '2' and tag == 'DATE' and current_indi and birth_flag:
-                date = parse_date(args)
-                if date:
-                    individuals[current_indi]['birth'] = date
-                    birth_flag = False
+def parse_date(date_str):
+    return parse_gedcom_date(date_str)
 
+
+def us13_siblings_spacing(individuals, families):
     for fam_id, fam_data in families.items():
         children = fam_data.get('children', [])
         if len(children) < 2:
@@ -70,8 +22,9 @@ def process_gedcom(filename):
 
         siblings = []
         for child_id in children:
-            if child_id in individuals and 'birth' in individuals[child_id]:
-                siblings.append((child_id, individuals[child_id]['birth']))
+            birth = parse_date(individuals.get(child_id, {}).get('birth'))
+            if birth:
+                siblings.append((child_id, birth))
 
         siblings.sort(key=lambda x: x[1])
 
@@ -83,14 +36,20 @@ def process_gedcom(filename):
             days_diff = delta.days
 
             if 2 <= days_diff < 243.5:
-                name1 = individuals[child1]['name']
-                name2 = individuals[child2]['name']
-                print(f"Error: US13: Siblings {child1} {name1} and {child2} {name2} "
-                      f"have invalid spacing: {days_diff} days apart "
-                      f"({date1.strftime('%d %b %Y')} and {date2.strftime('%d %b %Y')})")
-                error_found = True
-
-    if not error_found:
+                name1 = individuals[child1].get('name') or 'Unknown'
+                name2 = individuals[child2].get('name') or 'Unknown'
+                yield CheckError("US13", US13_ERROR, (child1, child2, fam_id), (date1.toordinal(), date2.toordinal()),
+                                 (name1, name2, days_diff), source_line(individuals, child1, "birth"))
+
+
+def process_gedcom(filename):
+    individuals, families = read_gedcom(filename)
+    errors = list(us13_siblings_spacing(individuals, families))
+
+    for error in errors:
+        print(error)
+
+    if not errors:
         with open("us13_output.txt", "w") as out_file:
             out_file.write("PASSED: US13: Sibling Spacing Correct\n")
 
@@ -1,73 +1,56 @@
-from datetime import datetime
+import sys
+import os
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_errors import CheckError, messages, source_line
+
+US16_ERROR = ("ERROR: US16: Male child ({ids[0]}) '{values[0]}' in family {ids[1]} "
+              "does not have the same last name as the father '{values[1]}'.")
+
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%d %b %Y")
-    except ValueError:
-        return None
+    return parse_gedcom_date(date_str)
 
 def extract_last_name(name):
     match = re.search(r'/([^/]+)/', name)
     return match.group(1) if match else None
 
+def from_model(individuals, families):
+    """Converts the shared parsed model into the records used by this check."""
+    records = {}
+    for indi_id, indi in individuals.items():
+        records[indi_id] = {
+            "name": indi.get("name") or "",
+            "sex": indi.get("sex"),
+            "birth": parse_date(indi.get("birth")),
+            "death": parse_date(indi.get("death"))
+        }
+
+    fams = {}
+    for fam_id, fam in families.items():
+        fams[fam_id] = {
+            "husband": fam.get("husb"),
+            "wife": fam.get("wife"),
+            "children": list(fam.get("children", []))
+        }
+
+    return records, fams
+
 def parse_gedcom_file(file_path):
-    individuals = {}
-    families = {}
-    current_indi = None
-    current_fam = None
-
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-
-    for i in range(len(lines)):
-        parts = lines[i].strip().split(" ", 2)
-        level = parts[0]
-
-        if level == "0":
-            if len(parts) == 3 and parts[2] == "INDI":
-                current_indi = parts[1].strip()
-                individuals[current_indi] = {}
-                current_fam = None
-            elif len(parts) == 3 and parts[2] == "FAM":
-                current_fam = parts[1].strip()
-                families[current_fam] = {"children": []}
-                current_indi = None
-            else:
-                current_indi = None
-                current_fam = None
-        elif level == "1":
-            tag = parts[1]
-            argument = parts[2] if len(parts) > 2 else ""
-
-            if current_indi:
-                if tag == "NAME":
-                    individuals[current_indi]["name"] = argument
-                elif tag == "SEX":
-                    individuals[current_indi]["sex"] = argument
-                elif tag == "BIRT":
-                    if i + 1 < len(lines) and lines[i+1].strip().startswith("2 DATE"):
-                        birth_date = lines[i+1].strip().split("DATE")[1].strip()
-                        individuals[current_indi]["birth"] = parse_date(birth_date)
-                elif tag == "DEAT":
-                    if i + 1 < len(lines) and lines[i+1].strip().startswith("2 DATE"):
-                        death_date = lines[i+1].strip().split("DATE")[1].strip()
-                        individuals[current_indi]["death"] = parse_date(death_date)
-            elif current_fam:
-                if tag == "HUSB":
-                    families[current_fam]["husband"] = argument
-                elif tag == "WIFE":
-                    families[current_fam]["wife"] = argument
-                elif tag == "CHIL":
-                    families[current_fam]["children"].append(argument)
-
-    return individuals, families
+    return from_model(*read_gedcom(file_path))
 
 def check_male_last_names(individuals, families):
-    errors = []
+    fams = {
+        fam_id: {"husb": fam.get("husband"), "wife": fam.get("wife"), "children": fam.get("children", [])}
+        for fam_id, fam in families.items()
+    }
+    return messages(us16_male_last_names(individuals, fams))
 
+def us16_male_last_names(individuals, families):
     for fam_id, family in families.items():
-        husband_id = family.get("husband")
+        husband_id = family.get("husb")
         children_ids = family.get("children", [])
 
         if not husband_id or husband_id not in individuals:
@@ -77,20 +60,18 @@ def check_male_last_names(individuals, families):
         if husband.get("sex") != "M":
             continue
 
-        husband_last_name = extract_last_name(husband.get("name", ""))
+        husband_name = husband.get("name") or ""
+        husband_last_name = extract_last_name(husband_name)
         if not husband_last_name:
             continue
 
         for child_id in children_ids:
             child = individuals.get(child_id, {})
             if child.get("sex") == "M":
-                child_last_name = extract_last_name(child.get("name", ""))
-                if child_last_name != husband_last_name:
-                    errors.append(
-                        f"ERROR: US16: Male child ({child_id}) '{child.get('name', '')}' in family {fam_id} "
-                        f"does not have the same last name as the father '{husband.get('name', '')}'."
-                    )
-    return errors
+                child_name = child.get("name") or ""
+                if extract_last_name(child_name) != husband_last_name:
+                    yield CheckError("US16", US16_ERROR, (child_id, fam_id), values=(child_name, husband_name),
+                                     line=source_line(individuals, child_id))
 
 def write_output(errors, output_path="us16_output.txt"):
     with open(output_path, "w") as f:
@@ -104,6 +85,5 @@ if __name__ == "__main__":
     gedcom_path = "../M1B6.ged"
     print("Checking that all male members have the same last name as the father...")
 
-    individuals, families = parse_gedcom_file(gedcom_path)
-    errors = check_male_last_names(individuals, families)
+    errors = messages(us16_male_last_names(*read_gedcom(gedcom_path)))
     write_output(errors)
\ No newline at end of file
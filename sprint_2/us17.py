@@ -1,74 +1,66 @@
-from collections import defaultdict
+import sys
+import os
 
-def parse_gedcom(filename):
-    individuals = {}
-    families = {}
-
-    with open(filename, 'r') as file:
-        lines = file.readlines()
-
-    indi_id = fam_id = None
-    for line in lines:
-        parts = line.strip().split()
-        if not parts:
-            continue
-
-        level = parts[0]
-        tag = parts[1] if parts[1] in ["INDI", "FAM"] else parts[2] if len(parts) > 2 and parts[2] in ["INDI", "FAM"] else None
-
-        if tag == "INDI":
-            indi_id = parts[1]
-            individuals[indi_id] = {"FAMS": [], "FAMC": None}
-        elif tag == "FAM":
-            fam_id = parts[1]
-            families[fam_id] = {"HUSB": None, "WIFE": None, "CHIL": []}
-        elif tag == "FAMS" and indi_id:
-            individuals[indi_id]["FAMS"].append(parts[2])
-        elif tag == "FAMC" and indi_id:
-            individuals[indi_id]["FAMC"] = parts[2]
-        elif tag in ["HUSB", "WIFE"] and fam_id:
-            families[fam_id][tag] = parts[2]
-        elif tag == "CHIL" and fam_id:
-            families[fam_id]["CHIL"].append(parts[2])
-
-    return individuals, families
-
-def is_descendant(individuals, families, ancestor, person):
-    """DFS to check if 'person' is a descendant of 'ancestor'."""
-    if ancestor not in individuals or person not in individuals:
-        return False
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_index import build_ancestry_index, is_ancestor
+from gedcom_errors import CheckError, messages, source_line
 
-    children = []
-    for fam_id in individuals.get(ancestor, {}).get("FAMS", []):
-        children += families.get(fam_id, {}).get("CHIL", [])
+US17_ERROR = "ERROR US17: {ids[1]} is married to their descendant {ids[2]} in family {ids[0]}"
 
-    visited = set()
-    stack = list(children)
+def from_model(individuals, families):
+    """Converts the shared parsed model into the records used by this check."""
+    records = {}
+    for indi_id, indi in individuals.items():
+        famc = indi.get("famc") or []
+        records[indi_id] = {"FAMS": list(indi.get("fams", [])), "FAMC": famc[-1] if famc else None}
 
-    while stack:
-        current = stack.pop()
-        if current == person:
-            return True
-        visited.add(current)
-        for fam_id in individuals.get(current, {}).get("FAMS", []):
-            stack.extend(families.get(fam_id, {}).get("CHIL", []))
-    return False
+    fams = {}
+    for fam_id, fam in families.items():
+        fams[fam_id] = {"HUSB": fam.get("husb"), "WIFE": fam.get("wife"), "CHIL": list(fam.get("children", []))}
 
+    return records, fams
+
+def parse_gedcom(filename):
+    return from_model(*read_gedcom(filename))
+
+def ancestry_index(individuals, families):
+    """Builds the reachability index over this check's records."""
+    children = {}
+    for indi_id, indi in individuals.items():
+        kids = children[indi_id] = []
+        for fam_id in indi.get("FAMS", []):
+            kids.extend(families.get(fam_id, {}).get("CHIL", []))
+    return build_ancestry_index(children)
+
+def is_descendant(individuals, families, ancestor, person, index=None):
+    """Checks if 'person' is a descendant of 'ancestor', using a prebuilt index when given."""
+    if ancestor not in individuals or person not in individuals:
+        return False
+    if index is None:
+        index = ancestry_index(individuals, families)
+    return is_ancestor(index, ancestor, person)
 
-def check_no_marriage_to_descendants(filename):
-    individuals, families = parse_gedcom(filename)
-    errors = []
+
+def us17_no_marriages_to_descendants(individuals, families):
+    model_families = families
+    individuals, families = from_model(individuals, families)
+    index = ancestry_index(individuals, families)
 
     for fam_id, fam in families.items():
         husband = fam["HUSB"]
         wife = fam["WIFE"]
 
         if husband and wife:
-            if is_descendant(individuals, families, husband, wife):
-                errors.append(f"ERROR US17: {husband} is married to their descendant {wife} in family {fam_id}")
-            if is_descendant(individuals, families, wife, husband):
-                errors.append(f"ERROR US17: {wife} is married to their descendant {husband} in family {fam_id}")
-    return errors
+            line = source_line(model_families, fam_id)
+            if is_descendant(individuals, families, husband, wife, index):
+                yield CheckError("US17", US17_ERROR, (fam_id, husband, wife), line=line)
+            if is_descendant(individuals, families, wife, husband, index):
+                yield CheckError("US17", US17_ERROR, (fam_id, wife, husband), line=line)
+
+def check_no_marriage_to_descendants(filename):
+    individuals, families = read_gedcom(filename)
+    return messages(us17_no_marriages_to_descendants(individuals, families))
 
 def write_output(errors, output_path="us17_output.txt"):
     with open(output_path, "w") as f:
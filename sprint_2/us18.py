@@ -1,65 +1,51 @@
-from collections import defaultdict
-
-def parse_gedcom(filename):
-    individuals = {}
-    families = {}
-    current_individual = None
-    current_family = None
-
-    with open(filename, "r") as file:
-        for line in file:
-            tokens = line.strip().split()
-            if not tokens:
-                continue
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from kinship import SIBLINGS, couples_related_as
+from gedcom_errors import CheckError, messages, source_line
+
+US18_ERROR = "ERROR: US18: Siblings {plain[1]} and {plain[2]} are married in family {plain[0]}."
+
+def from_model(individuals, families):
+    """Converts the shared parsed model into the records used by this check."""
+    records = {}
+    for indi_id, indi in individuals.items():
+        records[indi_id.strip("@")] = {
+            "FAMC": [fam_id.strip("@") for fam_id in indi.get("famc", [])],
+            "FAMS": [fam_id.strip("@") for fam_id in indi.get("fams", [])]
+        }
+
+    fams = {}
+    for fam_id, fam in families.items():
+        fams[fam_id.strip("@")] = {
+            "HUSB": fam["husb"].strip("@") if fam.get("husb") else None,
+            "WIFE": fam["wife"].strip("@") if fam.get("wife") else None,
+            "CHIL": [child.strip("@") for child in fam.get("children", [])]
+        }
 
-            level = tokens[0]
-            if level == "0":
-                if len(tokens) >= 3 and tokens[2] == "INDI":
-                    current_individual = tokens[1].strip("@")
-                    individuals[current_individual] = {"FAMC": [], "FAMS": []}
-                elif len(tokens) >= 3 and tokens[2] == "FAM":
-                    current_family = tokens[1].strip("@")
-                    families[current_family] = {"HUSB": None, "WIFE": None, "CHIL": []}
+    return records, fams
 
-            elif level == "1":
-                tag = tokens[1]
-                if tag in ["HUSB", "WIFE"] and current_family:
-                    families[current_family][tag] = tokens[2].strip("@")
-                elif tag == "CHIL" and current_family:
-                    families[current_family]["CHIL"].append(tokens[2].strip("@"))
-                elif tag == "FAMS" and current_individual:
-                    individuals[current_individual]["FAMS"].append(tokens[2].strip("@"))
-                elif tag == "FAMC" and current_individual:
-                    individuals[current_individual]["FAMC"].append(tokens[2].strip("@"))
+def parse_gedcom(filename):
+    return from_model(*read_gedcom(filename))
 
-    return individuals, families
+def find_sibling_marriages(individuals, families):
+    # The check works on the shared model's family layout
+    model_families = {
+        fam_id: {"husb": info["HUSB"], "wife": info["WIFE"], "children": info["CHIL"]}
+        for fam_id, info in families.items()
+    }
+    return messages(us18_siblings_should_not_marry(individuals, model_families))
 
 def check_sibling_marriage(filename):
     individuals, families = parse_gedcom(filename)
-    errors = []
-
-    # Build a map from family ID to set of children
-    fam_children = {fam_id: set(info["CHIL"]) for fam_id, info in families.items()}
-
-    # For each family (marriage), check if HUSB and WIFE share a FAMC
-    for fam_id, fam in families.items():
-        husb = fam["HUSB"]
-        wife = fam["WIFE"]
-
-        if not husb or not wife:
-            continue
-
-        # Get family sets for husband and wife
-        husb_famc = set(individuals.get(husb, {}).get("FAMC", []))
-        wife_famc = set(individuals.get(wife, {}).get("FAMC", []))
-
-        # If they share a family as children, they're siblings
-        if husb_famc & wife_famc:
-            errors.append(
-                f"ERROR: US18: Siblings {husb} and {wife} are married in family {fam_id}."
-            )
+    return find_sibling_marriages(individuals, families)
 
-    return errors
+def us18_siblings_should_not_marry(individuals, families):
+    # Siblings share a parent one generation up on both sides
+    for fam_id, husb, wife in couples_related_as(families, SIBLINGS):
+        yield CheckError("US18", US18_ERROR, (fam_id, husb, wife), line=source_line(families, fam_id))
 
 def write_output(errors, output_file="us18_output.txt"):
     with open(output_file, "w") as f:
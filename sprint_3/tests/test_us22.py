@@ -1,3 +1,4 @@
+import io
 import unittest
 import tempfile
 import os
@@ -73,6 +74,17 @@ class TestUS22UniqueIDs(unittest.TestCase):
         self.assertTrue(any("Duplicate individual ID" in e for e in result))
         self.assertTrue(any("Duplicate family ID" in e for e in result))
 
+    def test_in_memory_sources(self):
+        gedcom = """0 @I1@ INDI
+1 SEX M
+0 @I1@ INDI
+1 SEX F
+"""
+        for source in (gedcom, gedcom.encode(), io.BytesIO(gedcom.encode())):
+            result = check_unique_ids(source)
+            self.assertEqual(len(result), 1)
+            self.assertIn("Duplicate individual ID", result[0])
+
     def test_empty_file(self):
         gedcom = ""
         path = self.write_temp_gedcom(gedcom)
@@ -1,69 +1,33 @@
-from datetime import datetime
+import sys
+import os
 
-def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%d %b %Y").date()
-    except ValueError:
-        return None
-
-def check_gender_for_roles(file_path):
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    individuals = {}  # {ID: SEX}
-    families = {}     # {ID: {"HUSB": ID, "WIFE": ID}}
-    errors = []
-
-    current_id = None
-    indi_section = False
-    fam_section = False
-
-    for line in lines:
-        parts = line.strip().split(" ", 2)
-        if len(parts) < 2:
-            continue
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_errors import CheckError, messages, source_line
 
-        level = parts[0]
+US21_HUSBAND_ERROR = "ERROR: US21: Husband {ids[1]} in family {ids[0]} is not male."
+US21_WIFE_ERROR = "ERROR: US21: Wife {ids[1]} in family {ids[0]} is not female."
 
-        if level == "0" and len(parts) == 3:
-            pointer, tag = parts[1], parts[2]
-            if tag == "INDI":
-                current_id = pointer
-                individuals[current_id] = None
-                indi_section, fam_section = True, False
-            elif tag == "FAM":
-                current_id = pointer
-                families[current_id] = {"HUSB": None, "WIFE": None}
-                fam_section, indi_section = True, False
-            continue
-
-        tag = parts[1]
-        argument = parts[2] if len(parts) > 2 else ""
-
-        if indi_section:
-            if tag == "SEX":
-                individuals[current_id] = argument
-
-        elif fam_section:
-            if tag in {"HUSB", "WIFE"}:
-                families[current_id][tag] = argument
+def parse_date(date_str):
+    date = parse_gedcom_date(date_str)
+    return date.date() if date else None
 
+def us21_correct_gender_for_role(individuals, families):
     # Check genders
     for fam_id, fam_data in families.items():
-        husband = fam_data.get("HUSB")
-        wife = fam_data.get("WIFE")
+        husband = fam_data.get("husb")
+        wife = fam_data.get("wife")
 
-        if husband and individuals.get(husband) != "M":
-            errors.append(
-                f"ERROR: US21: Husband {husband} in family {fam_id} is not male."
-            )
+        if husband and individuals.get(husband, {}).get("sex") != "M":
+            yield CheckError("US21", US21_HUSBAND_ERROR, (fam_id, husband), line=source_line(families, fam_id))
 
-        if wife and individuals.get(wife) != "F":
-            errors.append(
-                f"ERROR: US21: Wife {wife} in family {fam_id} is not female."
-            )
+        if wife and individuals.get(wife, {}).get("sex") != "F":
+            yield CheckError("US21", US21_WIFE_ERROR, (fam_id, wife), line=source_line(families, fam_id))
 
-    return errors
+def check_gender_for_roles(file_path):
+    individuals, families = read_gedcom(file_path)
+    return messages(us21_correct_gender_for_role(individuals, families))
 
 def write_output(errors, output_path="us21_output.txt"):
     with open(output_path, "w") as f:
@@ -1,31 +1,32 @@
-def check_unique_ids(file_path):
-    with open(file_path, "r") as file:
-        lines = file.readlines()
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_errors import CheckError, messages
+
+US22_ERROR = "ERROR: US22: Duplicate {values[0]} ID {ids[0]}."
 
-    indi_ids = set()
-    fam_ids = set()
-    errors = []
+def us22_unique_ids(individuals, families):
+    # Replay every level 0 header in file order; INDI and FAM share one ID space
+    headers = []
+    for kind, records in (("individual", individuals), ("family", families)):
+        for pointer, record in records.items():
+            for line_no in record.get("lines", [0]):
+                headers.append((line_no, kind, pointer))
+    headers.sort()
 
     seen = set()
 
-    for line in lines:
-        parts = line.strip().split(" ", 2)
-        if len(parts) == 3 and parts[0] == "0":
-            pointer, tag = parts[1], parts[2]
-            if tag == "INDI":
-                if pointer in seen:
-                    errors.append(f"ERROR: US22: Duplicate individual ID {pointer}.")
-                else:
-                    seen.add(pointer)
-                    indi_ids.add(pointer)
-            elif tag == "FAM":
-                if pointer in seen:
-                    errors.append(f"ERROR: US22: Duplicate family ID {pointer}.")
-                else:
-                    seen.add(pointer)
-                    fam_ids.add(pointer)
-
-    return errors
+    for line_no, kind, pointer in headers:
+        if pointer in seen:
+            yield CheckError("US22", US22_ERROR, (pointer,), values=(kind,), line=line_no or None)
+        else:
+            seen.add(pointer)
+
+def check_unique_ids(file_path):
+    individuals, families = read_gedcom(file_path)
+    return messages(us22_unique_ids(individuals, families))
 
 def write_output(errors, output_path="us22_output.txt"):
     with open(output_path, "w") as f:
@@ -1,5 +1,11 @@
-from collections import defaultdict
 import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_errors import CheckError, source_line
+
+US24_ERROR = "Error: US24: Duplicate spouse pair in family {ids[0]}"
 
 
 def normalize_name(name):
@@ -8,49 +14,15 @@ def normalize_name(name):
     return normalized if normalized != "unknown" else None
 
 
-def process_gedcom(filename, test_mode=False):
-    individuals = {}
-    families = defaultdict(dict)
-    current_indi = None
-    current_fam = None
-    error_found = False
-
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if not line:
-                continue
-            parts = line.split(' ', 2)
-            level = parts[0]
-            tag = parts[1] if len(parts) > 1 else ''
-            args = parts[2] if len(parts) > 2 else ''
-
-            if level == '0' and args == 'INDI':
-                current_indi = tag
-                individuals[current_indi] = {'name': 'Unknown'}
-
-            elif level == '0' and args.startswith('FAM'):
-                current_fam = tag
-                families[current_fam] = {'husband': None, 'wife': None}
-
-            elif level == '1' and current_indi:
-                if tag == 'NAME':
-                    individuals[current_indi]['name'] = args
-
-            elif level == '1' and current_fam:
-                if tag == 'HUSB':
-                    families[current_fam]['husband'] = args
-                elif tag == 'WIFE':
-                    families[current_fam]['wife'] = args
-
+def us24_unique_families_by_spouses(individuals, families):
     seen_pairs = set()
 
     for fam_id, fam_data in families.items():
-        husb_id = fam_data.get('husband')
+        husb_id = fam_data.get('husb')
         wife_id = fam_data.get('wife')
 
-        husb_name = normalize_name(individuals.get(husb_id, {}).get('name', 'Unknown'))
-        wife_name = normalize_name(individuals.get(wife_id, {}).get('name', 'Unknown'))
+        husb_name = normalize_name(individuals.get(husb_id, {}).get('name') or 'Unknown')
+        wife_name = normalize_name(individuals.get(wife_id, {}).get('name') or 'Unknown')
 
         # Skip if either spouse is unknown
         if husb_name is None or wife_name is None:
@@ -59,11 +31,19 @@ def process_gedcom(filename, test_mode=False):
         spouse_pair = tuple(sorted((husb_name, wife_name)))
 
         if spouse_pair in seen_pairs:
-            print(f"Error: US24: Duplicate spouse pair in family {fam_id}")
-            error_found = True
+            yield CheckError("US24", US24_ERROR, (fam_id,), line=source_line(families, fam_id))
         else:
             seen_pairs.add(spouse_pair)
 
+
+def process_gedcom(filename, test_mode=False):
+    individuals, families = read_gedcom(filename)
+    errors = list(us24_unique_families_by_spouses(individuals, families))
+    error_found = bool(errors)
+
+    for error in errors:
+        print(error)
+
     if not error_found:
         with open("us24_output.txt", "w") as f:
             f.write("PASSED: US24: No more than one family with the same spouses by name\n")
@@ -1,77 +1,41 @@
-from datetime import datetime
-from collections import defaultdict
+import sys
+import os
 
-def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%d %b %Y").date()
-    except ValueError:
-        return None
-
-def check_unique_child_name_and_birth(file_path):
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    individuals = {}
-    families = defaultdict(list)
-    errors = []
-
-    current_id = None
-    indi_section = False
-    fam_section = False
-    parsing_birth = False
-
-    for i, line in enumerate(lines):
-        parts = line.strip().split(" ", 2)
-        if len(parts) < 2:
-            continue
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_errors import CheckError, messages, source_line
 
-        level = parts[0]
+# Indexed by whether the children have a birth date; without one the message has always read 'None'
+US25_ERRORS = [
+    "ERROR: US25: Family {ids[0]} has more than one child named {values[0]} born on None.",
+    "ERROR: US25: Family {ids[0]} has more than one child named {values[0]} born on {iso[0]}."
+]
 
-        if level == "0":
-            parsing_birth = False  # Reset birth flag on new record
-            if len(parts) == 3:
-                pointer, tag = parts[1], parts[2]
-                if tag == "INDI":
-                    current_id = pointer
-                    individuals[current_id] = {"NAME": None, "BIRT": None}
-                    indi_section, fam_section = True, False
-                elif tag == "FAM":
-                    current_id = pointer
-                    fam_section, indi_section = True, False
-                continue
-
-        tag = parts[1]
-        argument = parts[2] if len(parts) > 2 else ""
-
-        if indi_section:
-            if tag == "NAME":
-                individuals[current_id]["NAME"] = argument
-            elif tag == "BIRT":
-                parsing_birth = True
-            elif tag == "DATE" and parsing_birth:
-                individuals[current_id]["BIRT"] = parse_date(argument)
-                parsing_birth = False
-
-        elif fam_section:
-            if tag == "CHIL":
-                families[current_id].append(argument)
+def parse_date(date_str):
+    date = parse_gedcom_date(date_str)
+    return date.date() if date else None
 
+def us25_unique_first_names_in_families(individuals, families):
     # Check each family for duplicate child names and birth dates
-    for fam_id, child_ids in families.items():
+    for fam_id, fam in families.items():
         seen = set()
-        for child_id in child_ids:
+        for child_id in fam.get("children", []):
             child = individuals.get(child_id)
             if not child:
                 continue
-            key = (child["NAME"], child["BIRT"])
+            name = child.get("name")
+            birth = parse_date(child.get("birth"))
+            key = (name, birth)
             if key in seen:
-                errors.append(
-                    f"ERROR: US25: Family {fam_id} has more than one child named {child['NAME']} born on {child['BIRT']}."
-                )
+                yield CheckError("US25", US25_ERRORS[birth is not None], (fam_id, child_id),
+                                 (birth.toordinal(),) if birth else (), (name,), source_line(families, fam_id))
             else:
                 seen.add(key)
 
-    return errors
+def check_unique_child_name_and_birth(file_path):
+    individuals, families = read_gedcom(file_path)
+    return messages(us25_unique_first_names_in_families(individuals, families))
 
 def write_output(errors, output_path="us25_output.txt"):
     with open(output_path, "w") as f:
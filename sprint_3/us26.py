@@ -1,65 +1,27 @@
-def check_family_roles_consistency(file_path):
-    with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    individuals = {}  # {ID: {"FAMC": set(), "FAMS": set()}}
-    families = {}     # {FAM_ID: {"HUSB": ID, "WIFE": ID, "CHIL": set()}}
-    errors = []
-
-    current_id = None
-    indi_section = False
-    fam_section = False
-
-    for line in lines:
-        parts = line.strip().split(" ", 2)
-        if len(parts) < 2:
-            continue
+import sys
+import os
 
-        level = parts[0]
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_errors import CheckError, messages, source_line
 
-        if level == "0" and len(parts) == 3:
-            pointer, tag = parts[1], parts[2]
-            if tag == "INDI":
-                current_id = pointer
-                individuals[current_id] = {"FAMC": set(), "FAMS": set()}
-                indi_section, fam_section = True, False
-            elif tag == "FAM":
-                current_id = pointer
-                families[current_id] = {"HUSB": None, "WIFE": None, "CHIL": set()}
-                fam_section, indi_section = True, False
-            continue
-
-        tag = parts[1]
-        argument = parts[2] if len(parts) > 2 else ""
-
-        if indi_section:
-            if tag == "FAMC":
-                individuals[current_id]["FAMC"].add(argument)
-            elif tag == "FAMS":
-                individuals[current_id]["FAMS"].add(argument)
-
-        elif fam_section:
-            if tag == "HUSB":
-                families[current_id]["HUSB"] = argument
-            elif tag == "WIFE":
-                families[current_id]["WIFE"] = argument
-            elif tag == "CHIL":
-                families[current_id]["CHIL"].add(argument)
+US26_SPOUSE_ERROR = "ERROR: US26: {values[0]} {ids[1]} in family {ids[0]} does not list this family in FAMS."
+US26_CHILD_ERROR = "ERROR: US26: Child {ids[1]} in family {ids[0]} does not list this family in FAMC."
 
+def us26_corresponding_entries(individuals, families):
     # Check consistency: individuals listed in family must reference that family
     for fam_id, fam in families.items():
-        for role, indi_id in [("HUSB", fam["HUSB"]), ("WIFE", fam["WIFE"])]:
-            if indi_id and fam_id not in individuals.get(indi_id, {}).get("FAMS", set()):
-                errors.append(
-                    f"ERROR: US26: {role} {indi_id} in family {fam_id} does not list this family in FAMS."
-                )
-        for child_id in fam["CHIL"]:
-            if child_id and fam_id not in individuals.get(child_id, {}).get("FAMC", set()):
-                errors.append(
-                    f"ERROR: US26: Child {child_id} in family {fam_id} does not list this family in FAMC."
-                )
+        for role, indi_id in [("HUSB", fam.get("husb")), ("WIFE", fam.get("wife"))]:
+            if indi_id and fam_id not in individuals.get(indi_id, {}).get("fams", []):
+                yield CheckError("US26", US26_SPOUSE_ERROR, (fam_id, indi_id), values=(role,),
+                                 line=source_line(families, fam_id))
+        for child_id in dict.fromkeys(fam.get("children", [])):
+            if child_id and fam_id not in individuals.get(child_id, {}).get("famc", []):
+                yield CheckError("US26", US26_CHILD_ERROR, (fam_id, child_id), line=source_line(families, fam_id))
 
-    return errors
+def check_family_roles_consistency(file_path):
+    individuals, families = read_gedcom(file_path)
+    return messages(us26_corresponding_entries(individuals, families))
 
 def write_output(errors, output_path="us26_output.txt"):
     with open(output_path, "w") as f:
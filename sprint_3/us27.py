@@ -1,77 +1,60 @@
-from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_ages import NO_AGE, age_column
+# Kept for callers of the record-based API below; the listing itself reads the age column
+from gedcom_ages import completed_years as calculate_age
+from gedcom_columns import NO_DATE, date_columns
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%d %b %Y")
-    except ValueError:
-        return None
+    return parse_gedcom_date(date_str)
 
-def calculate_age(birth_date, death_date=None):
-    today = datetime.today()
-    end_date = death_date if death_date else today
-    return end_date.year - birth_date.year - ((end_date.month, end_date.day) < (birth_date.month, birth_date.day))
+def from_model(individuals):
+    """
+    Converts the shared parsed model into the per-record layout this module
+    used before the listing moved to the age column; kept, with parse_gedcom
+    and calculate_age, for callers that still work on those records.
+    """
+    records = {}
+    for indi_id, indi in individuals.items():
+        records[indi_id.strip("@")] = {
+            "NAME": indi.get("name") or "",
+            "BIRT": parse_date(indi.get("birth")),
+            "DEAT": parse_date(indi.get("death"))
+        }
+    return records
 
 def parse_gedcom(filename):
-    individuals = {}
-    current_individual = None
-    birth_flag = False
-    death_flag = False
-
-    with open(filename, "r") as file:
-        for line in file:
-            tokens = line.strip().split(" ", 2)
-            if not tokens:
-                continue
+    individuals, families = read_gedcom(filename)
+    return from_model(individuals)
 
-            level = tokens[0]
+def us27_include_individual_ages(individuals, families):
+    lines = []
+    # Ages at death or on the reference date, one per person in model order
+    dense, ages = age_column(individuals, families)
+    death = date_columns(individuals, families, parse_gedcom_date)[1]["death"]
+    for (ind_id, indi), age, death_date in zip(individuals.items(), ages, death):
+        name = indi.get("name") or ""
 
-            if level == "0":
-                if len(tokens) >= 3 and tokens[2] == "INDI":
-                    current_individual = tokens[1].strip("@")
-                    individuals[current_individual] = {"NAME": "", "BIRT": None, "DEAT": None}
-                    birth_flag = False
-                    death_flag = False
-                else:
-                    current_individual = None  # not an individual record
-            elif current_individual:
-                tag = tokens[1]
-                args = tokens[2] if len(tokens) > 2 else ""
-
-                if tag == "NAME":
-                    individuals[current_individual]["NAME"] = args
-                elif tag == "BIRT":
-                    birth_flag = True
-                elif tag == "DEAT":
-                    death_flag = True
-                elif tag == "DATE":
-                    date = parse_date(args)
-                    if birth_flag:
-                        individuals[current_individual]["BIRT"] = date
-                        birth_flag = False
-                    elif death_flag:
-                        individuals[current_individual]["DEAT"] = date
-                        death_flag = False
+        if age != NO_AGE:
+            if death_date != NO_DATE:
+                age_info = f"Age at death: {age}"
+            else:
+                age_info = f"Current age: {age}"
+        else:
+            age_info = "Birth date unknown"
 
-    return individuals
+        lines.append(f"{ind_id.strip('@')}: {name}, {age_info}")
+    return lines
 
 def list_individuals_with_age(gedcom_file, output_file):
-    individuals = parse_gedcom(gedcom_file)
+    individuals, families = read_gedcom(gedcom_file)
     with open(output_file, "w") as f:
-        for ind_id, info in individuals.items():
-            name = info.get("NAME", "(no name)")
-            birth = info.get("BIRT")
-            death = info.get("DEAT")
-
-            if birth:
-                age = calculate_age(birth, death)
-                if death:
-                    age_info = f"Age at death: {age}"
-                else:
-                    age_info = f"Current age: {age}"
-            else:
-                age_info = "Birth date unknown"
-
-            f.write(f"{ind_id}: {name}, {age_info}\n")
+        for line in us27_include_individual_ages(individuals, families):
+            f.write(line + "\n")
 
 if __name__ == "__main__":
     gedcom_path = "../M1B6.ged"
@@ -1,82 +1,71 @@
-from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_ages import NO_AGE, age_column
+# Ages of the records from parse_gedcom; us28_order_siblings_by_age reads the age column instead
+from gedcom_ages import completed_years as calculate_age
+from gedcom_symbols import linked
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str, "%d %b %Y")
-    except ValueError:
-        return None
+    return parse_gedcom_date(date_str)
+
+def from_model(individuals, families):
+    """
+    Converts the shared parsed model into the NAME/BIRT and CHIL records the
+    sibling listing was first written against. The listing no longer needs
+    them; parse_gedcom and calculate_age stay for code that still does.
+    """
+    records = {}
+    for indi_id, indi in individuals.items():
+        records[indi_id.strip("@")] = {"NAME": indi.get("name") or "", "BIRT": parse_date(indi.get("birth"))}
 
-def calculate_age(birth_date):
-    today = datetime.today()
-    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+    fams = {}
+    for fam_id, fam in families.items():
+        fams[fam_id.strip("@")] = {"CHIL": [child.strip("@") for child in fam.get("children", [])]}
+
+    return records, fams
 
 def parse_gedcom(filename):
-    individuals = {}
-    families = {}
-    current_individual = None
-    current_family = None
-    birth_flag = False
+    return from_model(*read_gedcom(filename))
+
+def us28_order_siblings_by_age(individuals, families):
+    lines = []
+    # Everyone's age on the reference date, looked up by dense person number
+    dense, ages = age_column(individuals, families, at_death=False)
+    person_ids, person_count = dense["person_ids"], dense["person_count"]
 
-    with open(filename, "r") as file:
-        for line in file:
-            tokens = line.strip().split(" ", 2)
-            if not tokens:
+    for fam, fam_id in enumerate(families):
+        fam_id = fam_id.strip("@")
+        sibling_list = []
+
+        for child in linked(dense["children"], fam):
+            if child >= person_count:
+                sibling_list.append(("Unknown", "Unknown"))
                 continue
+            name = individuals[person_ids[child]].get("name") or ""
+            if ages[child] != NO_AGE:
+                sibling_list.append((name, int(ages[child])))
+            else:
+                sibling_list.append((name, "Unknown"))
 
-            level = tokens[0]
+        sibling_list.sort(key=lambda x: (x[1] if isinstance(x[1], int) else -1), reverse=True)
 
-            if level == "0":
-                if len(tokens) >= 3 and tokens[2] == "INDI":
-                    current_individual = tokens[1].strip("@")
-                    individuals[current_individual] = {"NAME": "", "BIRT": None}
-                    birth_flag = False
-                elif len(tokens) >= 3 and tokens[2] == "FAM":
-                    current_family = tokens[1].strip("@")
-                    families[current_family] = {"CHIL": []}
-                    current_individual = None
-                else:
-                    current_individual = None
-                    current_family = None
-            elif current_individual:
-                tag = tokens[1]
-                args = tokens[2] if len(tokens) > 2 else ""
-                if tag == "NAME":
-                    individuals[current_individual]["NAME"] = args
-                elif tag == "BIRT":
-                    birth_flag = True
-                elif tag == "DATE" and birth_flag:
-                    individuals[current_individual]["BIRT"] = parse_date(args)
-                    birth_flag = False
-            elif current_family:
-                tag = tokens[1]
-                args = tokens[2] if len(tokens) > 2 else ""
-                if tag == "CHIL":
-                    families[current_family]["CHIL"].append(args.strip("@"))
+        lines.append(f"Family {fam_id} Siblings by Age (Oldest First):")
+        for name, age in sibling_list:
+            lines.append(f"  {name}, Age: {age}")
+        lines.append("")
 
-    return individuals, families
+    return lines
 
 def list_siblings_by_age(gedcom_file, output_file):
-    individuals, families = parse_gedcom(gedcom_file)
+    individuals, families = read_gedcom(gedcom_file)
 
     with open(output_file, "w") as f:
-        for fam_id, fam in families.items():
-            children = fam.get("CHIL", [])
-            sibling_list = []
-
-            for child_id in children:
-                individual = individuals.get(child_id)
-                if individual and individual.get("BIRT"):
-                    age = calculate_age(individual["BIRT"])
-                    sibling_list.append((individual["NAME"], age))
-                else:
-                    sibling_list.append((individual["NAME"] if individual else "Unknown", "Unknown"))
-
-            sibling_list.sort(key=lambda x: (x[1] if isinstance(x[1], int) else -1), reverse=True)
-
-            f.write(f"Family {fam_id} Siblings by Age (Oldest First):\n")
-            for name, age in sibling_list:
-                f.write(f"  {name}, Age: {age}\n")
-            f.write("\n")
+        for line in us28_order_siblings_by_age(individuals, families):
+            f.write(line + "\n")
 
 if __name__ == "__main__":
     gedcom_path = "../M1B6.ged"
@@ -1,17 +1,14 @@
 import sys
 import os
-from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from gedcom_parser import process_gedcom_file
+from gedcom_dates import parse_gedcom_date
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str.strip(), '%d %b %Y')
-    except (ValueError, TypeError, AttributeError):
-        return None
+    return parse_gedcom_date(date_str.strip()) if date_str else None
 
-def us29_list_deceased(individuals):
+def us29_list_deceased(individuals, families=None):
     """Returns a list of IDs for deceased individuals."""
     deceased = []
     for indi_id, indi_data in individuals.items():
@@ -1,15 +1,12 @@
 import sys
 import os
-from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from gedcom_parser import process_gedcom_file
+from gedcom_dates import parse_gedcom_date
 
 def parse_date(date_str):
-    try:
-        return datetime.strptime(date_str.strip(), '%d %b %Y')
-    except (ValueError, TypeError, AttributeError):
-        return None
+    return parse_gedcom_date(date_str.strip()) if date_str else None
 
 def us30_list_living_married(individuals, families):
     """Returns a list of living married individuals (ID and name)."""
@@ -1,115 +1,60 @@
-from datetime import datetime
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_parser import read_gedcom
+from gedcom_dates import parse_gedcom_date
+from gedcom_ages import NO_AGE, years_between
+from gedcom_columns import date_columns, gather
 
 def parse_date(date_str):
     """Convert GEDCOM date string to datetime.date object"""
-    try:
-        return datetime.strptime(date_str, "%d %b %Y").date()
-    except ValueError:
-        return None
-
-def calculate_age(birth_date, reference_date=None):
-    """Calculate age at reference date (or current date if None)"""
-    if not birth_date:
-        return 0
-    ref_date = reference_date or datetime.now().date()
-    age = ref_date.year - birth_date.year
-    if (ref_date.month, ref_date.day) < (birth_date.month, birth_date.day):
-        age -= 1
-    return age
-
-def list_large_age_differences(file_path):
-    """Identify couples where one spouse is at least twice as old as the other"""
-    with open(file_path, "r") as file:
-        lines = file.readlines()
+    date = parse_gedcom_date(date_str)
+    return date.date() if date else None
 
-    individuals = {}  # {ID: {"name": str, "birth": date}}
-    families = {}     # {ID: {"HUSB": id, "WIFE": id, "MARR_DATE": date}}
+def us34_list_large_age_differences(individuals, families):
+    """Identify couples in the parsed model where one spouse is at least twice as old as the other"""
     large_age_diffs = []
 
-    current_id = None
-    indi_section = False
-    fam_section = False
-    current_tag = None
-
-    # Parse GEDCOM file
-    for line in lines:
-        parts = line.strip().split(" ", 2)
-        if len(parts) < 2:
-            continue
-
-        level = parts[0]
-
-        if level == "0":
-            if len(parts) == 3:
-                pointer, tag = parts[1], parts[2]
-                if tag == "INDI":
-                    current_id = pointer
-                    individuals[current_id] = {"name": "Unknown", "birth": None}
-                    indi_section, fam_section = True, False
-                elif tag == "FAM":
-                    current_id = pointer
-                    families[current_id] = {"HUSB": None, "WIFE": None, "MARR_DATE": None}
-                    fam_section, indi_section = True, False
-            continue
-
-        tag = parts[1]
-        argument = parts[2] if len(parts) > 2 else ""
-
-        if indi_section:
-            if tag == "NAME":
-                individuals[current_id]["name"] = argument
-            elif tag == "BIRT":
-                current_tag = "BIRT"
-            elif tag == "DATE" and current_tag == "BIRT":
-                individuals[current_id]["birth"] = parse_date(argument)
-                current_tag = None
-
-        elif fam_section:
-            if tag in {"HUSB", "WIFE"}:
-                families[current_id][tag] = argument
-            elif tag == "MARR":
-                current_tag = "MARR"
-            elif tag == "DATE" and current_tag == "MARR":
-                families[current_id]["MARR_DATE"] = parse_date(argument)
-                current_tag = None
+    # Ages of both spouses at marriage, for every family at once
+    dense, dates = date_columns(individuals, families, parse_gedcom_date)
+    married = dates["married"]
+    husband_ages = years_between(gather(dates["birth"], dense["husb"]), married)
+    wife_ages = years_between(gather(dates["birth"], dense["wife"]), married)
 
     # Check age differences
-    for fam_id, fam_data in families.items():
-        husband_id = fam_data.get("HUSB")
-        wife_id = fam_data.get("WIFE")
-        marriage_date = fam_data.get("MARR_DATE")
-
-        if not husband_id or not wife_id or not marriage_date:
-            continue
-
-        husband = individuals.get(husband_id, {})
-        wife = individuals.get(wife_id, {})
-
-        if not husband.get("birth") or not wife.get("birth"):
+    for (fam_id, fam_data), hub_age, wife_age in zip(families.items(), husband_ages, wife_ages):
+        if hub_age == NO_AGE or wife_age == NO_AGE:
             continue
 
-        hub_age = calculate_age(husband["birth"], marriage_date)
-        wife_age = calculate_age(wife["birth"], marriage_date)
+        hub_age, wife_age = int(hub_age), int(wife_age)
+        husband_name = individuals[fam_data.get("husb")].get("name") or "Unknown"
+        wife_name = individuals[fam_data.get("wife")].get("name") or "Unknown"
 
         if hub_age >= 2 * wife_age:
             large_age_diffs.append((
                 fam_id,
-                husband["name"],
+                husband_name,
                 hub_age,
-                wife["name"],
+                wife_name,
                 wife_age
             ))
         elif wife_age >= 2 * hub_age:
             large_age_diffs.append((
                 fam_id,
-                wife["name"],
+                wife_name,
                 wife_age,
-                husband["name"],
+                husband_name,
                 hub_age
             ))
 
     return large_age_diffs
 
+def list_large_age_differences(file_path):
+    """Identify couples where one spouse is at least twice as old as the other"""
+    individuals, families = read_gedcom(file_path)
+    return us34_list_large_age_differences(individuals, families)
+
 def write_output(results, output_path="us34_output.txt"):
     """Write results to output file"""
     with open(output_path, "w") as f:
@@ -0,0 +1,139 @@
+import sys
+import os
+import asyncio
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import batch_service
+from batch_service import ResultWriter, scan_directory, validate_directory, validate_file, validate_files
+from run_checks import format_result, run_checks
+
+
+GEDCOM = """0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX F
+1 BIRT
+2 DATE 01 JAN 1980
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Jane /Roe/
+1 SEX F
+1 BIRT
+2 DATE 01 JAN 1982
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 MARR
+2 DATE 01 JAN 1970
+"""
+
+
+def write_uploads(directory, count):
+    paths = []
+    for n in range(count):
+        path = directory / f"upload_{n}.ged"
+        path.write_text(GEDCOM)
+        paths.append(str(path))
+    return paths
+
+
+def test_validate_file_matches_run_checks(tmp_path):
+    path, = write_uploads(tmp_path, 1)
+    entries, _ = run_checks(path, use_cache=False)
+    summary = validate_file(path)
+
+    assert [entry["results"] for entry in summary["checks"]] == \
+        [[format_result(result) for result in entry["results"]] for entry in entries]
+    assert summary["findings"] == sum(len(entry["results"]) for entry in entries)
+    json.dumps(summary)
+
+
+def test_validate_file_reports_unreadable_files(tmp_path):
+    summary = validate_file(str(tmp_path / "missing.ged"))
+    assert summary["failure"].startswith("FileNotFoundError")
+    assert "checks" not in summary
+
+
+def test_validate_files_keeps_input_order(tmp_path):
+    paths = write_uploads(tmp_path, 5)
+    summaries = validate_files(paths, workers=2)
+    assert [summary["file"] for summary in summaries] == paths
+    assert len({summary["findings"] for summary in summaries}) == 1
+
+
+def test_validate_directory_writes_every_file(tmp_path):
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    paths = write_uploads(uploads, 3)
+    output = tmp_path / "results.jsonl"
+
+    writer = ResultWriter(str(output))
+    asyncio.run(validate_directory(str(uploads), writer, workers=2))
+    writer.close()
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(summary["file"] for summary in lines) == paths
+    assert writer.files == 3 and writer.failed == 0
+
+
+def test_validate_file_caps_results_per_check(tmp_path):
+    path, = write_uploads(tmp_path, 1)
+    summary = validate_file(path, max_errors=1)
+
+    us02 = next(entry for entry in summary["checks"] if entry["story"] == "US02")
+    assert len(us02["results"]) == 1 and us02["truncated"]
+    assert summary["findings"] == sum(len(entry["results"]) for entry in summary["checks"])
+
+
+def crash_on_marked_files(filename, *args):
+    if os.path.basename(filename).startswith("crash"):
+        os._exit(1)
+    return validate_file(filename, *args)
+
+
+def test_worker_crash_fails_its_file_only(tmp_path, monkeypatch):
+    # Forked workers inherit the patched function
+    monkeypatch.setattr(batch_service, "validate_file", crash_on_marked_files)
+    first, upload, last = write_uploads(tmp_path, 3)
+    crash = str(tmp_path / "crash.ged")
+    os.rename(upload, crash)
+
+    summaries = validate_files([first, crash, last], workers=1)
+
+    assert summaries[1]["failure"].startswith("BrokenProcessPool")
+    assert "failure" not in summaries[0] and "failure" not in summaries[2]
+
+
+def test_watch_waits_for_files_to_stop_changing(tmp_path, monkeypatch):
+    path = tmp_path / "upload.ged"
+    path.write_text(GEDCOM[:20])
+    queued = []
+
+    async def run():
+        queue = asyncio.Queue()
+        # Each poll's sleep first records what was queued so far, then acts
+        steps = iter([
+            lambda: path.write_text(GEDCOM),  # still being written
+            lambda: None,
+            lambda: None,
+            lambda: path.unlink()
+        ])
+
+        async def next_poll(seconds):
+            queued.append(queue.qsize())
+            step = next(steps, None)
+            if step is None:
+                raise asyncio.CancelledError
+            step()
+
+        monkeypatch.setattr(batch_service.asyncio, "sleep", next_poll)
+        try:
+            await scan_directory(str(tmp_path), queue, poll_seconds=1)
+        except asyncio.CancelledError:
+            pass
+        return queue
+
+    queue = asyncio.run(run())
+    assert queued == [0, 0, 1, 1, 1]
+    assert queue.get_nowait() == str(path)
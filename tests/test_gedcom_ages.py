@@ -0,0 +1,59 @@
+import sys
+import os
+from datetime import date, datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gedcom_ages
+from gedcom_ages import NO_AGE, age_column, completed_years, set_reference_date, years_between, where_older
+from gedcom_parser import read_gedcom
+
+
+GEDCOM = """0 @I1@ INDI
+1 NAME Old /Timer/
+1 BIRT
+2 DATE 29 FEB 1960
+0 @I2@ INDI
+1 NAME Gone /Early/
+1 BIRT
+2 DATE 10 MAY 1950
+1 DEAT
+2 DATE 09 MAY 2000
+0 @I3@ INDI
+1 NAME No /Birth/
+"""
+
+
+def teardown_function():
+    gedcom_ages.run_reference = None
+
+
+def test_completed_years_counts_birthdays_exactly():
+    assert completed_years(date(1950, 5, 10), date(2000, 5, 9)) == 49
+    assert completed_years(date(1950, 5, 10), date(2000, 5, 10)) == 50
+    assert completed_years(datetime(2000, 2, 29), date(2001, 2, 28)) == 0
+    assert completed_years(date(2000, 2, 29), date(2001, 3, 1)) == 1
+    assert completed_years(date(2000, 6, 1), date(1999, 7, 1)) == -1
+
+
+def test_reference_date_is_fixed_for_the_run():
+    set_reference_date(datetime(2020, 2, 28, 23, 59))
+    assert gedcom_ages.reference_date() == date(2020, 2, 28)
+    assert completed_years(date(1960, 2, 29)) == 59
+
+
+def test_years_between_skips_unknown_dates():
+    ordinals = [date(1960, 2, 29).toordinal(), 0, date(1990, 1, 1).toordinal()]
+    ends = [date(2020, 3, 1).toordinal(), date(2020, 1, 1).toordinal(), 0]
+    assert list(years_between(ordinals, ends)) == [60, NO_AGE, NO_AGE]
+
+
+def test_age_column_counts_to_death_or_reference_date():
+    set_reference_date(date(2020, 2, 28))
+    individuals, families = read_gedcom(GEDCOM)
+
+    dense, ages = age_column(individuals, families)
+    assert list(ages) == [59, 49, NO_AGE]
+    assert where_older(ages, 50) == [0]
+
+    dense, ages = age_column(individuals, families, at_death=False)
+    assert list(ages) == [59, 69, NO_AGE]
@@ -0,0 +1,102 @@
+import sys
+import os
+import pickle
+import stat
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_cache import HEADER, CACHE_MAGIC, CACHE_VERSION, cache_path, file_digest, load_cached, path_digest
+from gedcom_parser import load_gedcom, read_gedcom
+
+GEDCOM = "0 @I1@ INDI\n1 NAME John /Doe/\n1 BIRT\n2 DATE 01 JAN 1980\n"
+
+
+def counting_parser(calls):
+    def parse(filename):
+        calls.append(filename)
+        return read_gedcom(filename)
+    return parse
+
+
+def test_unchanged_file_is_loaded_from_snapshot(tmp_path):
+    path = tmp_path / "tree.ged"
+    path.write_text(GEDCOM)
+    cache_dir = str(tmp_path / "cache")
+    calls = []
+
+    first = load_cached(str(path), counting_parser(calls), cache_dir)
+    second = load_cached(str(path), counting_parser(calls), cache_dir)
+    assert len(calls) == 1
+    assert first == second
+    assert os.path.exists(cache_path(str(path), cache_dir))
+
+
+def test_changed_file_is_parsed_again(tmp_path):
+    path = tmp_path / "tree.ged"
+    path.write_text(GEDCOM)
+    cache_dir = str(tmp_path / "cache")
+    calls = []
+
+    load_cached(str(path), counting_parser(calls), cache_dir)
+    path.write_text(GEDCOM.replace("1980", "1981"))
+    individuals, families = load_cached(str(path), counting_parser(calls), cache_dir)
+    assert len(calls) == 2
+    assert individuals["@I1@"]["birth"] == "01 JAN 1981"
+
+
+def test_corrupt_snapshot_falls_back_to_parsing(tmp_path):
+    path = tmp_path / "tree.ged"
+    path.write_text(GEDCOM)
+    cache_dir = str(tmp_path / "cache")
+    load_gedcom(str(path), cache_dir)
+
+    with open(cache_path(str(path), cache_dir), "wb") as f:
+        f.write(b"GEDCACHE garbage")
+    individuals, families = load_gedcom(str(path), cache_dir)
+    assert individuals["@I1@"]["name"] == "John /Doe/"
+
+
+class Planted:
+    """Unpickling this writes the marker file, as a hostile snapshot could run anything."""
+
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (open, (self.marker, "w"))
+
+
+def test_planted_snapshot_is_never_unpickled(tmp_path):
+    path = tmp_path / "tree.ged"
+    path.write_text(GEDCOM)
+    cache_dir = str(tmp_path / "cache")
+    load_gedcom(str(path), cache_dir)
+
+    # A snapshot with a header matching the file, but not signed with this cache's key
+    marker = tmp_path / "unpickled"
+    body = pickle.dumps(Planted(str(marker)))
+    stat_result = os.stat(path)
+    header = HEADER.pack(CACHE_MAGIC, CACHE_VERSION, path_digest(str(path)), stat_result.st_mtime_ns,
+                         stat_result.st_size, file_digest(str(path)), bytes(32), len(body))
+    with open(cache_path(str(path), cache_dir), "wb") as f:
+        f.write(header + body)
+
+    individuals, families = load_gedcom(str(path), cache_dir)
+    assert individuals["@I1@"]["name"] == "John /Doe/"
+    assert not marker.exists()
+
+
+def test_default_cache_is_kept_outside_the_input_directory(tmp_path, monkeypatch):
+    inputs = tmp_path / "uploads"
+    inputs.mkdir()
+    path = inputs / "tree.ged"
+    path.write_text(GEDCOM)
+    monkeypatch.delenv("GEDCOM_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    calls = []
+
+    load_cached(str(path), counting_parser(calls))
+    load_cached(str(path), counting_parser(calls))
+    assert len(calls) == 1
+    assert [entry.name for entry in inputs.iterdir()] == ["tree.ged"]
+    assert os.path.dirname(cache_path(str(path))) == str(tmp_path / "xdg" / "gedcom")
+    assert stat.S_IMODE(os.stat(tmp_path / "xdg" / "gedcom" / "secret").st_mode) == 0o600
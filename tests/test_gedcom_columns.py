@@ -0,0 +1,75 @@
+import sys
+import os
+from datetime import date
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "sprint_1"))
+import gedcom_columns
+from gedcom_columns import (NO_DATE, child_edges, date_columns, format_ordinal, gather,
+                            in_row_order, where_after, where_within)
+from gedcom_dates import parse_gedcom_date
+from gedcom_symbols import NO_PERSON
+from us03 import us03_birth_before_death
+
+INDIVIDUALS = {
+    "@I1@": {"birth": "1 JAN 1950", "death": "1 JAN 1940"},
+    "@I2@": {"birth": None, "death": "5 MAY 1990"},
+    "@I3@": {"birth": "2 FEB 1980", "death": None}
+}
+FAMILIES = {
+    "@F1@": {"husb": "@I1@", "wife": "@I2@", "children": ["@I3@", "@I9@"], "married": "1 JAN 1970"},
+    "@F2@": {"husb": None, "wife": "@I3@", "children": [], "married": "bad date"}
+}
+
+
+def test_date_columns_are_ordinals_aligned_to_dense_numbers():
+    dense, dates = date_columns(INDIVIDUALS, FAMILIES, parse_gedcom_date)
+    assert list(dates["birth"]) == [date(1950, 1, 1).toordinal(), NO_DATE, date(1980, 2, 2).toordinal(), NO_DATE]
+    assert list(dates["married"]) == [date(1970, 1, 1).toordinal(), NO_DATE]
+    assert format_ordinal(dates["death"][1]) == "05 May 1990"
+
+
+def test_gather_reads_missing_people_as_no_date(backend):
+    dense, dates = date_columns(INDIVIDUALS, FAMILIES, parse_gedcom_date)
+    assert list(dense["husb"]) == [0, NO_PERSON]
+    assert list(gather(dates["birth"], dense["husb"])) == [date(1950, 1, 1).toordinal(), NO_DATE]
+
+
+def test_child_edges():
+    dense, dates = date_columns(INDIVIDUALS, FAMILIES, parse_gedcom_date)
+    families, children = child_edges(dense)
+    assert list(families) == [0, 0]
+    assert [dense["person_ids"][n] for n in children] == ["@I3@", "@I9@"]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Runs a test with NumPy columns (skipped when NumPy is missing) and with the plain array fallback."""
+    if request.param == "numpy":
+        monkeypatch.setattr(gedcom_columns, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(gedcom_columns, "np", None)
+    return request.param
+
+
+def test_masks_skip_unknown_dates(backend):
+    first = [10, 20, NO_DATE, 30]
+    second = [5, 25, 1, NO_DATE]
+    assert where_after(first, second) == [0]
+    assert where_after(first, second, 5) == []
+    assert where_within(first, second, 6) == [0, 1]
+
+
+def test_in_row_order_interleaves_rules_per_row():
+    assert in_row_order([2, 0], [0, 1]) == [(0, 0), (0, 1), (1, 1), (2, 0)]
+
+
+def test_date_columns_see_edits_between_calls():
+    individuals = {"@I1@": {"name": "John /Doe/", "birth": "1 JAN 1950", "death": "1 JAN 2000"}}
+    assert list(us03_birth_before_death(individuals, {})) == []
+
+    individuals["@I1@"]["death"] = "1 JAN 1940"
+    assert len(list(us03_birth_before_death(individuals, {}))) == 1
@@ -0,0 +1,47 @@
+import sys
+import os
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_dates import add_months, parse_gedcom_date, parse_iso_date, parse_any_date
+
+
+def test_parse_gedcom_date_fast_path():
+    assert parse_gedcom_date("15 MAY 1940") == datetime(1940, 5, 15)
+    assert parse_gedcom_date("5 MAR 1990") == datetime(1990, 3, 5)
+
+
+def test_parse_gedcom_date_matches_strptime_case_rules():
+    assert parse_gedcom_date("25 Dec 2020") == datetime(2020, 12, 25)
+    assert parse_gedcom_date("25 dec 2020") == datetime.strptime("25 dec 2020", "%d %b %Y")
+
+
+def test_parse_gedcom_date_invalid():
+    assert parse_gedcom_date("31 FEB 2000") is None
+    assert parse_gedcom_date("2020-06-14") is None
+    assert parse_gedcom_date("BAD_DATE") is None
+    assert parse_gedcom_date("") is None
+    assert parse_gedcom_date(None) is None
+
+
+def test_parse_gedcom_date_is_cached():
+    parse_gedcom_date.cache_clear()
+    parse_gedcom_date("01 JAN 2000")
+    parse_gedcom_date("01 JAN 2000")
+    assert parse_gedcom_date.cache_info().hits == 1
+
+
+def test_parse_iso_date():
+    assert parse_iso_date("2001-01-01") == datetime(2001, 1, 1)
+    assert parse_iso_date("2001-02-30") is None
+    assert parse_iso_date("01 JAN 2001") is None
+
+
+def test_parse_any_date_accepts_both_formats():
+    assert parse_any_date("2001-01-01") == parse_any_date("01 JAN 2001")
+
+
+def test_add_months_clamps_to_month_end():
+    assert add_months(datetime(2000, 5, 31), 9) == datetime(2001, 2, 28)
+    assert add_months(datetime(2003, 5, 31), 9) == datetime(2004, 2, 29)
+    assert add_months(datetime(2000, 1, 15), 12) == datetime(2001, 1, 15)
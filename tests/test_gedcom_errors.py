@@ -0,0 +1,84 @@
+import sys
+import os
+import csv
+import json
+import pickle
+import tempfile
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_errors import CheckError, error_rows, format_result, source_line, write_errors_csv, write_errors_jsonl
+from run_checks import run_checks
+
+
+GEDCOM = """0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE 01 JAN 1980
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Jane /Roe/
+1 SEX F
+1 BIRT
+2 DATE 01 JAN 1982
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 MARR
+2 DATE 01 JAN 1970
+"""
+
+TEMPLATE = "ERROR: US02: {values[0]} {ids[0]} birth date {dates[0]} in family {plain[1]}"
+
+
+def test_message_is_rendered_from_the_record():
+    error = CheckError("US02", TEMPLATE, ("@I1@", "@F1@"), (date(1980, 1, 1).toordinal(),), ("HUSB",), 4)
+    assert str(error) == "ERROR: US02: HUSB @I1@ birth date 01 Jan 1980 in family F1"
+    assert format_result(error) == error.message
+    assert error.as_dict() == {
+        "rule": "US02", "ids": ["@I1@", "@F1@"], "dates": ["1980-01-01"], "values": ["HUSB"],
+        "line": 4, "message": error.message
+    }
+    assert str(CheckError("US11", "{iso[0]}", (), error.dates)) == "1980-01-01"
+
+
+def test_records_compare_and_pickle_by_value():
+    error = CheckError("US04", "Error: {ids[0]}", ("@F1@",), line=12)
+    assert error == CheckError("US04", "Error: {ids[0]}", ("@F1@",), line=12)
+    assert pickle.loads(pickle.dumps(error)) == error
+    assert error.moved(3).line == 15 and error.line == 12
+    assert error != error.moved(1)
+
+
+def test_source_line_reads_date_and_header_lines():
+    individuals = {"@I1@": {"lines": (1,), "date_lines": {"birth": 5}}}
+    assert source_line(individuals, "@I1@", "birth") == 5
+    assert source_line(individuals, "@I1@") == 1
+    assert source_line(individuals, "@I1@", "death") is None
+    assert source_line(individuals, "@I9@", "birth") is None
+
+
+def test_sinks_write_every_result(tmp_path):
+    fd, path = tempfile.mkstemp(suffix=".ged")
+    with os.fdopen(fd, "w") as tmp:
+        tmp.write(GEDCOM)
+    entries, _ = run_checks(path, use_cache=False)
+    os.remove(path)
+
+    rows = list(error_rows(entries))
+    us02 = [row for row in rows if row["rule"] == "US02"]
+    assert [row["ids"] for row in us02] == [["@I1@", "@F1@"], ["@I2@", "@F1@"]]
+    assert [row["line"] for row in us02] == [5, 11]
+    assert us02[0]["dates"] == ["1980-01-01", "1970-01-01"]
+    assert len(rows) == sum(len(entry["results"]) for entry in entries)
+
+    jsonl, csv_path = tmp_path / "errors.jsonl", tmp_path / "errors.csv"
+    write_errors_jsonl(entries, str(jsonl))
+    write_errors_csv(entries, str(csv_path))
+    assert [json.loads(line) for line in jsonl.read_text().splitlines()] == rows
+    with open(csv_path, newline="") as f:
+        written = list(csv.DictReader(f))
+    assert [row["message"] for row in written] == [row["message"] for row in rows]
+    assert written[rows.index(us02[0])]["ids"] == "@I1@ @F1@"
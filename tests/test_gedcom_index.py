@@ -0,0 +1,63 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_index import build_ancestry_index, children_by_person, is_ancestor, parent_families_by_child
+
+
+def reaches(children, ancestor, person):
+    stack, visited = list(children.get(ancestor, [])), set()
+    while stack:
+        current = stack.pop()
+        if current == person:
+            return True
+        if current not in visited:
+            visited.add(current)
+            stack.extend(children.get(current, []))
+    return False
+
+
+def test_pedigree_collapse_matches_walk():
+    # Cousins I5 and I6 marry; their child I7 descends from I1 along two paths
+    children = {
+        "I1": ["I2", "I3"], "I2": ["I5"], "I3": ["I6"], "I4": ["I6"],
+        "I5": ["I7"], "I6": ["I7"], "I7": [], "I8": []
+    }
+    index = build_ancestry_index(children)
+    assert index["acyclic"]
+    for ancestor in children:
+        for person in children:
+            expected = ancestor != person and reaches(children, ancestor, person)
+            assert is_ancestor(index, ancestor, person) == expected
+
+
+def test_cycle_disables_filter_but_stays_correct():
+    children = {"I1": ["I2"], "I2": ["I3"], "I3": ["I1"], "I4": ["I1"]}
+    index = build_ancestry_index(children)
+    assert not index["acyclic"]
+    assert is_ancestor(index, "I2", "I1")
+    assert is_ancestor(index, "I4", "I3")
+    assert not is_ancestor(index, "I1", "I4")
+
+
+def test_deep_line_does_not_recurse():
+    children = {i: [i + 1] for i in range(20000)}
+    index = build_ancestry_index(children)
+    assert is_ancestor(index, 0, 20000)
+    assert not is_ancestor(index, 20000, 0)
+
+
+def test_children_by_person_from_model():
+    individuals = {"@I1@": {}, "@I2@": {}, "@I3@": {}}
+    families = {"@F1@": {"husb": "@I1@", "wife": "@I2@", "children": ["@I3@"]}}
+    children = children_by_person(individuals, families)
+    assert children == {"@I1@": ["@I3@"], "@I2@": ["@I3@"], "@I3@": []}
+
+
+
+def test_parent_families_by_child():
+    families = {
+        "@F1@": {"husb": "@I1@", "wife": "@I2@", "children": ["@I3@", "@I4@"]},
+        "@F2@": {"husb": None, "wife": "@I5@", "children": ["@I3@"]}
+    }
+    assert parent_families_by_child(families) == {"@I3@": ["@F1@", "@F2@"], "@I4@": ["@F1@"]}
@@ -0,0 +1,81 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_mmap import iter_mmap_records, read_gedcom_mmap, record_spans
+from gedcom_parser import iter_gedcom_records, read_gedcom, tokenize_gedcom_bytes
+
+GEDCOM = (
+    "stray line\n"
+    "0 HEAD\n1 SOUR test\n"
+    "0 @I1@ INDI\n1 NAME John /Doe/\n1 SEX M\n1 BIRT\n2 DATE 01 JAN 1980\n1 FAMS @F1@\n"
+    "0 @N1@ NOTE A long note\n1 CONT that nobody reads\n"
+    "0 @I2@ INDI\r\n1 NAME Jane /Roe/\r\n1 BURI\r\n2 DATE 5 MAY 2020\r\n1 FAMS @F1@\r\n"
+    "0 @F1@ FAM\n1 HUSB @I1@\n1 WIFE @I2@\n1 MARR\n2 DATE 03 MAR 2000\n"
+    "0 @I1@ INDI\n1 SEX F\n"
+    "0 TRLR\n"
+)
+
+
+def write(tmp_path, contents):
+    path = tmp_path / "tree.ged"
+    path.write_bytes(contents.encode())
+    return str(path)
+
+
+def test_record_spans_find_level_0_headers():
+    data = b"0 HEAD\n1 X\n0 @I1@ INDI\n0 TRLR\n"
+    assert record_spans(data) == [(0, 11), (11, 23), (23, 30)]
+    assert record_spans(b"junk\n0 TRLR") == [(5, 11)]
+
+
+def test_record_spans_read_level_0_lines_like_the_parser():
+    # Indented headers, a lone '\r' line break and a bare '0' line all start
+    # records; '0\t@N1@' is not level 0, since the parser splits on spaces only
+    data = b"  0 HEAD\n\t0 @I1@ INDI\r0 @I2@ INDI\r\n0\n1 X\n0\t@N1@ NOTE\n\xc2\xa00 TRLR"
+    starts = [start for start, stop in record_spans(data)]
+    assert starts == [0, 9, 22, 35, 53]
+    levels = [token[:2] for token in tokenize_gedcom_bytes(data)]
+    assert [line_no for line_no, level in levels if level == "0"] == [1, 2, 3, 4, 7]
+
+
+def test_mmap_reader_finds_indented_records(tmp_path):
+    contents = "0 HEAD\n  0 @I1@ INDI\n1 SEX M\r\t0 @I2@ INDI\r\n1 SEX F\n0\n  0 @F1@ FAM \n1 HUSB @I1@\n"
+    path = write(tmp_path, contents)
+    individuals, families = read_gedcom_mmap(path)
+
+    assert (individuals, families) == read_gedcom(path)
+    assert set(individuals) == {"@I1@", "@I2@"}
+    assert families["@F1@"]["lines"] == (7,)
+    expected = [record for record in iter_gedcom_records(path) if record[0][2] in ("INDI", "FAM")]
+    assert list(iter_mmap_records(path)) == expected
+
+
+def test_mmap_reader_builds_same_model(tmp_path):
+    path = write(tmp_path, GEDCOM)
+    expected = read_gedcom(path)
+    individuals, families = read_gedcom_mmap(path)
+
+    assert (individuals, families) == expected
+    assert individuals["@I1@"]["lines"] == (4, 22)
+    assert individuals["@I2@"]["date_lines"] == {}
+    assert families["@F1@"]["date_lines"] == expected[1]["@F1@"]["date_lines"]
+
+
+def test_mmap_records_keep_file_line_numbers(tmp_path):
+    path = write(tmp_path, GEDCOM)
+    expected = [record for record in iter_gedcom_records(path) if record[0][2] in ("INDI", "FAM")]
+    assert list(iter_mmap_records(path)) == expected
+
+
+def test_mmap_records_of_some_spans(tmp_path):
+    path = write(tmp_path, GEDCOM)
+    with open(path, "rb") as f:
+        spans = record_spans(f.read())
+
+    records = list(iter_mmap_records(path, spans[4:5]))
+    assert [record[0] for record in records] == [(17, "0", "FAM", "@F1@")]
+
+
+def test_empty_file(tmp_path):
+    assert read_gedcom_mmap(write(tmp_path, "")) == ({}, {})
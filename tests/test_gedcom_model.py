@@ -0,0 +1,46 @@
+import sys
+import os
+import pickle
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_model import Family, Individual
+
+
+def test_individual_reads_like_a_dict():
+    indi = Individual("@I1@")
+    indi["name"] = "John /Doe/"
+    indi.birth = "01 JAN 1980"
+    indi.birth_line = 4
+
+    assert indi["name"] == "John /Doe/"
+    assert indi.get("birth") == "01 JAN 1980"
+    assert indi.get("death") is None
+    assert indi.get("missing", "default") == "default"
+    assert "famc" in indi and "missing" not in indi
+    assert indi["date_lines"] == {"birth": 4}
+    assert not hasattr(indi, "__dict__")
+
+
+def test_record_equals_matching_dict():
+    fam = Family("@F1@")
+    fam.husb = "@I1@"
+    fam.children = ("@I3@",)
+    assert fam == {"id": "@F1@", "husb": "@I1@", "wife": None, "children": ("@I3@",),
+                   "married": None, "divorced": None, "lines": (), "date_lines": {}}
+
+
+def test_unknown_key_raises_key_error():
+    try:
+        Individual("@I1@")["missing"]
+    except KeyError:
+        pass
+    else:
+        assert False
+
+
+def test_records_pickle_round_trip():
+    fam = Family("@F1@")
+    fam.date_lines = {"married": 12}
+    copy = pickle.loads(pickle.dumps(fam, protocol=pickle.HIGHEST_PROTOCOL))
+    assert copy == fam
+    assert copy.married_line == 12
@@ -0,0 +1,85 @@
+import pickle
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_offsets import build_offset_index, fetch_record, index_path, load_offset_index
+from gedcom_parser import read_gedcom
+
+GEDCOM = (
+    "0 HEAD\n"
+    "0 @I1@ INDI\n1 NAME John /Doe/\n1 BIRT\n2 DATE 01 JAN 1980\n1 FAMS @F1@\n"
+    "0 @N1@ NOTE skipped\n1 CONT text\n"
+    "0 @I2@ INDI\n1 NAME Jane /Roe/\n1 FAMS @F1@\n"
+    "0 @F1@ FAM\n1 HUSB @I1@\n1 WIFE @I2@\n1 MARR\n2 DATE 03 MAR 2000\n"
+    "0 TRLR\n"
+)
+
+
+def write(tmp_path, contents):
+    path = tmp_path / "tree.ged"
+    path.write_bytes(contents.encode())
+    return str(path)
+
+
+def test_index_maps_xrefs_to_byte_ranges(tmp_path):
+    path = write(tmp_path, GEDCOM)
+    index = build_offset_index(path)
+
+    assert set(index) == {"@I1@", "@I2@", "@F1@"}
+    tag, offset, length, line_no = index["@I2@"]
+    assert (tag, line_no) == ("INDI", 9)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        assert f.read(length) == b"0 @I2@ INDI\n1 NAME Jane /Roe/\n1 FAMS @F1@\n"
+
+
+def test_fetch_record_matches_full_parse(tmp_path):
+    path = write(tmp_path, GEDCOM)
+    individuals, families = read_gedcom(path)
+
+    assert fetch_record(path, "@I1@") == individuals["@I1@"]
+    assert fetch_record(path, "@F1@") == families["@F1@"]
+    assert fetch_record(path, "@F1@")["date_lines"] == {"married": 16}
+    assert fetch_record(path, "@N1@") is None
+
+
+def test_sidecar_is_reused_until_the_file_changes(tmp_path):
+    path = write(tmp_path, GEDCOM)
+    index = load_offset_index(path)
+    assert os.path.exists(index_path(path))
+    assert load_offset_index(path) == index
+
+    path = write(tmp_path, "0 @I9@ INDI\n1 NAME New /Person/\n")
+    assert set(load_offset_index(path)) == {"@I9@"}
+
+
+def test_sidecar_never_runs_code(tmp_path):
+    path = write(tmp_path, GEDCOM)
+    index = load_offset_index(path)
+    with open(index_path(path), "rb") as f:
+        header = f.read(10)
+    marker = tmp_path / "planted"
+    payload = pickle.dumps(Planted(str(marker)))
+    with open(index_path(path), "wb") as f:
+        f.write(header + payload)
+
+    assert load_offset_index(path) == index
+    assert not marker.exists()
+
+
+class Planted:
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (open, (self.marker, "w"))
+
+def test_index_finds_indented_records(tmp_path):
+    path = write(tmp_path, "0 HEAD\n  0 @I1@ INDI\n1 SEX M\r\t0 @F1@ FAM\r\n1 HUSB @I1@\n0 TRLR\n")
+    individuals, families = read_gedcom(path)
+    index = build_offset_index(path)
+
+    assert {xref: entry[3] for xref, entry in index.items()} == {"@I1@": 2, "@F1@": 4}
+    assert fetch_record(path, "@I1@", index) == individuals["@I1@"]
+    assert fetch_record(path, "@F1@", index) == families["@F1@"]
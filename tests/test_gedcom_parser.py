@@ -0,0 +1,176 @@
+import io
+import sys
+import os
+import tempfile
+import tracemalloc
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "benchmarks"))
+from generate_gedcom import generate_gedcom
+import gedcom_parser
+from gedcom_parser import (iter_gedcom_records, load_gedcom, read_gedcom, source_chunks, tokenize_gedcom,
+                           tokenize_gedcom_bytes, tokenize_gedcom_chunks)
+
+
+def write_gedcom_file(contents):
+    fd, path = tempfile.mkstemp(suffix=".ged")
+    with os.fdopen(fd, "w") as tmp:
+        tmp.write(contents)
+    return path
+
+
+SAMPLE = """0 HEAD
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE 01 JAN 1980
+1 FAMS @F1@
+
+0 @I2@ INDI
+1 NAME Jane /Roe/
+1 SEX F
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 MARR
+2 DATE 03 MAR 2000
+0 TRLR
+"""
+
+
+def test_iter_gedcom_records_yields_one_record_per_header():
+    path = write_gedcom_file(SAMPLE)
+    records = list(iter_gedcom_records(path))
+    os.remove(path)
+
+    assert [record[0][2] for record in records] == ["HEAD", "INDI", "INDI", "FAM", "TRLR"]
+    assert records[1][0] == (2, "0", "INDI", "@I1@")
+    assert records[1][-1] == (7, "1", "FAMS", "@F1@")
+    assert len(records[2]) == 4
+
+
+def test_iter_gedcom_records_is_lazy():
+    path = write_gedcom_file(SAMPLE)
+    records = iter_gedcom_records(path)
+    first = next(records)
+    records.close()
+    os.remove(path)
+
+    assert first == [(1, "0", "HEAD", "")]
+
+
+def test_read_gedcom_builds_model():
+    path = write_gedcom_file(SAMPLE)
+    individuals, families = read_gedcom(path)
+    os.remove(path)
+
+    assert individuals["@I1@"]["birth"] == "01 JAN 1980"
+    assert individuals["@I1@"]["date_lines"] == {"birth": 6}
+    assert individuals["@I2@"]["sex"] == "F"
+    assert families["@F1@"]["husb"] == "@I1@"
+    assert families["@F1@"]["married"] == "03 MAR 2000"
+
+
+def test_read_gedcom_keeps_lines_of_duplicate_ids():
+    path = write_gedcom_file("0 @I1@ INDI\n1 SEX M\n0 @I1@ INDI\n1 SEX F\n")
+    individuals, families = read_gedcom(path)
+    os.remove(path)
+
+    assert individuals["@I1@"]["sex"] == "F"
+    assert individuals["@I1@"]["lines"] == (1, 3)
+
+
+def test_read_gedcom_accepts_in_memory_sources():
+    path = write_gedcom_file(SAMPLE)
+    expected = read_gedcom(path)
+    os.remove(path)
+
+    data = SAMPLE.encode()
+    for source in (SAMPLE, data, bytearray(data), memoryview(data), io.BytesIO(data), io.StringIO(SAMPLE)):
+        individuals, families = read_gedcom(source)
+        assert individuals == expected[0]
+        assert families == expected[1]
+
+
+def test_one_line_text_is_not_taken_for_a_path(tmp_path, monkeypatch):
+    individuals, families = read_gedcom("0 @I1@ INDI")
+    assert list(individuals) == ["@I1@"]
+    assert read_gedcom("0 HEAD") == ({}, {})
+
+    # An existing file is still read, even with a name like a GEDCOM line
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "2024 tree.ged").write_text(SAMPLE)
+    assert read_gedcom("2024 tree.ged") == read_gedcom(SAMPLE)
+    with pytest.raises(FileNotFoundError):
+        read_gedcom("missing.ged")
+def test_read_gedcom_returns_a_parsed_model_as_is():
+    model = read_gedcom(SAMPLE)
+    assert read_gedcom(model) is model
+    assert load_gedcom(model) is model
+
+
+def test_load_gedcom_does_not_cache_in_memory_sources(tmp_path, monkeypatch):
+    monkeypatch.setenv("GEDCOM_CACHE_DIR", str(tmp_path))
+    individuals, families = load_gedcom(SAMPLE.encode())
+
+    assert list(families) == ["@F1@"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_tokenize_gedcom_bytes_matches_tokenize_gedcom():
+    contents = (
+        SAMPLE
+        + "  1 NAME  Two  Spaces  \n"
+        + "0\n"
+        + "1 BIRT\r\n"
+        + "2 DATE 1 JAN 1990\r\n"
+        + "0 @F2@ FAM extra\n"
+        + "0 @N1@ NOTE text\n"
+        + "\t\n"
+        + "3 _CUSTOM value"
+    )
+    expected = list(tokenize_gedcom(io.StringIO(contents, newline=None)))
+
+    assert list(tokenize_gedcom_bytes(contents.encode())) == expected
+    assert list(tokenize_gedcom_bytes(contents)) == expected
+
+
+def test_tokenize_gedcom_bytes_decodes_large_buffers_in_blocks(monkeypatch):
+    contents = SAMPLE.replace("\n", "\r\n").replace("0 TRLR", "1 NOTE old\r0 TRLR")
+    expected = list(tokenize_gedcom(io.StringIO(contents, newline=None)))
+
+    for size in (1, 2, 7, 64):
+        monkeypatch.setattr(gedcom_parser, "BLOCK_SIZE", size)
+        assert list(tokenize_gedcom_bytes(contents.encode())) == expected
+        assert list(tokenize_gedcom_bytes(memoryview(contents.encode()))) == expected
+
+
+def test_tokenize_gedcom_chunks_matches_whole_buffer():
+    contents = SAMPLE.replace("1 SEX F\n", "1 SEX F\r\n").replace("0 TRLR", "1 NOTE old\r0 TRLR")
+    expected = list(tokenize_gedcom(io.StringIO(contents, newline=None)))
+
+    for data in (contents, contents.encode()):
+        for size in (1, 2, 7, 64, len(contents)):
+            assert list(tokenize_gedcom_chunks(source_chunks(data, size))) == expected
+
+
+def test_iter_gedcom_records_streams_in_bounded_memory(tmp_path):
+    path = tmp_path / "large.ged"
+    with open(path, "w") as f:
+        generate_gedcom(f, individuals=20000, generations=8)
+    assert os.path.getsize(path) > 2_000_000
+
+    tracemalloc.start()
+    try:
+        records = sum(1 for _ in iter_gedcom_records(str(path)))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert records > 20000
+    # One chunk and one record at a time, not the whole file
+    assert peak < 1_000_000
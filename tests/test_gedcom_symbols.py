@@ -0,0 +1,58 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_symbols import NO_PERSON, build_dense_model, dense_model, linked, shared_tables
+
+INDIVIDUALS = {
+    "@I1@": {"fams": ["@F1@"]},
+    "@I2@": {"fams": ["@F1@"]},
+    "@I3@": {"famc": ["@F1@"], "fams": ["@F9@"]}
+}
+FAMILIES = {
+    "@F1@": {"husb": "@I1@", "wife": "@I2@", "children": ["@I3@", "@I7@"]},
+    "@F2@": {"husb": None, "wife": "@I3@", "children": []}
+}
+
+
+def test_ids_are_numbered_in_model_order():
+    dense = build_dense_model(INDIVIDUALS, FAMILIES)
+    assert dense["person_ids"][:3] == ["@I1@", "@I2@", "@I3@"]
+    assert dense["family_index"] == {"@F1@": 0, "@F2@": 1, "@F9@": 2}
+    assert list(dense["husb"]) == [0, NO_PERSON]
+    assert list(dense["wife"]) == [1, 2]
+
+
+def test_links_are_integer_arrays():
+    dense = build_dense_model(INDIVIDUALS, FAMILIES)
+    assert list(linked(dense["children"], 0)) == [2, 3]
+    assert list(linked(dense["children"], 1)) == []
+    assert list(linked(dense["famc"], 2)) == [0]
+    assert list(linked(dense["fams"], 2)) == [2]
+
+
+def test_dangling_references_are_numbered_after_real_records():
+    dense = build_dense_model(INDIVIDUALS, FAMILIES)
+    assert dense["person_count"] == 3
+    assert dense["person_ids"][3] == "@I7@"
+    assert dense["family_count"] == 2
+    assert dense["family_ids"][2] == "@F9@"
+
+
+def test_dense_model_is_shared_only_while_a_run_shares_it():
+    with shared_tables(INDIVIDUALS, FAMILIES):
+        first = dense_model(INDIVIDUALS, FAMILIES)
+        assert dense_model(INDIVIDUALS, FAMILIES) is first
+        assert dense_model(dict(INDIVIDUALS), FAMILIES) is not first
+    assert dense_model(INDIVIDUALS, FAMILIES) is not first
+
+
+def test_dense_model_sees_edits_between_calls():
+    families = {fam_id: dict(fam) for fam_id, fam in FAMILIES.items()}
+    assert dense_model(INDIVIDUALS, families)["husb"][1] == NO_PERSON
+
+    families["@F2@"]["husb"] = "@I1@"
+    families["@F2@"]["children"] = ["@I2@"]
+    dense = dense_model(INDIVIDUALS, families)
+    assert dense["husb"][1] == 0
+    assert list(linked(dense["children"], 1)) == [1]
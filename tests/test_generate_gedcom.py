@@ -0,0 +1,66 @@
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "benchmarks"))
+from generate_gedcom import generate_gedcom, parse_errors, shortfalls
+from gedcom_parser import read_gedcom
+from run_checks import discover_checks, run_check
+
+# Listing stories report every matching record rather than errors
+LISTINGS = {"US27", "US28", "US29", "US30", "US33", "US34"}
+
+
+def generate(tmp_path, **options):
+    path = tmp_path / "synthetic.ged"
+    with open(path, "w") as out:
+        injected = generate_gedcom(out, **options)
+    return str(path), injected
+
+
+def findings(path):
+    individuals, families = read_gedcom(path)
+    counts = {}
+    for story, check_path, func_name in discover_checks():
+        if func_name and story not in LISTINGS:
+            results, seconds, failure = run_check(individuals, families, check_path, func_name)
+            if not failure:
+                counts[story] = len(results)
+    return counts
+
+
+def test_generator_is_deterministic():
+    first, second = io.StringIO(), io.StringIO()
+    generate_gedcom(first, individuals=300, seed=7)
+    generate_gedcom(second, individuals=300, seed=7)
+    assert first.getvalue() == second.getvalue()
+
+
+def test_generated_tree_is_clean(tmp_path):
+    path, injected = generate(tmp_path, individuals=2000, generations=6, collapse_rate=0)
+    individuals, families = read_gedcom(path)
+
+    assert injected == {}
+    assert 1500 < len(individuals) <= 2000
+    assert families
+    assert set(findings(path).values()) == {0}
+
+
+def test_injected_errors_are_found(tmp_path):
+    errors = parse_errors(["US03=2", "US04", "US13=2", "US18", "US19", "US21", "US26"])
+    path, injected = generate(tmp_path, individuals=3000, generations=6, collapse_rate=0, errors=errors)
+    counts = findings(path)
+
+    assert injected == errors
+    for rule, count in errors.items():
+        assert counts[rule] == count
+
+
+def test_shortfalls_name_rules_the_tree_was_too_small_for():
+    errors = parse_errors(["US07=3", "US10=3", "US11=3"])
+    injected = generate_gedcom(io.StringIO(), individuals=30, generations=2, errors=errors)
+
+    assert shortfalls(errors, injected) == {"US10": (0, 3), "US11": (0, 3)}
+    assert shortfalls(errors, errors) == {}
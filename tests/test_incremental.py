@@ -0,0 +1,147 @@
+import sys
+import os
+import pickle
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from incremental import changed_records, default_state_path, model_digests, run_incremental
+from run_checks import run_checks
+from gedcom_parser import read_gedcom
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(BASE_DIR, "M2B3_containsErrors.ged")
+
+
+def results_by_story(entries):
+    return {entry["story"]: sorted(map(str, entry["results"])) for entry in entries}
+
+
+def edit_copy(tmp_path, edit):
+    with open(SAMPLE) as f:
+        lines = f.read().split("\n")
+    edit(lines)
+    path = tmp_path / "edited.ged"
+    path.write_text("\n".join(lines))
+    return str(path)
+
+
+def test_first_run_checks_everything(tmp_path):
+    state = str(tmp_path / "state.pkl")
+    entries, parse_seconds, affected = run_incremental(SAMPLE, state)
+    assert affected is None
+    assert os.path.exists(state)
+    assert results_by_story(entries) == results_by_story(run_checks(SAMPLE)[0])
+
+
+def test_edit_rechecks_only_relatives_and_matches_full_run(tmp_path):
+    state = str(tmp_path / "state.pkl")
+    run_incremental(SAMPLE, state)
+
+    def move_first_birth(lines):
+        birth = lines.index("1 BIRT")
+        lines[birth + 1] = "2 DATE 1 JAN 2090"
+
+    edited = edit_copy(tmp_path, move_first_birth)
+    entries, parse_seconds, affected = run_incremental(edited, state)
+
+    assert "I01" in affected
+    assert len(affected) < len(model_digests(*read_gedcom(edited)))
+    assert results_by_story(entries) == results_by_story(run_checks(edited)[0])
+
+
+def test_edit_of_child_without_famc_rechecks_its_family(tmp_path):
+    state = str(tmp_path / "state.pkl")
+    path = tmp_path / "one_way.ged"
+    # The family lists the child, but the child does not point back with FAMC
+    path.write_text(
+        "0 @I1@ INDI\n1 SEX M\n1 BIRT\n2 DATE 1 JAN 1950\n1 FAMS @F1@\n"
+        "0 @I2@ INDI\n1 SEX F\n1 BIRT\n2 DATE 1 JAN 1952\n1 DEAT\n2 DATE 1 JAN 2000\n1 FAMS @F1@\n"
+        "0 @I3@ INDI\n1 SEX M\n1 BIRT\n2 DATE 1 JAN 1980\n"
+        "0 @F1@ FAM\n1 HUSB @I1@\n1 WIFE @I2@\n1 CHIL @I3@\n"
+    )
+    run_incremental(str(path), state)
+    path.write_text(path.read_text().replace("2 DATE 1 JAN 1980", "2 DATE 1 JAN 2001"))
+    entries, parse_seconds, affected = run_incremental(str(path), state)
+
+    assert "@F1@" in affected
+    assert results_by_story(entries) == results_by_story(run_checks(str(path))[0])
+    assert results_by_story(entries)["US09"]
+
+
+def test_removed_family_is_rechecked(tmp_path):
+    state = str(tmp_path / "state.pkl")
+    run_incremental(SAMPLE, state)
+
+    def drop_last_family(lines):
+        start = max(i for i, line in enumerate(lines) if line.endswith(" FAM"))
+        end = next(i for i in range(start + 1, len(lines)) if lines[i].startswith("0 "))
+        del lines[start:end]
+
+    edited = edit_copy(tmp_path, drop_last_family)
+    entries, parse_seconds, affected = run_incremental(edited, state)
+    assert results_by_story(entries) == results_by_story(run_checks(edited)[0])
+
+
+def test_changed_records_ignores_line_numbers():
+    old = {"@I1@": {"id": "@I1@", "sex": "M", "lines": [1], "date_lines": {}}}
+    new = {"@I1@": {"id": "@I1@", "sex": "M", "lines": [7], "date_lines": {}},
+           "@I2@": {"id": "@I2@", "sex": "F", "lines": [9], "date_lines": {}}}
+    assert changed_records(model_digests(old, {}), model_digests(new, {})) == {"@I2@"}
+
+
+def test_kept_errors_follow_their_lines(tmp_path):
+    state = str(tmp_path / "state.pkl")
+    run_incremental(SAMPLE, state)
+
+    def insert_note(lines):
+        lines.insert(0, "0 NOTE moved everything down")
+
+    edited = edit_copy(tmp_path, insert_note)
+    entries, parse_seconds, affected = run_incremental(edited, state)
+
+    def lines_by_story(entries):
+        return {entry["story"]: [getattr(result, "line", None) for result in entry["results"]] for entry in entries}
+
+    assert not affected
+    assert lines_by_story(entries) == lines_by_story(run_checks(edited)[0])
+
+
+def test_new_reference_date_rechecks_everything(tmp_path):
+    state = str(tmp_path / "state.pkl")
+    before, _, _ = run_incremental(SAMPLE, state, reference=date(2000, 1, 1))
+    entries, parse_seconds, affected = run_incremental(SAMPLE, state, reference=date(2030, 1, 1))
+    fresh, _, _ = run_incremental(SAMPLE, str(tmp_path / "fresh.pkl"), reference=date(2030, 1, 1))
+
+    assert affected is None
+    assert results_by_story(entries) == results_by_story(fresh)
+    # Current ages moved on with the reference date
+    assert results_by_story(entries)["US27"] != results_by_story(before)["US27"]
+
+
+class Planted:
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (open, (self.marker, "w"))
+
+
+def test_planted_state_is_never_unpickled(tmp_path):
+    state = tmp_path / "state.pkl"
+    marker = tmp_path / "planted"
+    state.write_bytes(pickle.dumps(Planted(str(marker))))
+
+    entries, parse_seconds, affected = run_incremental(SAMPLE, str(state), use_cache=False)
+    assert affected is None
+    assert not marker.exists()
+
+
+def test_default_state_is_kept_in_the_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("GEDCOM_CACHE_DIR", str(tmp_path / "cache"))
+    path = default_state_path(SAMPLE)
+    assert os.path.dirname(path) == str(tmp_path / "cache")
+
+    run_incremental(SAMPLE, use_cache=False)
+    assert os.path.exists(path)
+    entries, parse_seconds, affected = run_incremental(SAMPLE, use_cache=False)
+    assert affected == set()
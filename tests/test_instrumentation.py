@@ -0,0 +1,99 @@
+import sys
+import os
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from instrumentation import CountingRecords, counting_model, format_stats_table, instrument, write_stats_json
+from run_checks import run_checks
+
+
+GEDCOM = """0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE 01 JAN 1980
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Jane /Roe/
+1 SEX F
+1 BIRT
+2 DATE 01 JAN 1982
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 MARR
+2 DATE 01 JAN 1970
+"""
+
+
+def lookup_husbands(individuals, families):
+    for fam in families.values():
+        yield individuals.get(fam["husband_id"])["name"]
+
+
+def test_counting_records_counts_lookups_and_passes():
+    records = CountingRecords({"I1": 1, "I2": 2})
+    records.get("I1")
+    records["I2"]
+    list(records.values())
+    assert "I1" in records
+    assert records.visits == 4
+
+
+def test_instrument_records_stats_and_materializes_generators():
+    report = []
+    individuals, families = counting_model(
+        {"I1": {"name": "John /Doe/"}}, {"F1": {"husband_id": "I1"}})
+    check = instrument(lookup_husbands, report)
+
+    assert check(individuals, families) == ["John /Doe/"]
+    assert check.__name__ == "lookup_husbands"
+    stats, = report
+    assert stats["check"] == "lookup_husbands"
+    assert stats["records_visited"] == 2
+    assert stats["wall_seconds"] >= 0 and stats["cpu_seconds"] >= 0
+    assert stats["peak_alloc_bytes"] >= 0
+
+
+def test_instrument_reports_failing_checks():
+    report = []
+
+    def broken(individuals, families):
+        raise KeyError("husband_id")
+
+    try:
+        instrument(broken, report)({}, {})
+    except KeyError:
+        pass
+    assert report[0]["check"] == "broken"
+    assert report[0]["records_visited"] is None
+
+
+def test_instrumented_run_matches_plain_run(tmp_path):
+    fd, path = tempfile.mkstemp(suffix=".ged")
+    with os.fdopen(fd, "w") as tmp:
+        tmp.write(GEDCOM)
+    plain, _ = run_checks(path, use_cache=False)
+    instrumented, parse_seconds = run_checks(path, use_cache=False, instrumented=True)
+    parallel, _ = run_checks(path, workers=2, use_cache=False, instrumented=True)
+    os.remove(path)
+
+    assert [e["results"] for e in plain] == [e["results"] for e in instrumented]
+    for entries in (instrumented, parallel):
+        for entry in entries:
+            if entry["check"] is not None and entry["failure"] is None:
+                assert entry["stats"]["check"] == entry["check"]
+                assert entry["stats"]["records_visited"] is not None
+
+    table = format_stats_table(instrumented)
+    assert table.splitlines()[0].split() == ["story", "check", "wall", "ms", "cpu", "ms", "peak", "KB", "visited"]
+    assert "us02_birth_before_marriage" in table
+
+    output = tmp_path / "stats.json"
+    write_stats_json(instrumented, parse_seconds, "sample.ged", str(output))
+    stats = json.loads(output.read_text())
+    assert stats["gedcom_file"] == "sample.ged"
+    us02 = next(check for check in stats["checks"] if check["story"] == "US02")
+    assert us02["results"] > 0 and us02["records_visited"] > 0
@@ -0,0 +1,43 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kinship import (FIRST_COUSINS, SECOND_COUSINS, SIBLINGS, UNCLE_OR_AUNT,
+                     build_kinship_index, couple_kinships, couples_related_as,
+                     kinship_degrees, lowest_common_ancestors)
+
+
+def family(husb, wife, children=()):
+    return {"husb": husb, "wife": wife, "children": list(children)}
+
+
+# I1+I2 -> I3, I4; I3+I5 -> I6; I4+I7 -> I8; I6+I9 -> I10; I8+I11 -> I12
+FAMILIES = {
+    "F1": family("I1", "I2", ["I3", "I4"]),
+    "F2": family("I3", "I5", ["I6"]),
+    "F3": family("I4", "I7", ["I8"]),
+    "F4": family("I6", "I9", ["I10"]),
+    "F5": family("I8", "I11", ["I12"])
+}
+
+
+def test_lowest_common_ancestors_skip_higher_generations():
+    parents = build_kinship_index(FAMILIES)
+    assert lowest_common_ancestors(parents, "I3", "I4") == {"I1": SIBLINGS, "I2": SIBLINGS}
+    assert kinship_degrees(parents, "I6", "I8") == {FIRST_COUSINS}
+    assert kinship_degrees(parents, "I4", "I6") == {UNCLE_OR_AUNT}
+    assert kinship_degrees(parents, "I10", "I12") == {SECOND_COUSINS}
+    assert kinship_degrees(parents, "I5", "I7") == set()
+
+
+def test_children_of_a_family_without_parents_are_siblings():
+    families = {"F1": family(None, None, ["I1", "I2"]), "F2": family("I1", "I2")}
+    assert list(couples_related_as(families, SIBLINGS)) == [("F2", "I1", "I2")]
+
+
+def test_couple_kinships_batch():
+    families = dict(FAMILIES)
+    families["F6"] = family("I10", "I12")
+    families["F7"] = family("I4", "I6")
+    related = {fam_id: degrees for fam_id, husb, wife, degrees in couple_kinships(families)}
+    assert related == {"F6": {SECOND_COUSINS}, "F7": {UNCLE_OR_AUNT}}
@@ -0,0 +1,147 @@
+import sys
+import os
+import re
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gedcom_errors import write_errors_jsonl
+from run_checks import discover_checks, run_checks, stream_check, stream_run, write_report
+
+
+def write_gedcom_file(contents):
+    fd, path = tempfile.mkstemp(suffix=".ged")
+    with os.fdopen(fd, "w") as tmp:
+        tmp.write(contents)
+    return path
+
+
+GEDCOM = """0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX F
+1 BIRT
+2 DATE 01 JAN 1980
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Jane /Roe/
+1 SEX F
+1 BIRT
+2 DATE 01 JAN 1982
+1 FAMS @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 MARR
+2 DATE 01 JAN 1970
+"""
+
+
+def test_discover_checks_covers_every_sprint():
+    stories = [story for story, path, name in discover_checks()]
+    assert stories == sorted(stories)
+    for story in ["US01", "US11", "US21", "US33"]:
+        assert story in stories
+
+
+def test_run_checks_parses_once_and_reports_errors():
+    path = write_gedcom_file(GEDCOM)
+    entries, parse_seconds = run_checks(path)
+    os.remove(path)
+
+    by_story = {entry["story"]: entry for entry in entries}
+    assert [error.rule for error in by_story["US02"]["results"]] == ["US02", "US02"]
+    assert any("not male" in result.message for result in by_story["US21"]["results"])
+    assert by_story["US22"]["results"] == []
+    assert all(entry["seconds"] >= 0 for entry in entries)
+
+
+def test_run_checks_with_workers_matches_serial_run():
+    path = write_gedcom_file(GEDCOM)
+    serial, _ = run_checks(path)
+    parallel, _ = run_checks(path, workers=2)
+    os.remove(path)
+
+    assert [e["results"] for e in serial] == [e["results"] for e in parallel]
+
+
+def test_run_checks_with_mmap_reader_matches_parsed_run():
+    path = write_gedcom_file("0 HEAD\n0 @N1@ NOTE skipped\n1 CONT text\n" + GEDCOM + "0 TRLR\n")
+    parsed, _ = run_checks(path, use_cache=False)
+    mapped, _ = run_checks(path, use_cache=False, use_mmap=True)
+    os.remove(path)
+
+    assert [entry["results"] for entry in mapped] == [entry["results"] for entry in parsed]
+
+
+def test_write_report(tmp_path):
+    path = write_gedcom_file(GEDCOM)
+    entries, parse_seconds = run_checks(path)
+    os.remove(path)
+
+    output = tmp_path / "report.txt"
+    write_report(entries, parse_seconds, "sample.ged", str(output))
+    report = output.read_text()
+    assert "US21 (us21_correct_gender_for_role)" in report
+    assert "PASSED" in report
+
+
+def test_run_checks_caps_results_per_check_and_overall():
+    path = write_gedcom_file(GEDCOM)
+    full, _ = run_checks(path)
+    capped, _ = run_checks(path, max_errors=1)
+    first, _ = run_checks(path, max_total=1)
+    os.remove(path)
+
+    by_story = {entry["story"]: entry for entry in capped}
+    assert len(by_story["US02"]["results"]) == 1
+    assert by_story["US02"]["truncated"]
+    assert "truncated" not in by_story["US21"]
+    assert all(len(entry["results"]) <= 1 for entry in capped)
+
+    assert sum(len(entry["results"]) for entry in first) == 1
+    assert len(first) < len(full)
+    assert first[-1]["results"] == next(entry["results"][:1] for entry in full if entry["results"])
+
+
+def test_checks_yield_results_lazily():
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sprint_3"))
+    from us26 import us26_corresponding_entries
+
+    families = {"@F%d@" % n: {"husb": "@I%d@" % n, "children": []} for n in range(1000)}
+    errors = us26_corresponding_entries({}, families)
+    assert str(next(errors)) == "ERROR: US26: HUSB @I0@ in family @F0@ does not list this family in FAMS."
+
+
+def test_stream_check_hands_results_over_as_they_are_yielded(tmp_path):
+    module = tmp_path / "us99.py"
+    module.write_text(
+        "def us99_lazy(received, families):\n"
+        "    for n in range(3):\n"
+        "        assert len(received) == n\n"
+        "        yield n\n"
+    )
+    received = []
+    count, _, failure, truncated = stream_check(received, {}, str(module), "us99_lazy", received.append)
+    assert (count, failure, truncated) == (3, None, False)
+    assert received == [0, 1, 2]
+
+    received = []
+    count, _, _, truncated = stream_check(received, {}, str(module), "us99_lazy", received.append, limit=2)
+    assert (count, truncated) == (2, True)
+    assert received == [0, 1]
+
+
+def test_stream_run_writes_the_same_report_as_a_collected_run(tmp_path):
+    path = write_gedcom_file(GEDCOM)
+    untimed = lambda output: re.sub(r"[\d.]+ ms", "ms", output.read_text())
+    for options in ({}, {"max_errors": 1}, {"max_total": 1}, {"workers": 2}):
+        streamed, collected = tmp_path / "streamed.txt", tmp_path / "collected.txt"
+        streamed_jsonl, collected_jsonl = tmp_path / "streamed.jsonl", tmp_path / "collected.jsonl"
+        written, _ = stream_run(path, str(streamed), errors_jsonl=str(streamed_jsonl), **options)
+        entries, parse_seconds = run_checks(path, **options)
+        write_report(entries, parse_seconds, path, str(collected))
+        write_errors_jsonl(entries, str(collected_jsonl))
+
+        assert untimed(streamed) == untimed(collected)
+        assert streamed_jsonl.read_text() == collected_jsonl.read_text()
+        assert written == sum(len(entry["results"]) for entry in entries)
+    os.remove(path)
@@ -0,0 +1,37 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from run_checks import run_checks
+from sharded import family_chunks, merge_shards, run_sharded, shard_model
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(BASE_DIR, "M2B3_containsErrors.ged")
+
+
+def test_family_chunks_cover_every_family_once():
+    assert family_chunks(10, 3) == [(0, 4), (4, 7), (7, 10)]
+    assert family_chunks(2, 8) == [(0, 1), (1, 2)]
+    assert family_chunks(0, 4) == [(0, 0)]
+
+
+def test_shard_model_keeps_referenced_individuals_only():
+    individuals = {"@I1@": {}, "@I2@": {}, "@I3@": {}, "@I4@": {}}
+    families = {
+        "@F1@": {"husb": "@I1@", "wife": None, "children": ["@I3@", "@I9@"]},
+        "@F2@": {"husb": "@I2@", "wife": "@I4@", "children": []}
+    }
+    shard_individuals, shard_families = shard_model(individuals, families, ["@F1@"])
+    assert list(shard_families) == ["@F1@"]
+    assert sorted(shard_individuals) == ["@I1@", "@I3@"]
+
+
+def test_merge_shards_follows_family_order():
+    outcomes = [(4, (["c"], 0.5, None)), (0, (["a", "b"], 0.25, None)), (7, ([], 0.25, "ValueError: x"))]
+    assert merge_shards(outcomes) == (["a", "b", "c"], 1.0, "ValueError: x")
+
+def test_sharded_run_matches_serial_run():
+    serial, _ = run_checks(SAMPLE, use_cache=False)
+    sharded, _ = run_sharded(SAMPLE, workers=2, shards=3, use_cache=False)
+    assert [(e["story"], e["results"], e["failure"]) for e in sharded] == \
+        [(e["story"], e["results"], e["failure"]) for e in serial]